@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+"""
+Load tests moto_server with S3 GET/PUT and SQS send/receive, once with the
+werkzeug development server and once with the pooled keep-alive server, and
+reports requests per second and p99 latency of each.
+
+    python benchmarks/server_load.py --requests 2000 --concurrency 8
+"""
+from __future__ import print_function, unicode_literals
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import timeit
+
+import requests
+
+S3_HOST = 'the-bucket.s3.amazonaws.com'
+SQS_HOST = 'sqs.us-east-1.amazonaws.com'
+QUEUE_PATH = '/123456789012/the-queue'
+
+
+def start_server(mode, port):
+    devnull = open(os.devnull, 'w')
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'moto.server', '-p', str(port), '--server', mode],
+        stdout=devnull, stderr=devnull)
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port)).close()
+            return server
+        except socket.error:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError('moto_server did not start')
+
+
+def s3_put(session, url, index):
+    return session.put('{0}/key-{1}'.format(url, index % 100), data=b'x' * 1024, headers={'Host': S3_HOST})
+
+
+def s3_get(session, url, index):
+    return session.get('{0}/key-{1}'.format(url, index % 100), headers={'Host': S3_HOST})
+
+
+def sqs_send(session, url, index):
+    return session.post(url + QUEUE_PATH, headers={'Host': SQS_HOST}, data={
+        'Action': 'SendMessage', 'MessageBody': 'message-{0}'.format(index)})
+
+
+def sqs_receive(session, url, index):
+    return session.post(url + QUEUE_PATH, headers={'Host': SQS_HOST}, data={
+        'Action': 'ReceiveMessage', 'MaxNumberOfMessages': '1'})
+
+
+OPERATIONS = [
+    ('S3 PUT', s3_put),
+    ('S3 GET', s3_get),
+    ('SQS send', sqs_send),
+    ('SQS receive', sqs_receive),
+]
+
+
+def prepare(url):
+    requests.put(url + '/', headers={'Host': S3_HOST})
+    for index in range(100):
+        s3_put(requests, url, index)
+    requests.post(url + '/', headers={'Host': SQS_HOST}, data={
+        'Action': 'CreateQueue', 'QueueName': 'the-queue'})
+
+
+def run_operation(url, operation, total, concurrency):
+    latencies = []
+
+    def worker(indexes):
+        session = requests.Session()
+        for index in indexes:
+            start = timeit.default_timer()
+            operation(session, url, index).raise_for_status()
+            latencies.append(timeit.default_timer() - start)
+
+    threads = [
+        threading.Thread(target=worker, args=(range(offset, total, concurrency),))
+        for offset in range(concurrency)
+    ]
+    start = timeit.default_timer()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = timeit.default_timer() - start
+
+    latencies.sort()
+    return len(latencies) / elapsed, latencies[int(len(latencies) * 0.99) - 1]
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '-n', '--requests', type=int,
+        help='Number of requests of each operation',
+        default=1000)
+    parser.add_argument(
+        '-c', '--concurrency', type=int,
+        help='Number of client threads',
+        default=8)
+    parser.add_argument(
+        '-p', '--port', type=int,
+        help='Port number to run moto_server on',
+        default=5123)
+    args = parser.parse_args(argv)
+
+    print("{0:<8} {1:<12} {2:>10} {3:>10}".format("server", "operation", "req/s", "p99 (ms)"))
+    for mode in ['simple', 'pooled']:
+        server = start_server(mode, args.port)
+        url = 'http://127.0.0.1:{0}'.format(args.port)
+        try:
+            prepare(url)
+            for name, operation in OPERATIONS:
+                rate, p99 = run_operation(url, operation, args.requests, args.concurrency)
+                print("{0:<8} {1:<12} {2:>10.0f} {3:>10.1f}".format(mode, name, rate, p99 * 1000))
+        finally:
+            server.kill()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
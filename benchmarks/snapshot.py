@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+Compares restoring a snapshot of backend state against building that state
+again through boto, the way a test's setup does.
+
+A test suite that needs the same VPCs, buckets and queues in every test can
+build them once, take a snapshot with `mock.snapshot()` and hand each test a
+pristine copy with `mock.restore(snapshot)`. S3 and SQS only load the buckets
+and queues a test changed again, so the last scenario changes one of each.
+
+    python benchmarks/snapshot.py --size 100 --runs 10
+"""
+from __future__ import print_function, unicode_literals
+import argparse
+import sys
+import timeit
+
+import boto
+import boto.sqs
+import boto.vpc
+from boto.s3.key import Key
+
+from moto import mock_ec2, mock_s3, mock_sqs
+
+
+def build_world(size):
+    vpc_conn = boto.vpc.connect_to_region('us-east-1')
+    for index in range(size):
+        vpc = vpc_conn.create_vpc('10.{0}.0.0/16'.format(index % 256))
+        vpc_conn.create_subnet(vpc.id, '10.{0}.0.0/24'.format(index % 256))
+        vpc_conn.create_security_group('group-{0}'.format(index), 'a group', vpc_id=vpc.id)
+
+    bucket = boto.connect_s3().create_bucket('the-bucket')
+    for index in range(size * 10):
+        key = Key(bucket)
+        key.key = 'key-{0}'.format(index)
+        key.set_contents_from_string('value')
+
+    sqs_conn = boto.sqs.connect_to_region('us-east-1')
+    for index in range(size):
+        queue = sqs_conn.create_queue('queue-{0}'.format(index))
+        queue.write(queue.new_message('message'))
+
+
+def change_a_little():
+    bucket = boto.connect_s3().get_bucket('the-bucket')
+    key = Key(bucket)
+    key.key = 'key-0'
+    key.set_contents_from_string('changed')
+
+    queue = boto.sqs.connect_to_region('us-east-1').get_queue('queue-0')
+    queue.write(queue.new_message('another message'))
+
+
+def best_of(func, runs):
+    return min(timeit.repeat(func, number=1, repeat=runs))
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '-s', '--size', type=int,
+        help='Number of VPCs and queues to create, and tenfold S3 keys',
+        default=100)
+    parser.add_argument(
+        '-n', '--runs', type=int,
+        help='Number of times to time each scenario',
+        default=10)
+    args = parser.parse_args(argv)
+
+    mocks = [mock_ec2(), mock_s3(), mock_sqs()]
+    for mock in mocks:
+        mock.start()
+
+    def setup():
+        for mock in mocks:
+            mock.reset()
+        build_world(args.size)
+
+    setup_time = best_of(setup, args.runs)
+    snapshots = [mock.snapshot() for mock in mocks]
+
+    def restore():
+        for mock, snapshot in zip(mocks, snapshots):
+            mock.restore(snapshot)
+
+    restore_time = best_of(restore, args.runs)
+
+    def change_and_restore():
+        change_a_little()
+        restore()
+
+    change_time = best_of(change_and_restore, args.runs)
+    for mock in mocks:
+        mock.stop()
+
+    print("{0:<20} {1:>12}".format("scenario", "best (ms)"))
+    print("{0:<20} {1:>12.1f}".format("reset and setup", setup_time * 1000))
+    print("{0:<20} {1:>12.1f}".format("restore snapshot", restore_time * 1000))
+    print("{0:<20} {1:>12.1f}".format("change and restore", change_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+Measures how long it takes a fresh interpreter to import moto.
+
+`import moto` only defines the mock_* entry points; a service module and its
+backends are imported the first time the service is used. This compares
+that against importing every service up front, which is what `import moto`
+used to do.
+
+    python benchmarks/startup.py --runs 20
+"""
+from __future__ import print_function, unicode_literals
+import argparse
+import subprocess
+import sys
+
+from moto.backends import BACKENDS
+
+SCENARIOS = [
+    ('import moto', 'import moto'),
+    ('import moto, use mock_s3', 'import moto; moto.mock_s3().start()'),
+    ('import every service', '; '.join(
+        'import {0}'.format(module_name)
+        for module_name, _ in sorted(BACKENDS.backend_paths.values()))),
+]
+
+
+def time_statement(statement, runs):
+    timings = []
+    for _ in range(runs):
+        code = (
+            "import timeit; start = timeit.default_timer(); {0}; "
+            "print(timeit.default_timer() - start)".format(statement)
+        )
+        output = subprocess.check_output([sys.executable, '-c', code])
+        timings.append(float(output.decode('utf-8').strip().splitlines()[-1]))
+    timings.sort()
+    return timings[len(timings) // 2], timings[0]
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '-n', '--runs', type=int,
+        help='Number of fresh interpreters to time for each scenario',
+        default=10)
+    args = parser.parse_args(argv)
+
+    print("{0:<28} {1:>12} {2:>12}".format("scenario", "median (ms)", "best (ms)"))
+    for name, statement in SCENARIOS:
+        median, best = time_statement(statement, args.runs)
+        print("{0:<28} {1:>12.1f} {2:>12.1f}".format(name, median * 1000, best * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,418 @@
+#!/usr/bin/env python
+"""
+Times the hot paths of the most used services through boto: S3 put, get and
+list with many keys, SQS send/receive/delete, DynamoDB put, query and scan,
+Kinesis put_record/get_records, EC2 run and describe with tags and filters,
+and SNS fan-out to SQS queues.
+
+Every benchmark runs with the mock_* decorators, against moto_server, or
+both, and reports operations per second and the approximate memory held by
+the backends afterwards. Save the results as a baseline, and later runs
+report their change against it and exit with an error on a regression.
+
+    python benchmarks/suite.py --size 500 --save-baseline baseline.json
+    python benchmarks/suite.py --size 500 --baseline baseline.json
+"""
+from __future__ import print_function, unicode_literals
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import timeit
+
+import boto
+import boto.dynamodb2
+import boto.ec2
+import boto.kinesis
+import boto.sns
+import boto.sqs
+import requests
+from boto.dynamodb2.fields import HashKey, RangeKey
+from boto.dynamodb2.table import Table
+from boto.s3.key import Key
+
+from moto import mock_dynamodb2, mock_ec2, mock_kinesis, mock_s3, mock_sns, mock_sqs
+from moto.backends import BACKENDS
+
+REGION = 'us-east-1'
+# boto needs credentials to sign requests, though moto doesn't check them
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'benchmark-key')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'benchmark-secret')
+
+
+class Connections(object):
+    """
+    Opens boto connections to the mocks, or through moto_server used as an
+    HTTP proxy. DynamoDB and DynamoDB2 share a host name, so DynamoDB2 is
+    served by a server of its own.
+    """
+
+    def __init__(self, proxy_port=None, dynamodb2_port=None):
+        self.options = self.proxy_options(proxy_port)
+        self.dynamodb2_options = self.proxy_options(dynamodb2_port)
+
+    def proxy_options(self, port):
+        if port:
+            return dict(proxy='127.0.0.1', proxy_port=port, is_secure=False)
+        return {}
+
+    def s3(self):
+        return boto.connect_s3(**self.options)
+
+    def sqs(self):
+        return boto.sqs.connect_to_region(REGION, **self.options)
+
+    def dynamodb2(self):
+        return boto.dynamodb2.connect_to_region(REGION, **self.dynamodb2_options)
+
+    def kinesis(self):
+        return boto.kinesis.connect_to_region(REGION, **self.options)
+
+    def ec2(self):
+        return boto.ec2.connect_to_region(REGION, **self.options)
+
+    def sns(self):
+        return boto.sns.connect_to_region(REGION, **self.options)
+
+
+def timed(func, ops):
+    start = timeit.default_timer()
+    func()
+    return ops, timeit.default_timer() - start
+
+
+def s3_put(conns, size):
+    bucket = conns.s3().create_bucket('the-bucket')
+
+    def put():
+        for index in range(size):
+            key = Key(bucket, 'key-{0}'.format(index))
+            key.set_contents_from_string('value-{0}'.format(index))
+    return timed(put, size)
+
+
+def s3_get(conns, size):
+    bucket = conns.s3().create_bucket('the-bucket')
+    for index in range(size):
+        Key(bucket, 'key-{0}'.format(index)).set_contents_from_string('value')
+
+    def get():
+        for index in range(size):
+            Key(bucket, 'key-{0}'.format(index)).get_contents_as_string()
+    return timed(get, size)
+
+
+def s3_list(conns, size):
+    bucket = conns.s3().create_bucket('the-bucket')
+    for index in range(size):
+        Key(bucket, 'prefix-{0}-key-{1}'.format(index % 10, index)).set_contents_from_string('value')
+    listings = 10
+
+    def list_keys():
+        for index in range(listings):
+            list(bucket.list(prefix='prefix-{0}-'.format(index)))
+    return timed(list_keys, listings)
+
+
+def sqs_send_receive_delete(conns, size):
+    queue = conns.sqs().create_queue('the-queue')
+
+    def send_receive_delete():
+        for index in range(size):
+            queue.write(queue.new_message('message-{0}'.format(index)))
+        received = 0
+        while received < size:
+            messages = queue.get_messages(10)
+            for message in messages:
+                queue.delete_message(message)
+            received += len(messages)
+    return timed(send_receive_delete, size * 3)
+
+
+def create_table(conns):
+    return Table.create(
+        'the-table', schema=[HashKey('forum'), RangeKey('subject')],
+        throughput={'read': 10, 'write': 10}, connection=conns.dynamodb2())
+
+
+def dynamodb_put(conns, size):
+    table = create_table(conns)
+
+    def put():
+        for index in range(size):
+            table.put_item(data={'forum': 'forum-{0}'.format(index % 10), 'subject': 'subject-{0}'.format(index)})
+    return timed(put, size)
+
+
+def fill_table(conns, size):
+    table = create_table(conns)
+    with table.batch_write() as batch:
+        for index in range(size):
+            batch.put_item(data={'forum': 'forum-{0}'.format(index % 10), 'subject': 'subject-{0}'.format(index)})
+    return table
+
+
+def dynamodb_query(conns, size):
+    table = fill_table(conns, size)
+    queries = 10
+
+    def query():
+        for index in range(queries):
+            list(table.query_2(forum__eq='forum-{0}'.format(index)))
+    return timed(query, queries)
+
+
+def dynamodb_scan(conns, size):
+    table = fill_table(conns, size)
+    scans = 10
+
+    def scan():
+        for _ in range(scans):
+            list(table.scan())
+    return timed(scan, scans)
+
+
+def kinesis_put_get(conns, size):
+    conn = conns.kinesis()
+    conn.create_stream('the-stream', 1)
+    shard_id = conn.describe_stream('the-stream')['StreamDescription']['Shards'][0]['ShardId']
+
+    def put_get():
+        for index in range(size):
+            conn.put_record('the-stream', 'record-{0}'.format(index), 'key-{0}'.format(index))
+        iterator = conn.get_shard_iterator('the-stream', shard_id, 'TRIM_HORIZON')['ShardIterator']
+        read = 0
+        while read < size:
+            response = conn.get_records(iterator, limit=100)
+            read += len(response['Records'])
+            iterator = response['NextShardIterator']
+    return timed(put_get, size * 2)
+
+
+def ec2_run_describe(conns, size):
+    conn = conns.ec2()
+
+    def run_describe():
+        for index in range(size):
+            reservation = conn.run_instances('ami-1234abcd')
+            conn.create_tags([reservation.instances[0].id], {'role': 'role-{0}'.format(index % 10)})
+        for index in range(size):
+            conn.get_all_instances(filters={'tag:role': 'role-{0}'.format(index % 10)})
+    return timed(run_describe, size * 2)
+
+
+def sns_fan_out(conns, size):
+    sns = conns.sns()
+    sqs = conns.sqs()
+    topic = sns.create_topic('the-topic')
+    topic_arn = topic['CreateTopicResponse']['CreateTopicResult']['TopicArn']
+    for index in range(10):
+        queue = sqs.create_queue('queue-{0}'.format(index))
+        sns.subscribe(topic_arn, 'sqs', 'arn:aws:sqs:{0}:123456789012:{1}'.format(REGION, queue.name))
+
+    def publish():
+        for index in range(size):
+            sns.publish(topic_arn, 'message-{0}'.format(index))
+    return timed(publish, size)
+
+
+BENCHMARKS = [
+    ('s3 put', s3_put),
+    ('s3 get', s3_get),
+    ('s3 list', s3_list),
+    ('sqs send/receive/delete', sqs_send_receive_delete),
+    ('dynamodb put', dynamodb_put),
+    ('dynamodb query', dynamodb_query),
+    ('dynamodb scan', dynamodb_scan),
+    ('kinesis put/get', kinesis_put_get),
+    ('ec2 run/describe', ec2_run_describe),
+    ('sns fan-out', sns_fan_out),
+]
+
+
+class DecoratorMode(object):
+    mocks = [mock_dynamodb2, mock_ec2, mock_kinesis, mock_s3, mock_sns, mock_sqs]
+
+    def __enter__(self):
+        self.started = [mock() for mock in self.mocks]
+        for mock in self.started:
+            mock.start()
+        return self
+
+    def __exit__(self, *args):
+        for mock in self.started:
+            mock.stop()
+
+    def connections(self):
+        return Connections()
+
+    def reset(self):
+        for service in BACKENDS.loaded_backends():
+            BACKENDS.reset_service(service)
+
+    def memory(self):
+        return sum(
+            backend.approximate_size()
+            for service in BACKENDS.loaded_backends()
+            for backend in BACKENDS.service_backends(service).values())
+
+
+class ServerMode(object):
+
+    def __init__(self, port):
+        self.ports = {None: port, 'dynamodb2': port + 1}
+
+    def start_server(self, service, port):
+        command = [sys.executable, '-m', 'moto.server', '-p', str(port)]
+        if service:
+            command.append(service)
+        devnull = open(os.devnull, 'w')
+        server = subprocess.Popen(command, stdout=devnull, stderr=devnull)
+        for _ in range(100):
+            try:
+                socket.create_connection(('127.0.0.1', port)).close()
+                return server
+            except socket.error:
+                time.sleep(0.1)
+        server.kill()
+        raise RuntimeError('moto_server did not start')
+
+    def urls(self):
+        return ['http://127.0.0.1:{0}'.format(port) for port in self.ports.values()]
+
+    def __enter__(self):
+        self.servers = []
+        try:
+            for service, port in self.ports.items():
+                self.servers.append(self.start_server(service, port))
+        except RuntimeError:
+            self.__exit__()
+            raise
+        return self
+
+    def __exit__(self, *args):
+        for server in self.servers:
+            server.kill()
+            server.wait()
+
+    def connections(self):
+        return Connections(proxy_port=self.ports[None], dynamodb2_port=self.ports['dynamodb2'])
+
+    def reset(self):
+        for url in self.urls():
+            requests.post(url + '/moto-api/reset').raise_for_status()
+
+    def memory(self):
+        memory = 0
+        for url in self.urls():
+            stats = requests.get(url + '/moto-api/stats').json()
+            memory += sum(
+                region['memory']
+                for regions in stats.values()
+                for region in regions.values())
+        return memory
+
+
+def run_suite(mode, size, selected):
+    results = {}
+    with mode:
+        for name, benchmark in BENCHMARKS:
+            if selected and not any(pattern in name for pattern in selected):
+                continue
+            mode.reset()
+            ops, elapsed = benchmark(mode.connections(), size)
+            results[name] = {'ops_per_sec': ops / elapsed, 'memory': mode.memory()}
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints each result next to its baseline, and returns the number that
+    got slower by more than threshold
+    """
+    regressions = 0
+    print("{0:<10} {1:<24} {2:>10} {3:>10} {4:>12} {5:>8}".format(
+        "mode", "benchmark", "ops/s", "baseline", "memory (KB)", "change"))
+    for mode_name, mode_results in sorted(results.items()):
+        for name, _ in BENCHMARKS:
+            if name not in mode_results:
+                continue
+            result = mode_results[name]
+            base = baseline.get(mode_name, {}).get(name)
+            if base:
+                change = result['ops_per_sec'] / base['ops_per_sec'] - 1
+                flag = ''
+                if change < -threshold:
+                    regressions += 1
+                    flag = ' !'
+                change_text = '{0:+.0%}{1}'.format(change, flag)
+                base_text = '{0:.0f}'.format(base['ops_per_sec'])
+            else:
+                change_text = base_text = '-'
+            print("{0:<10} {1:<24} {2:>10.0f} {3:>10} {4:>12.0f} {5:>8}".format(
+                mode_name, name, result['ops_per_sec'], base_text, result['memory'] / 1024.0, change_text))
+    return regressions
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'benchmarks', nargs='*',
+        help='Only run the benchmarks whose names contain one of these')
+    parser.add_argument(
+        '-s', '--size', type=int,
+        help='Number of keys, messages, items, records and instances of each benchmark',
+        default=200)
+    parser.add_argument(
+        '-m', '--mode', type=str,
+        choices=['decorator', 'server', 'both'],
+        help='Run with the mock decorators, against moto_server, or both',
+        default='both')
+    parser.add_argument(
+        '-p', '--port', type=int,
+        help='Port number to run moto_server on',
+        default=5124)
+    parser.add_argument(
+        '--baseline', type=str,
+        help='Compare against the results saved in this file',
+        default=None)
+    parser.add_argument(
+        '--save-baseline', type=str,
+        help='Save the results to this file',
+        default=None)
+    parser.add_argument(
+        '--threshold', type=float,
+        help='Fraction of ops/s a benchmark may lose against the baseline before it is a regression',
+        default=0.2)
+    args = parser.parse_args(argv)
+
+    modes = []
+    if args.mode in ('decorator', 'both'):
+        modes.append(('decorator', DecoratorMode()))
+    if args.mode in ('server', 'both'):
+        modes.append(('server', ServerMode(args.port)))
+
+    results = {}
+    for mode_name, mode in modes:
+        results[mode_name] = run_suite(mode, args.size, args.benchmarks)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as baseline_file:
+            json.dump(results, baseline_file, indent=2, sort_keys=True)
+
+    if regressions:
+        print("{0} benchmarks regressed by more than {1:.0%}".format(regressions, args.threshold))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
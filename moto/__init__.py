@@ -1,32 +1,46 @@
 from __future__ import unicode_literals
+import importlib
 import logging
 logging.getLogger('boto').setLevel(logging.CRITICAL)
 
 __title__ = 'moto'
 __version__ = '0.4.19'
 
-from .autoscaling import mock_autoscaling  # flake8: noqa
-from .cloudformation import mock_cloudformation  # flake8: noqa
-from .cloudwatch import mock_cloudwatch  # flake8: noqa
-from .datapipeline import mock_datapipeline  # flake8: noqa
-from .dynamodb import mock_dynamodb  # flake8: noqa
-from .dynamodb2 import mock_dynamodb2  # flake8: noqa
-from .ec2 import mock_ec2  # flake8: noqa
-from .ecs import mock_ecs  # flake8: noqa
-from .elb import mock_elb  # flake8: noqa
-from .emr import mock_emr  # flake8: noqa
-from .glacier import mock_glacier  # flake8: noqa
-from .iam import mock_iam  # flake8: noqa
-from .kinesis import mock_kinesis  # flake8: noqa
-from .kms import mock_kms  # flake8: noqa
-from .rds import mock_rds  # flake8: noqa
-from .rds2 import mock_rds2  # flake8: noqa
-from .redshift import mock_redshift  # flake8: noqa
-from .s3 import mock_s3  # flake8: noqa
-from .s3bucket_path import mock_s3bucket_path  # flake8: noqa
-from .ses import mock_ses  # flake8: noqa
-from .sns import mock_sns  # flake8: noqa
-from .sqs import mock_sqs  # flake8: noqa
-from .sts import mock_sts  # flake8: noqa
-from .route53 import mock_route53  # flake8: noqa
-from .swf import mock_swf  # flake8: noqa
+
+def lazy_load(module_name, element):
+    """
+    Returns a stand-in for `element` of `module_name` that only imports the
+    service module, and so builds its backends, the first time it is called
+    """
+    def f(*args, **kwargs):
+        module = importlib.import_module(module_name, 'moto')
+        return getattr(module, element)(*args, **kwargs)
+    f.__name__ = str(element)
+    return f
+
+
+mock_autoscaling = lazy_load('.autoscaling', 'mock_autoscaling')
+mock_cloudformation = lazy_load('.cloudformation', 'mock_cloudformation')
+mock_cloudwatch = lazy_load('.cloudwatch', 'mock_cloudwatch')
+mock_datapipeline = lazy_load('.datapipeline', 'mock_datapipeline')
+mock_dynamodb = lazy_load('.dynamodb', 'mock_dynamodb')
+mock_dynamodb2 = lazy_load('.dynamodb2', 'mock_dynamodb2')
+mock_ec2 = lazy_load('.ec2', 'mock_ec2')
+mock_ecs = lazy_load('.ecs', 'mock_ecs')
+mock_elb = lazy_load('.elb', 'mock_elb')
+mock_emr = lazy_load('.emr', 'mock_emr')
+mock_glacier = lazy_load('.glacier', 'mock_glacier')
+mock_iam = lazy_load('.iam', 'mock_iam')
+mock_kinesis = lazy_load('.kinesis', 'mock_kinesis')
+mock_kms = lazy_load('.kms', 'mock_kms')
+mock_rds = lazy_load('.rds', 'mock_rds')
+mock_rds2 = lazy_load('.rds2', 'mock_rds2')
+mock_redshift = lazy_load('.redshift', 'mock_redshift')
+mock_s3 = lazy_load('.s3', 'mock_s3')
+mock_s3bucket_path = lazy_load('.s3bucket_path', 'mock_s3bucket_path')
+mock_ses = lazy_load('.ses', 'mock_ses')
+mock_sns = lazy_load('.sns', 'mock_sns')
+mock_sqs = lazy_load('.sqs', 'mock_sqs')
+mock_sts = lazy_load('.sts', 'mock_sts')
+mock_route53 = lazy_load('.route53', 'mock_route53')
+mock_swf = lazy_load('.swf', 'mock_swf')
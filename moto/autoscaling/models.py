@@ -1,6 +1,6 @@
 from __future__ import unicode_literals
 from boto.ec2.blockdevicemapping import BlockDeviceType, BlockDeviceMapping
-from moto.core import BaseBackend
+from moto.core import BaseBackend, RegionBackends
 from moto.ec2 import ec2_backends
 from moto.elb import elb_backends
 
@@ -385,6 +385,6 @@ class AutoScalingBackend(BaseBackend):
             self.elb_backend.deregister_instances(elb.name, elb_instace_ids - group_instance_ids)
 
 
-autoscaling_backends = {}
-for region, ec2_backend in ec2_backends.items():
-    autoscaling_backends[region] = AutoScalingBackend(ec2_backend, elb_backends[region])
+autoscaling_backends = RegionBackends(
+    ec2_backends,
+    lambda region_name: AutoScalingBackend(ec2_backends[region_name], elb_backends[region_name]))
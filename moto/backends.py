@@ -1,55 +1,112 @@
 from __future__ import unicode_literals
-from moto.autoscaling import autoscaling_backend
-from moto.cloudwatch import cloudwatch_backend
-from moto.cloudformation import cloudformation_backend
-from moto.datapipeline import datapipeline_backend
-from moto.dynamodb import dynamodb_backend
-from moto.dynamodb2 import dynamodb_backend2
-from moto.ec2 import ec2_backend
-from moto.elb import elb_backend
-from moto.emr import emr_backend
-from moto.glacier import glacier_backend
-from moto.iam import iam_backend
-from moto.kinesis import kinesis_backend
-from moto.kms import kms_backend
-from moto.rds import rds_backend
-from moto.redshift import redshift_backend
-from moto.s3 import s3_backend
-from moto.s3bucket_path import s3bucket_path_backend
-from moto.ses import ses_backend
-from moto.sns import sns_backend
-from moto.sqs import sqs_backend
-from moto.sts import sts_backend
-from moto.route53 import route53_backend
-
-BACKENDS = {
-    'autoscaling': autoscaling_backend,
-    'cloudformation': cloudformation_backend,
-    'cloudwatch': cloudwatch_backend,
-    'datapipeline': datapipeline_backend,
-    'dynamodb': dynamodb_backend,
-    'dynamodb2': dynamodb_backend2,
-    'ec2': ec2_backend,
-    'elb': elb_backend,
-    'emr': emr_backend,
-    'glacier': glacier_backend,
-    'iam': iam_backend,
-    'kinesis': kinesis_backend,
-    'kms': kms_backend,
-    'redshift': redshift_backend,
-    'rds': rds_backend,
-    's3': s3_backend,
-    's3bucket_path': s3bucket_path_backend,
-    'ses': ses_backend,
-    'sns': sns_backend,
-    'sqs': sqs_backend,
-    'sts': sts_backend,
-    'route53': route53_backend
-}
+import importlib
+import sys
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+
+
+class LazyBackends(Mapping):
+    """
+    A mapping of service name to backend that imports each service module
+    the first time its backend is looked up
+    """
+
+    def __init__(self, backend_paths):
+        self.backend_paths = backend_paths
+        self.loaded = {}
+
+    def __getitem__(self, name):
+        try:
+            return self.loaded[name]
+        except KeyError:
+            pass
+        module_name, backend_name = self.backend_paths[name]
+        module = importlib.import_module(module_name)
+        backend = self.loaded[name] = getattr(module, backend_name)
+        return backend
+
+    def __iter__(self):
+        return iter(self.backend_paths)
+
+    def __len__(self):
+        return len(self.backend_paths)
+
+    def __contains__(self, name):
+        return name in self.backend_paths
+
+    def region_backends(self, name):
+        """
+        The RegionBackends of a service, or None for a service without regions
+        """
+        from moto.core import RegionBackends
+
+        backend = self[name]
+        module = importlib.import_module(self.backend_paths[name][0])
+        for value in vars(module).values():
+            # The shared backends, whichever tenant is active
+            if isinstance(value, RegionBackends) and value.backends.get(value.default_region_name) is backend:
+                return value
+        return None
+
+    def service_backends(self, name):
+        """
+        The backends of a service which have been created, by region name. A
+        service without regions maps its single backend to 'global'.
+        """
+        region_backends = self.region_backends(name)
+        if region_backends is None:
+            return {'global': self[name]}
+        return region_backends.created_backends()
+
+    def reset_service(self, name):
+        region_backends = self.region_backends(name)
+        if region_backends is None:
+            self[name].reset()
+        else:
+            region_backends.reset()
+
+    def loaded_backends(self):
+        """
+        The backends whose service modules have been imported so far, either
+        through this mapping or directly
+        """
+        return dict(
+            (name, self[name])
+            for name, (module_name, _) in self.backend_paths.items()
+            if module_name in sys.modules)
+
+
+BACKENDS = LazyBackends({
+    'autoscaling': ('moto.autoscaling', 'autoscaling_backend'),
+    'cloudformation': ('moto.cloudformation', 'cloudformation_backend'),
+    'cloudwatch': ('moto.cloudwatch', 'cloudwatch_backend'),
+    'datapipeline': ('moto.datapipeline', 'datapipeline_backend'),
+    'dynamodb': ('moto.dynamodb', 'dynamodb_backend'),
+    'dynamodb2': ('moto.dynamodb2', 'dynamodb_backend2'),
+    'ec2': ('moto.ec2', 'ec2_backend'),
+    'elb': ('moto.elb', 'elb_backend'),
+    'emr': ('moto.emr', 'emr_backend'),
+    'glacier': ('moto.glacier', 'glacier_backend'),
+    'iam': ('moto.iam', 'iam_backend'),
+    'kinesis': ('moto.kinesis', 'kinesis_backend'),
+    'kms': ('moto.kms', 'kms_backend'),
+    'redshift': ('moto.redshift', 'redshift_backend'),
+    'rds': ('moto.rds', 'rds_backend'),
+    's3': ('moto.s3', 's3_backend'),
+    's3bucket_path': ('moto.s3bucket_path', 's3bucket_path_backend'),
+    'ses': ('moto.ses', 'ses_backend'),
+    'sns': ('moto.sns', 'sns_backend'),
+    'sqs': ('moto.sqs', 'sqs_backend'),
+    'sts': ('moto.sts', 'sts_backend'),
+    'route53': ('moto.route53', 'route53_backend'),
+})
 
 
 def get_model(name):
-    for backend in BACKENDS.values():
+    for backend in BACKENDS.loaded_backends().values():
         models = getattr(backend.__class__, '__models__', {})
         if name in models:
             return list(getattr(backend, models[name])())
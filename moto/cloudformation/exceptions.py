@@ -1,6 +1,6 @@
 from __future__ import unicode_literals
 from werkzeug.exceptions import BadRequest
-from jinja2 import Template
+from moto.core.responses import template_registry
 
 
 class UnformattedGetAttTemplateException(Exception):
@@ -10,7 +10,7 @@ class UnformattedGetAttTemplateException(Exception):
 
 class ValidationError(BadRequest):
     def __init__(self, name_or_id):
-        template = Template(ERROR_RESPONSE)
+        template = template_registry.get_template(ERROR_RESPONSE)
         super(ValidationError, self).__init__()
         self.description = template.render(
             code="ValidationError",
@@ -20,7 +20,7 @@ class ValidationError(BadRequest):
 
 class MissingParameterError(BadRequest):
     def __init__(self, parameter_name):
-        template = Template(ERROR_RESPONSE)
+        template = template_registry.get_template(ERROR_RESPONSE)
         super(MissingParameterError, self).__init__()
         self.description = template.render(
             code="Missing Parameter",
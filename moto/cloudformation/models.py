@@ -2,7 +2,7 @@ from __future__ import unicode_literals
 import json
 
 import boto.cloudformation
-from moto.core import BaseBackend
+from moto.core import BaseBackend, RegionBackends
 
 from .parsing import ResourceMap, OutputMap
 from .utils import generate_stack_id
@@ -121,6 +121,6 @@ class CloudFormationBackend(BaseBackend):
             self.delete_stack(stack_to_delete.stack_id)
 
 
-cloudformation_backends = {}
-for region in boto.cloudformation.regions():
-    cloudformation_backends[region.name] = CloudFormationBackend()
+cloudformation_backends = RegionBackends(
+    [region.name for region in boto.cloudformation.regions()],
+    lambda region_name: CloudFormationBackend())
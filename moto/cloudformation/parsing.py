@@ -1,6 +1,7 @@
 from __future__ import unicode_literals
 import collections
 import functools
+import importlib
 import logging
 
 from moto.autoscaling import models as autoscaling_models
@@ -8,7 +9,6 @@ from moto.datapipeline import models as datapipeline_models
 from moto.ec2 import models as ec2_models
 from moto.elb import models as elb_models
 from moto.iam import models as iam_models
-from moto.rds import models as rds_models
 from moto.redshift import models as redshift_models
 from moto.route53 import models as route53_models
 from moto.sns import models as sns_models
@@ -40,9 +40,6 @@ MODEL_MAP = {
     "AWS::DataPipeline::Pipeline": datapipeline_models.Pipeline,
     "AWS::IAM::InstanceProfile": iam_models.InstanceProfile,
     "AWS::IAM::Role": iam_models.Role,
-    "AWS::RDS::DBInstance": rds_models.Database,
-    "AWS::RDS::DBSecurityGroup": rds_models.SecurityGroup,
-    "AWS::RDS::DBSubnetGroup": rds_models.SubnetGroup,
     "AWS::Redshift::Cluster": redshift_models.Cluster,
     "AWS::Redshift::ClusterParameterGroup": redshift_models.ParameterGroup,
     "AWS::Redshift::ClusterSubnetGroup": redshift_models.SubnetGroup,
@@ -54,6 +51,14 @@ MODEL_MAP = {
     "AWS::SQS::Queue": sqs_models.Queue,
 }
 
+# The models of services which import this module themselves, so that they
+# are only looked up when a template uses them
+LAZY_MODEL_MAP = {
+    "AWS::RDS::DBInstance": ("moto.rds.models", "Database"),
+    "AWS::RDS::DBSecurityGroup": ("moto.rds.models", "SecurityGroup"),
+    "AWS::RDS::DBSubnetGroup": ("moto.rds.models", "SubnetGroup"),
+}
+
 # http://docs.aws.amazon.com/AWSCloudFormation/latest/UserGuide/aws-properties-name.html
 NAME_TYPE_MAP = {
     "AWS::CloudWatch::Alarm": "Alarm",
@@ -152,6 +157,9 @@ def clean_json(resource_json, resources_map):
 def resource_class_from_type(resource_type):
     if resource_type in NULL_MODELS:
         return None
+    if resource_type in LAZY_MODEL_MAP:
+        module_name, class_name = LAZY_MODEL_MAP[resource_type]
+        return getattr(importlib.import_module(module_name), class_name)
     if resource_type not in MODEL_MAP:
         logger.warning("No Moto CloudFormation support for %s", resource_type)
         return None
@@ -4,7 +4,7 @@ import json
 from six.moves.urllib.parse import urlparse
 
 from moto.core.responses import BaseResponse
-from moto.s3 import s3_backend
+from moto.s3 import s3_backends
 from .models import cloudformation_backends
 
 
@@ -19,7 +19,7 @@ class CloudFormationResponse(BaseResponse):
         bucket_name = template_url_parts.netloc.split(".")[0]
         key_name = template_url_parts.path.lstrip("/")
 
-        key = s3_backend.get_key(bucket_name, key_name)
+        key = s3_backends['global'].get_key(bucket_name, key_name)
         return key.value.decode("utf-8")
 
     def create_stack(self):
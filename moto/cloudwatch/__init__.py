@@ -1,2 +1,9 @@
-from .models import cloudwatch_backend
-mock_cloudwatch = cloudwatch_backend.decorator
+from .models import cloudwatch_backend, cloudwatch_backends  # flake8: noqa
+from ..core.models import MockAWS
+
+
+def mock_cloudwatch(func=None):
+    if func:
+        return MockAWS(cloudwatch_backends)(func)
+    else:
+        return MockAWS(cloudwatch_backends)
@@ -1,4 +1,4 @@
-from moto.core import BaseBackend
+from moto.core import BaseBackend, GlobalBackends
 
 
 class Dimension(object):
@@ -99,4 +99,5 @@ class CloudWatchBackend(BaseBackend):
         return self.metric_data
 
 
-cloudwatch_backend = CloudWatchBackend()
+cloudwatch_backends = GlobalBackends(CloudWatchBackend)
+cloudwatch_backend = cloudwatch_backends['global']
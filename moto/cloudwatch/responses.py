@@ -1,10 +1,14 @@
 from moto.core.responses import BaseResponse
-from .models import cloudwatch_backend
+from .models import cloudwatch_backends
 import logging
 
 
 class CloudWatchResponse(BaseResponse):
 
+    @property
+    def cloudwatch_backend(self):
+        return cloudwatch_backends['global']
+
     def put_metric_alarm(self):
         name = self._get_param('AlarmName')
         comparison_operator = self._get_param('ComparisonOperator')
@@ -18,13 +22,13 @@ class CloudWatchResponse(BaseResponse):
         ok_actions = self._get_multi_param('OKActions.member')
         insufficient_data_actions = self._get_multi_param("InsufficientDataActions.member")
         unit = self._get_param('Unit')
-        alarm = cloudwatch_backend.put_metric_alarm(name, comparison_operator,
-                                                    evaluation_periods, period,
-                                                    threshold, statistic,
-                                                    description, dimensions,
-                                                    alarm_actions, ok_actions,
-                                                    insufficient_data_actions,
-                                                    unit)
+        alarm = self.cloudwatch_backend.put_metric_alarm(name, comparison_operator,
+                                                         evaluation_periods, period,
+                                                         threshold, statistic,
+                                                         description, dimensions,
+                                                         alarm_actions, ok_actions,
+                                                         insufficient_data_actions,
+                                                         unit)
         template = self.response_template(PUT_METRIC_ALARM_TEMPLATE)
         return template.render(alarm=alarm)
 
@@ -35,22 +39,22 @@ class CloudWatchResponse(BaseResponse):
         state_value = self._get_param('StateValue')
 
         if action_prefix:
-            alarms = cloudwatch_backend.get_alarms_by_action_prefix(action_prefix)
+            alarms = self.cloudwatch_backend.get_alarms_by_action_prefix(action_prefix)
         elif alarm_name_prefix:
-            alarms = cloudwatch_backend.get_alarms_by_alarm_name_prefix(alarm_name_prefix)
+            alarms = self.cloudwatch_backend.get_alarms_by_alarm_name_prefix(alarm_name_prefix)
         elif alarm_names:
-            alarms = cloudwatch_backend.get_alarms_by_alarm_names(alarm_names)
+            alarms = self.cloudwatch_backend.get_alarms_by_alarm_names(alarm_names)
         elif state_value:
-            alarms = cloudwatch_backend.get_alarms_by_state_value(state_value)
+            alarms = self.cloudwatch_backend.get_alarms_by_state_value(state_value)
         else :
-            alarms = cloudwatch_backend.get_all_alarms()
+            alarms = self.cloudwatch_backend.get_all_alarms()
 
         template = self.response_template(DESCRIBE_ALARMS_TEMPLATE)
         return template.render(alarms=alarms)
 
     def delete_alarms(self):
         alarm_names = self._get_multi_param('AlarmNames.member')
-        cloudwatch_backend.delete_alarms(alarm_names)
+        self.cloudwatch_backend.delete_alarms(alarm_names)
         template = self.response_template(DELETE_METRIC_ALARMS_TEMPLATE)
         return template.render()
 
@@ -76,12 +80,12 @@ class CloudWatchResponse(BaseResponse):
                 dimension_index += 1
             metric_data.append([metric_name, value, dimensions])
             metric_index += 1
-        cloudwatch_backend.put_metric_data(namespace, metric_data)
+        self.cloudwatch_backend.put_metric_data(namespace, metric_data)
         template = self.response_template(PUT_METRIC_DATA_TEMPLATE)
         return template.render()
 
     def list_metrics(self):
-        metrics = cloudwatch_backend.get_all_metrics()
+        metrics = self.cloudwatch_backend.get_all_metrics()
         template = self.response_template(LIST_METRICS_TEMPLATE)
         return template.render(metrics=metrics)
 
@@ -0,0 +1,200 @@
+from __future__ import unicode_literals
+import sys
+from threading import Lock
+
+import six
+from six.moves.urllib.parse import parse_qs, urlsplit
+
+from .utils import join_response, state_lock
+
+
+class CaseInsensitiveHeaders(dict):
+    """
+    Request headers which can be looked up in any case, like the headers of
+    an HTTPretty or Flask request
+    """
+
+    def __init__(self, headers):
+        super(CaseInsensitiveHeaders, self).__init__()
+        self.names = {}
+        for name, value in headers.items():
+            if isinstance(value, six.binary_type):
+                value = value.decode('utf-8')
+            self[name] = value
+
+    def __setitem__(self, name, value):
+        self.names[name.lower()] = name
+        super(CaseInsensitiveHeaders, self).__setitem__(name, value)
+
+    def __getitem__(self, name):
+        return super(CaseInsensitiveHeaders, self).__getitem__(self.names.get(name.lower(), name))
+
+    def __contains__(self, name):
+        return name.lower() in self.names
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+
+class DirectRequest(object):
+    """
+    The parts of a botocore prepared request that the response handlers
+    read, in the shape HTTPretty hands them over
+    """
+
+    def __init__(self, method, url, headers, body):
+        self.method = method
+        self.url = url
+        parsed = urlsplit(url)
+        self.path = parsed.path
+        self.querystring = parse_qs(parsed.query, keep_blank_values=True)
+        self.headers = CaseInsensitiveHeaders(headers)
+        if hasattr(body, 'read'):
+            body = body.read()
+        if body is None:
+            body = b''
+        elif isinstance(body, six.text_type):
+            body = body.encode('utf-8')
+        self.body = body
+
+
+class RawResponse(six.BytesIO):
+    """
+    Stands in for the urllib3 response botocore reads bodies from
+    """
+
+    def stream(self, **kwargs):
+        contents = self.read()
+        while contents:
+            yield contents
+            contents = self.read()
+
+
+def botocore_supports_direct_dispatch():
+    """
+    Whether the installed botocore emits before-send and accepts an
+    AWSResponse from it
+    """
+    try:
+        from botocore.awsrequest import AWSResponse  # noqa
+    except ImportError:
+        return False
+    return True
+
+
+class DirectDispatcher(object):
+    """
+    Hands the requests of botocore clients straight to the response handlers
+    of the active mocks, from botocore's before-send event, instead of
+    sending them over an HTTPretty socket. The service of a host is found
+    once and cached, so a request costs one regex search over the urls of
+    its own service.
+
+    Requests to services that aren't mocked are left to go over HTTP.
+
+    This needs botocore 1.11.0 or later, which sends requests itself and
+    emits before-send; older versions send them through requests.
+    """
+    # The most hosts to remember the service of
+    max_cached_hosts = 1024
+
+    def __init__(self):
+        self.enabled = False
+        self.installed = False
+        self.lock = Lock()
+        self.compiled_urls = []
+        self.hosts = {}
+
+    def enable(self):
+        with self.lock:
+            if not self.installed:
+                self.install()
+                self.installed = True
+            self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def install(self):
+        try:
+            import botocore
+        except ImportError:
+            raise RuntimeError('Direct dispatch needs botocore to be installed')
+        if not botocore_supports_direct_dispatch():
+            raise RuntimeError(
+                'Direct dispatch needs botocore 1.11.0 or later, but botocore '
+                '{0} is installed'.format(botocore.__version__))
+        from botocore.handlers import BUILTIN_HANDLERS
+        # New sessions pick up the builtin handlers when they are created
+        BUILTIN_HANDLERS.append(('before-send', self))
+        boto3 = sys.modules.get('boto3')
+        if boto3 is not None and boto3.DEFAULT_SESSION is not None:
+            boto3.DEFAULT_SESSION.events.register('before-send', self)
+
+    def register(self, compiled_urls):
+        with self.lock:
+            if compiled_urls not in self.compiled_urls:
+                self.compiled_urls.append(compiled_urls)
+                self.hosts.clear()
+
+    def reset(self):
+        with self.lock:
+            self.compiled_urls = []
+            self.hosts.clear()
+
+    def compiled_urls_for(self, url):
+        parsed = urlsplit(url)
+        host = (parsed.scheme, parsed.netloc)
+        try:
+            return self.hosts[host]
+        except KeyError:
+            pass
+        with self.lock:
+            match = None
+            for compiled_urls in self.compiled_urls:
+                if compiled_urls.handler_for(url) is not None:
+                    match = compiled_urls
+                    break
+            if len(self.hosts) >= self.max_cached_hosts:
+                self.hosts.clear()
+            self.hosts[host] = match
+            return match
+
+    def dispatch(self, request):
+        """
+        Returns the status, headers and body of the mocked response to a
+        botocore prepared request, or None if no active mock serves it
+        """
+        compiled_urls = self.compiled_urls_for(request.url)
+        if compiled_urls is None:
+            return None
+        handler = compiled_urls.handler_for(request.url)
+        if handler is None:
+            # The host is mocked, but not this path
+            return None
+        direct_request = DirectRequest(request.method, request.url, request.headers, request.body)
+        with state_lock.reading():
+            status, headers, body = handler(direct_request, request.url, {})
+        body = join_response(body)
+        response_headers = dict(
+            (six.text_type(name), six.text_type(value))
+            for name, value in headers.items() if name != 'status')
+        if isinstance(body, six.text_type):
+            body = body.encode('utf-8')
+        return int(status), response_headers, body
+
+    def __call__(self, request, **kwargs):
+        if not self.enabled:
+            return None
+        response = self.dispatch(request)
+        if response is None:
+            return None
+        from botocore.awsrequest import AWSResponse
+        status, headers, body = response
+        return AWSResponse(request.url, status, headers, RawResponse(body))
+
+
+direct_dispatcher = DirectDispatcher()
@@ -0,0 +1,168 @@
+from __future__ import unicode_literals
+import bisect
+import contextlib
+import threading
+import time
+
+# Upper bounds in seconds of the latency histogram buckets
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class CallStats(object):
+    def __init__(self, bucket_count):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        # The last bucket counts calls slower than every bound
+        self.bucket_counts = [0] * (bucket_count + 1)
+
+
+class CallTimer(object):
+    """
+    Times the block it is used for. The call counts as an error if the block
+    raises or sets `status` to 400 or above.
+    """
+
+    def __init__(self, metrics, label_values):
+        self.metrics = metrics
+        self.label_values = label_values
+        self.status = 200
+        self.deferred = False
+
+    def __enter__(self):
+        self.start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.deferred and exc_type is None:
+            return
+        self.finish(exc_type is not None)
+
+    def finish(self, error=False):
+        error = error or int(self.status) >= 400
+        self.metrics.record(self.label_values, time.time() - self.start, error)
+
+    def until_rendered(self, stream):
+        """
+        Keep timing until the ResponseStream `stream` has been rendered,
+        rather than until the end of the block
+        """
+        if stream.renders:
+            self.deferred = True
+            stream.within(self._rendering())
+
+    @contextlib.contextmanager
+    def _rendering(self):
+        error = True
+        try:
+            yield
+            error = False
+        finally:
+            self.finish(error)
+
+
+class LatencyMetrics(object):
+    """
+    Call counts, error counts and latency histograms, by label values such
+    as the service and action name. Recording a call is a few dict and list
+    operations, so it stays on under load.
+    """
+
+    def __init__(self, name, label_names, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def timer(self, label_values):
+        return CallTimer(self, label_values)
+
+    def record(self, label_values, seconds, error=False):
+        bucket = bisect.bisect_left(self.buckets, seconds)
+        with self.lock:
+            stats = self.stats.get(label_values)
+            if stats is None:
+                stats = self.stats[label_values] = CallStats(len(self.buckets))
+            stats.count += 1
+            stats.total_seconds += seconds
+            stats.bucket_counts[bucket] += 1
+            if error:
+                stats.errors += 1
+
+    def get_stats(self):
+        """
+        A dict of the count, errors, total seconds and histogram of each set
+        of label values. The histogram maps each bucket's upper bound to the
+        number of calls which took longer than the previous bound.
+        """
+        with self.lock:
+            return dict(
+                (label_values, {
+                    'count': stats.count,
+                    'errors': stats.errors,
+                    'total_seconds': stats.total_seconds,
+                    'histogram': dict(zip(self.buckets + (float('inf'),), stats.bucket_counts)),
+                })
+                for label_values, stats in self.stats.items()
+            )
+
+    def reset(self):
+        with self.lock:
+            self.stats = {}
+
+    def _labels(self, label_values, extra=()):
+        pairs = list(zip(self.label_names, label_values)) + list(extra)
+        return ','.join('{0}="{1}"'.format(name, value) for name, value in pairs)
+
+    def prometheus_lines(self):
+        stats = sorted(self.get_stats().items())
+        lines = ['# TYPE {0}_requests_total counter'.format(self.name)]
+        for label_values, call_stats in stats:
+            lines.append('{0}_requests_total{{{1}}} {2}'.format(
+                self.name, self._labels(label_values), call_stats['count']))
+
+        lines.append('# TYPE {0}_errors_total counter'.format(self.name))
+        for label_values, call_stats in stats:
+            lines.append('{0}_errors_total{{{1}}} {2}'.format(
+                self.name, self._labels(label_values), call_stats['errors']))
+
+        lines.append('# TYPE {0}_latency_seconds histogram'.format(self.name))
+        for label_values, call_stats in stats:
+            cumulative = 0
+            for bound in sorted(call_stats['histogram']):
+                cumulative += call_stats['histogram'][bound]
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append('{0}_latency_seconds_bucket{{{1}}} {2}'.format(
+                    self.name, self._labels(label_values, [('le', le)]), cumulative))
+            lines.append('{0}_latency_seconds_sum{{{1}}} {2!r}'.format(
+                self.name, self._labels(label_values), call_stats['total_seconds']))
+            lines.append('{0}_latency_seconds_count{{{1}}} {2}'.format(
+                self.name, self._labels(label_values), call_stats['count']))
+        return lines
+
+
+# Every service action, in decorator and server mode
+action_metrics = LatencyMetrics('moto_action', ['service', 'action'])
+# Every request to a handler of the server, including the Flask conversion
+handler_metrics = LatencyMetrics('moto_handler', ['handler'])
+
+
+def get_metrics():
+    """
+    The stats of every action and server handler called in this process
+    """
+    return {
+        'actions': action_metrics.get_stats(),
+        'handlers': handler_metrics.get_stats(),
+    }
+
+
+def reset_metrics():
+    action_metrics.reset()
+    handler_metrics.reset()
+
+
+def prometheus_text():
+    lines = action_metrics.prometheus_lines() + handler_metrics.prometheus_lines()
+    return '\n'.join(lines) + '\n'
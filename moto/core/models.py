@@ -2,21 +2,124 @@ from __future__ import unicode_literals
 
 import functools
 import inspect
+import io
 import re
-
-from httpretty import HTTPretty
+import sys
+import threading
+import time
+import weakref
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+
+from httpretty import HTTPretty, URIInfo
+from six.moves import cPickle as pickle
+from .direct import direct_dispatcher
 from .responses import metadata_response
-from .utils import convert_regex_to_flask_path
+from .tenants import tenant_backends
+from .utils import (
+    Immutable, TrackedDict, convert_regex_to_flask_path, head_response_headers, join_response, state_lock)
+
+
+class CompiledURLs(object):
+    """
+    The url patterns of a service compiled into one alternation regex, so
+    HTTPretty only has to try a single pattern per service. dispatch() then
+    calls the handler of whichever pattern matched.
+    """
+
+    def __init__(self, urls):
+        alternatives = []
+        self.handlers = {}
+        for index, (url, handler) in enumerate(urls.items()):
+            group_name = 'url{0}'.format(index)
+            # The group names of each url would clash in the combined regex,
+            # and the handlers don't use them
+            url = re.sub(r'\(\?P<\w+>', '(?:', url)
+            alternatives.append('(?P<{0}>{1})'.format(group_name, url))
+            self.handlers[group_name] = handler
+        self.regex = re.compile('|'.join(alternatives))
+
+    def handler_for(self, full_url):
+        # HTTPretty matches urls without their querystring
+        match = self.regex.search(full_url.split('?', 1)[0])
+        if match is None:
+            return None
+        return self.handlers[match.lastgroup]
+
+    def dispatch(self, request, full_url, headers):
+        with state_lock.reading():
+            status, headers, body = self.handler_for(full_url)(request, full_url, headers)
+        return status, head_response_headers(request.method, headers), join_response(body)
+
+
+METADATA_URLS = CompiledURLs({
+    'http://169.254.169.254/latest/meta-data/.*': metadata_response,
+})
 
 
 class MockAWS(object):
-    nested_count = 0
+    # The number of mocks started in each thread
+    local = threading.local()
+    # The number of threads with a mock started. HTTPretty patches sockets
+    # for the whole process, so it stays enabled while any thread needs it
+    active_threads = 0
+    lock = threading.Lock()
+    # Patterns of the CompiledURLs currently registered with HTTPretty
+    registered_patterns = set()
+    # Registered along with the patterns. If it no longer matches, HTTPretty
+    # has been reset by someone else and the patterns are gone too
+    registration_marker = 'http://registered.moto.invalid/'
+    # Whether each thread has its own state of the mocked backends
+    thread_isolation = False
 
     def __init__(self, backends):
         self.backends = backends
+        with MockAWS.lock:
+            if MockAWS.active_threads == 0:
+                self.reset_httpretty()
+
+    @classmethod
+    def reset_httpretty(cls):
+        HTTPretty.reset()
+        MockAWS.registered_patterns.clear()
+
+    @classmethod
+    def register_urls(cls, compiled_urls):
+        matcher, _ = HTTPretty.match_uriinfo(URIInfo.from_uri(cls.registration_marker, None))
+        if matcher is None or matcher.info is None:
+            MockAWS.registered_patterns.clear()
+            HTTPretty.register_uri(HTTPretty.GET, cls.registration_marker, body='')
+        if compiled_urls.regex.pattern in MockAWS.registered_patterns:
+            return
+        for method in HTTPretty.METHODS:
+            HTTPretty.register_uri(
+                method=method,
+                uri=compiled_urls.regex,
+                body=compiled_urls.dispatch,
+            )
+        MockAWS.registered_patterns.add(compiled_urls.regex.pattern)
+
+    @classmethod
+    def enable_thread_isolation(cls):
+        """
+        Give every thread which starts a mock its own, empty, state of the
+        backends, so that tests can run in parallel threads. A thread's state
+        is dropped when it stops its last mock.
+        """
+        tenant_backends.enable()
+        MockAWS.thread_isolation = True
+
+    @classmethod
+    def disable_thread_isolation(cls):
+        MockAWS.thread_isolation = False
+        tenant_backends.disable()
 
-        if self.__class__.nested_count == 0:
-            HTTPretty.reset()
+    @property
+    def nested_count(self):
+        return getattr(MockAWS.local, 'nested_count', 0)
 
     def __call__(self, func, reset=True):
         if inspect.isclass(func):
@@ -29,40 +132,75 @@ class MockAWS(object):
     def __exit__(self, *args):
         self.stop()
 
-    def start(self, reset=True):
-        self.__class__.nested_count += 1
-        if reset:
+    def reset(self):
+        if isinstance(self.backends, RegionBackends):
+            # Only the regions which have been used need a reset
+            self.backends.reset()
+        else:
             for backend in self.backends.values():
                 backend.reset()
 
-        if not HTTPretty.is_enabled():
-            HTTPretty.enable()
+    def snapshot(self):
+        """
+        Capture the state of this mock's backends, to be handed to restore()
+        """
+        if isinstance(self.backends, RegionBackends):
+            return self.backends.snapshot()
+        return dict(
+            (name, backend.snapshot())
+            for name, backend in self.backends.items()
+        )
+
+    def restore(self, snapshot):
+        if isinstance(self.backends, RegionBackends):
+            self.backends.restore(snapshot)
+        else:
+            for name, backend in self.backends.items():
+                backend.restore(snapshot[name])
 
-        for method in HTTPretty.METHODS:
-            backend = list(self.backends.values())[0]
-            for key, value in backend.urls.items():
-                HTTPretty.register_uri(
-                    method=method,
-                    uri=re.compile(key),
-                    body=value,
-                )
+    def start(self, reset=True):
+        if self.nested_count == 0:
+            self.start_thread()
+        MockAWS.local.nested_count = self.nested_count + 1
+        if reset:
+            self.reset()
 
+        if isinstance(self.backends, RegionBackends):
+            backend = self.backends.default_backend
+        else:
+            backend = list(self.backends.values())[0]
+        with MockAWS.lock:
+            self.register_urls(backend.compiled_urls)
+            direct_dispatcher.register(backend.compiled_urls)
             # Mock out localhost instance metadata
-            HTTPretty.register_uri(
-                method=method,
-                uri=re.compile('http://169.254.169.254/latest/meta-data/.*'),
-                body=metadata_response
-            )
+            self.register_urls(METADATA_URLS)
 
     def stop(self):
-        self.__class__.nested_count -= 1
-
-        if self.__class__.nested_count < 0:
+        if self.nested_count == 0:
             raise RuntimeError('Called stop() before start().')
 
-        if self.__class__.nested_count == 0:
-            HTTPretty.disable()
-            HTTPretty.reset()
+        MockAWS.local.nested_count = self.nested_count - 1
+        if self.nested_count == 0:
+            self.stop_thread()
+
+    def start_thread(self):
+        if MockAWS.thread_isolation:
+            tenant_backends.use(('thread', threading.current_thread().ident))
+        with MockAWS.lock:
+            MockAWS.active_threads += 1
+            if not HTTPretty.is_enabled():
+                HTTPretty.enable()
+
+    def stop_thread(self):
+        if MockAWS.thread_isolation:
+            tenant_backends.reset(tenant_backends.current_tenant)
+            tenant_backends.use(None)
+        with MockAWS.lock:
+            MockAWS.active_threads -= 1
+            if MockAWS.active_threads == 0:
+                HTTPretty.disable()
+                self.reset_httpretty()
+                direct_dispatcher.reset()
 
     def decorate_callable(self, func, reset):
         def wrapper(*args, **kwargs):
@@ -97,6 +235,102 @@ class MockAWS(object):
         return klass
 
 
+class RegionBackends(Mapping):
+    """
+    The per region backends of a service. A region's backend is only created
+    the first time that region is looked up, and reset() only resets the
+    backends which have been created.
+
+    While a tenant is active in the thread, all of these work on the
+    tenant's own backends instead of the shared ones. See TenantBackends.
+    """
+
+    def __init__(self, region_names, backend_factory, default_region_name='us-east-1'):
+        self.region_names = list(region_names)
+        self.backend_factory = backend_factory
+        self.default_region_name = default_region_name
+        # The shared backends, by region name
+        self.backends = {}
+        self.lock = threading.Lock()
+
+    def current_backends(self):
+        """
+        The dict of backends, by region name, of the tenant active in this
+        thread, or the shared one
+        """
+        backends = tenant_backends.backends_for(self)
+        return self.backends if backends is None else backends
+
+    def __getitem__(self, region_name):
+        backends = self.current_backends()
+        try:
+            return backends[region_name]
+        except KeyError:
+            if region_name not in self.region_names:
+                raise
+        with self.lock:
+            backend = backends.get(region_name)
+            if backend is None:
+                backend = backends[region_name] = self.backend_factory(region_name)
+        return backend
+
+    def __iter__(self):
+        return iter(self.region_names)
+
+    def __len__(self):
+        return len(self.region_names)
+
+    def __contains__(self, region_name):
+        return region_name in self.region_names
+
+    @property
+    def default_backend(self):
+        return self[self.default_region_name]
+
+    def created_backends(self):
+        """
+        A dict of the backends that have been created so far, by region name
+        """
+        return dict(self.current_backends())
+
+    def reset(self):
+        for backend in self.created_backends().values():
+            backend.reset()
+
+    def snapshot(self):
+        """
+        The states of the backends that have been created so far, by region name
+        """
+        return dict(
+            (region_name, backend.snapshot())
+            for region_name, backend in self.created_backends().items()
+        )
+
+    def restore(self, snapshot):
+        """
+        Restore the regions in `snapshot` and reset any region created since
+        """
+        for region_name, backend in self.created_backends().items():
+            if region_name in snapshot:
+                backend.restore(snapshot[region_name])
+            else:
+                backend.reset()
+        for region_name in snapshot:
+            if region_name not in self.current_backends():
+                self[region_name].restore(snapshot[region_name])
+
+
+class GlobalBackends(RegionBackends):
+    """
+    The backend of a service without regions, as the backend of its only
+    region, 'global', so that tenants get their own copy of it as well
+    """
+
+    def __init__(self, backend_class):
+        super(GlobalBackends, self).__init__(
+            ['global'], lambda region_name: backend_class(), default_region_name='global')
+
+
 class Model(type):
     def __new__(self, clsname, bases, namespace):
         cls = super(Model, self).__new__(self, clsname, bases, namespace)
@@ -118,11 +352,195 @@ class Model(type):
         return dec
 
 
+class Snapshot(object):
+    """
+    A pickled copy of some backend state. Unpickling is much faster than
+    copy.deepcopy and leaves the snapshot itself untouched, so it can be
+    loaded any number of times. Models hold references to their backends;
+    those are kept as references instead of being copied along, and so are
+    immutable values such as S3 object bodies.
+
+    The entries of `collections`, each a TrackedDict, are pickled one by one
+    so that they can be loaded one by one. They must not reference each
+    other or the rest of the state.
+    """
+    # The snapshot each backend last took or restored in full, whose
+    # collections are tracking the changes since
+    baselines = weakref.WeakKeyDictionary()
+
+    def __init__(self, state, collections=None):
+        self.backends = {}
+        self.data = self._dump(state)
+        self.collections = dict(
+            (name, dict((key, self._dump(value)) for key, value in collection.items()))
+            for name, collection in (collections or {}).items()
+        )
+
+    def _dump(self, obj):
+        data = io.BytesIO()
+        pickler = pickle.Pickler(data, pickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = self._persistent_id
+        pickler.dump(obj)
+        return data.getvalue()
+
+    def _persistent_id(self, obj):
+        if isinstance(obj, (BaseBackend, Immutable)):
+            self.backends[id(obj)] = obj
+            return id(obj)
+        return None
+
+    def _load(self, data):
+        unpickler = pickle.Unpickler(io.BytesIO(data))
+        unpickler.persistent_load = self.backends.__getitem__
+        return unpickler.load()
+
+    def load(self):
+        return self._load(self.data)
+
+    def load_entry(self, name, key):
+        return self._load(self.collections[name][key])
+
+
+class SizeCache(object):
+    """
+    The approximate sizes of backends. Asking for the size of a backend
+    returns the last measurement, and measures it again from a daemon thread
+    when that is more than `max_age` seconds old, so that requests never
+    walk the state of a backend themselves.
+    """
+
+    def __init__(self, max_age=10):
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        # The last size of each backend and when it was measured
+        self.sizes = weakref.WeakKeyDictionary()
+        self.measuring = weakref.WeakKeyDictionary()
+
+    def get(self, backend):
+        with self.lock:
+            size, measured_at = self.sizes.get(backend, (None, None))
+            stale = measured_at is None or time.time() - measured_at > self.max_age
+            if stale and backend not in self.measuring:
+                self.measuring[backend] = True
+                thread = threading.Thread(target=self.measure, args=(backend,))
+                thread.daemon = True
+                thread.start()
+        return size
+
+    def measure(self, backend):
+        try:
+            size = backend.measure_size()
+            with self.lock:
+                self.sizes[backend] = (size, time.time())
+        finally:
+            with self.lock:
+                self.measuring.pop(backend, None)
+
+
+backend_sizes = SizeCache()
+
+
 class BaseBackend(object):
+    # Compiled url patterns of each service, by backend module
+    _compiled_urls = {}
+
     def reset(self):
         self.__dict__ = {}
         self.__init__()
 
+    def object_counts(self):
+        """
+        The number of objects in each collection of this backend, by
+        attribute name
+        """
+        return dict(
+            (name, len(value))
+            for name, value in self.__dict__.items()
+            if isinstance(value, (dict, list, set))
+        )
+
+    def approximate_size(self):
+        """
+        Roughly how many bytes the state of this backend took up when it was
+        last measured, or None until it first is. See SizeCache.
+        """
+        return backend_sizes.get(self)
+
+    def measure_size(self):
+        """
+        Roughly how many bytes the state of this backend takes up, counting
+        everything reachable from it except other backends. This walks the
+        whole state, so approximate_size() only calls it in the background.
+        """
+        size = 0
+        seen = set([id(self)])
+        pending = [self.__dict__]
+        while pending:
+            obj = pending.pop()
+            if id(obj) in seen or isinstance(obj, BaseBackend):
+                continue
+            seen.add(id(obj))
+            size += sys.getsizeof(obj)
+            if isinstance(obj, dict):
+                pending.extend(obj.keys())
+                pending.extend(obj.values())
+            elif isinstance(obj, (list, tuple, set, frozenset)):
+                pending.extend(obj)
+            elif type(obj).__module__.startswith('moto.') and hasattr(obj, '__dict__'):
+                # Only the models' own state, not classes or modules
+                pending.append(obj.__dict__)
+        return size
+
+    def _tracked_collections(self):
+        return dict(
+            (name, value) for name, value in self.__dict__.items()
+            if isinstance(value, TrackedDict)
+        )
+
+    def _track_changes(self, snapshot):
+        for collection in self._tracked_collections().values():
+            collection.track()
+        Snapshot.baselines[self] = snapshot
+
+    def snapshot(self):
+        """
+        A copy of the state of this backend, which restore() can bring back
+        any number of times
+        """
+        collections = self._tracked_collections()
+        state = dict(
+            (name, value) for name, value in self.__dict__.items()
+            if name not in collections
+        )
+        snapshot = Snapshot(state, collections)
+        self._track_changes(snapshot)
+        return snapshot
+
+    def restore(self, snapshot):
+        """
+        Bring back the state of `snapshot`. When it is the last snapshot this
+        backend took or restored, only the entries of its TrackedDicts that
+        changed since are loaded again.
+        """
+        collections = self._tracked_collections()
+        state = snapshot.load()
+        if (Snapshot.baselines.get(self) is snapshot and
+                set(collections) == set(snapshot.collections) and
+                all(collection.changed is not None for collection in collections.values())):
+            for name, collection in collections.items():
+                collection.revert(
+                    snapshot.collections[name],
+                    functools.partial(snapshot.load_entry, name))
+            state.update(collections)
+            self.__dict__ = state
+            return
+
+        for name, entries in snapshot.collections.items():
+            state[name] = TrackedDict(
+                (key, snapshot.load_entry(name, key)) for key in entries)
+        self.__dict__ = state
+        self._track_changes(snapshot)
+
     @property
     def _url_module(self):
         backend_module = self.__class__.__module__
@@ -147,6 +565,18 @@ class BaseBackend(object):
 
         return urls
 
+    @property
+    def compiled_urls(self):
+        """
+        The urls of this service compiled once per process, for registering
+        with HTTPretty
+        """
+        module_name = self.__class__.__module__
+        compiled = BaseBackend._compiled_urls.get(module_name)
+        if compiled is None:
+            compiled = BaseBackend._compiled_urls[module_name] = CompiledURLs(self.urls)
+        return compiled
+
     @property
     def url_paths(self):
         """
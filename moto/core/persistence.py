@@ -0,0 +1,158 @@
+from __future__ import unicode_literals
+import hashlib
+import io
+import logging
+import os
+import threading
+
+import six
+from six.moves import cPickle as pickle
+
+from .models import BaseBackend
+from .utils import ContentFile, link_or_copy, state_lock
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE_NAME = 'state.pickle'
+BLOB_DIR_NAME = 'blobs'
+# Byte strings at least this long, such as S3 object values and Glacier
+# archives, are kept in side files instead of the main state file
+BLOB_THRESHOLD = 64 * 1024
+
+
+class StateStore(object):
+    """
+    Saves the state of every loaded backend to a directory and loads it back.
+
+    The object graph of all backends goes into one pickle, in which backends
+    are referenced by service and region name. Backends which are not one of
+    the registered ones, such as copies made by a model, are saved by value.
+    No request runs while the state is pickled, so each save is of the state
+    between two requests. Large byte strings are written
+    to content addressed side files, so a periodic save only writes the blobs
+    that are new since the last one. Content files, such as S3 object bodies
+    spilled to disk, are hard linked among them instead of being read.
+    """
+
+    def __init__(self, state_dir, backends, blob_threshold=BLOB_THRESHOLD):
+        self.state_dir = state_dir
+        self.blob_dir = os.path.join(state_dir, BLOB_DIR_NAME)
+        self.backends = backends
+        self.blob_threshold = blob_threshold
+        self.lock = threading.Lock()
+
+    @property
+    def state_path(self):
+        return os.path.join(self.state_dir, STATE_FILE_NAME)
+
+    def _created_backends(self):
+        backends = {}
+        for service_name in self.backends.loaded_backends():
+            for region_name, backend in self.backends.service_backends(service_name).items():
+                backends[(service_name, region_name)] = backend
+        return backends
+
+    def _get_backend(self, service_name, region_name):
+        if region_name == 'global':
+            return self.backends[service_name]
+        return self.backends.region_backends(service_name)[region_name]
+
+    def _write_blob(self, value):
+        blob_name = hashlib.sha1(value).hexdigest()
+        path = os.path.join(self.blob_dir, blob_name)
+        if not os.path.exists(path):
+            temp_path = path + '.tmp'
+            with open(temp_path, 'wb') as blob_file:
+                blob_file.write(value)
+            os.rename(temp_path, path)
+        return blob_name
+
+    def _link_file(self, content_file):
+        path = os.path.join(self.blob_dir, content_file.name)
+        if not os.path.exists(path):
+            link_or_copy(content_file.path, path)
+        return content_file.name
+
+    def _read_blob(self, blob_name):
+        with open(os.path.join(self.blob_dir, blob_name), 'rb') as blob_file:
+            return blob_file.read()
+
+    def save(self):
+        with self.lock:
+            if not os.path.isdir(self.blob_dir):
+                os.makedirs(self.blob_dir)
+
+            backend_names = {}
+            blob_names = set()
+
+            def persistent_id(obj):
+                if isinstance(obj, BaseBackend) and id(obj) in backend_names:
+                    return ('backend',) + backend_names[id(obj)]
+                if isinstance(obj, six.binary_type) and len(obj) >= self.blob_threshold:
+                    blob_name = self._write_blob(obj)
+                    blob_names.add(blob_name)
+                    return ('blob', blob_name)
+                if isinstance(obj, ContentFile):
+                    blob_name = self._link_file(obj)
+                    blob_names.add(blob_name)
+                    return ('file', blob_name)
+                return None
+
+            data = io.BytesIO()
+            pickler = pickle.Pickler(data, pickle.HIGHEST_PROTOCOL)
+            pickler.persistent_id = persistent_id
+            with state_lock.writing():
+                backends = self._created_backends()
+                backend_names.update((id(backend), names) for names, backend in backends.items())
+                pickler.dump(dict((names, backend.__dict__) for names, backend in backends.items()))
+
+            temp_path = self.state_path + '.tmp'
+            with open(temp_path, 'wb') as state_file:
+                state_file.write(data.getvalue())
+            os.rename(temp_path, self.state_path)
+
+            # Blobs which are no longer referenced from any backend
+            for blob_name in os.listdir(self.blob_dir):
+                if blob_name not in blob_names:
+                    os.remove(os.path.join(self.blob_dir, blob_name))
+
+    def load(self):
+        """
+        Load the saved state into the backends. Returns False if there is no
+        saved state yet.
+        """
+        if not os.path.exists(self.state_path):
+            return False
+
+        def persistent_load(pid):
+            if pid[0] == 'backend':
+                return self._get_backend(*pid[1:])
+            if pid[0] == 'file':
+                return ContentFile(os.path.join(self.blob_dir, pid[1]))
+            return self._read_blob(pid[1])
+
+        with self.lock:
+            with open(self.state_path, 'rb') as state_file:
+                unpickler = pickle.Unpickler(state_file)
+                unpickler.persistent_load = persistent_load
+                state = unpickler.load()
+            for names, backend_state in state.items():
+                self._get_backend(*names).__dict__ = backend_state
+        return True
+
+    def save_periodically(self, interval):
+        """
+        Save the state every `interval` seconds from a daemon thread
+        """
+        def run():
+            while not stopped.wait(interval):
+                try:
+                    self.save()
+                except Exception:
+                    logger.exception("Could not save the state to %s", self.state_dir)
+
+        stopped = threading.Event()
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+        return stopped
@@ -0,0 +1,178 @@
+from __future__ import unicode_literals
+import atexit
+import contextlib
+import cProfile
+import os
+import pstats
+import threading
+
+import six
+
+from .utils import ResponseStream
+
+# Comma separated actions to profile from the start, such as
+# "ec2:DescribeInstances,dynamodb2:Query", or "*" for every action
+PROFILE_ENV_VAR = 'MOTO_PROFILE'
+# Directory the profiles are written to when the process exits
+PROFILE_DIR_ENV_VAR = 'MOTO_PROFILE_DIR'
+
+
+class _StatsCopy(object):
+    """
+    A profile-like source which pstats.Stats loads a copy of `stats` from,
+    leaving `stats` itself untouched. Stats can't be created empty on Python 2.
+    """
+
+    def __init__(self, stats):
+        self.source = stats
+
+    def create_stats(self):
+        self.stats = dict(self.source.stats)
+
+
+class ActionProfiler(object):
+    """
+    Runs selected actions under cProfile and aggregates the stats of each
+    action over all of its calls. Actions are selected as "service:Action",
+    as "Action" for that action of every service, or as "*".
+    """
+
+    def __init__(self):
+        self.actions = set()
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.actions)
+
+    def enable(self, actions):
+        with self.lock:
+            self.actions.update(actions)
+
+    def disable(self):
+        with self.lock:
+            self.actions = set()
+
+    def reset(self):
+        with self.lock:
+            self.stats = {}
+
+    def is_profiled(self, service, action):
+        actions = self.actions
+        return ('*' in actions or action in actions or
+                '{0}:{1}'.format(service, action) in actions)
+
+    def call(self, service, action, func, *args):
+        """
+        Calls func, under the profiler if the action is selected. A
+        ResponseStream in what it returns is rendered under the profiler too,
+        and the call is only added to the stats once it has been.
+        """
+        if not self.actions or not self.is_profiled(service, action):
+            return func(*args)
+
+        key = '{0}:{1}'.format(service, action)
+        profile = cProfile.Profile()
+        response = None
+        try:
+            response = profile.runcall(func, *args)
+        finally:
+            stream = _response_stream(response)
+            if stream is not None and stream.renders:
+                stream.within(self._rendering(key, profile))
+            else:
+                self._add(key, profile)
+        return response
+
+    @contextlib.contextmanager
+    def _rendering(self, key, profile):
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._add(key, profile)
+
+    def _add(self, key, profile):
+        with self.lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                self.stats[key] = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+
+    def report(self, action=None, sort='cumulative', limit=50):
+        """
+        The text report of the stats of one profiled action, or of all of
+        them together
+        """
+        with self.lock:
+            if action is not None:
+                profiles = [self.stats[action]] if action in self.stats else []
+            else:
+                profiles = list(self.stats.values())
+            if not profiles:
+                return ''
+            output = six.StringIO()
+            stats = pstats.Stats(_StatsCopy(profiles[0]), stream=output)
+            for profile in profiles[1:]:
+                stats.add(profile)
+            stats.sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+    def dump(self, directory):
+        """
+        Write the stats of each profiled action to <directory>/<service>.<Action>.prof,
+        to be read with pstats or a viewer such as snakeviz
+        """
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        with self.lock:
+            for key, stats in self.stats.items():
+                stats.dump_stats(os.path.join(directory, key.replace(':', '.') + '.prof'))
+
+
+def _response_stream(response):
+    """
+    The ResponseStream of what a handler returned: the body itself, or
+    the body in a (body, headers) or (status, headers, body) tuple
+    """
+    if isinstance(response, ResponseStream):
+        return response
+    if isinstance(response, tuple):
+        for item in response:
+            if isinstance(item, ResponseStream):
+                return item
+    return None
+
+
+action_profiler = ActionProfiler()
+
+
+@contextlib.contextmanager
+def profile_actions(*actions):
+    """
+    Profile the given actions within the block, for decorator mode:
+
+        with profile_actions('ec2:DescribeInstances'):
+            run_the_code()
+        print(action_profiler.report())
+
+    Actions which were already profiled, such as those of MOTO_PROFILE,
+    still are after the block.
+    """
+    with action_profiler.lock:
+        previous_actions = set(action_profiler.actions)
+    action_profiler.enable(actions)
+    try:
+        yield action_profiler
+    finally:
+        with action_profiler.lock:
+            action_profiler.actions = previous_actions
+
+
+if os.environ.get(PROFILE_ENV_VAR):
+    action_profiler.enable(action.strip() for action in os.environ[PROFILE_ENV_VAR].split(','))
+    if os.environ.get(PROFILE_DIR_ENV_VAR):
+        atexit.register(action_profiler.dump, os.environ[PROFILE_DIR_ENV_VAR])
@@ -2,14 +2,20 @@ from __future__ import unicode_literals
 import datetime
 import json
 import re
+from collections import defaultdict
+from threading import RLock
 
-from jinja2 import Environment, DictLoader, TemplateNotFound
+from jinja2 import Environment
 
 import six
 from six.moves.urllib.parse import parse_qs, urlparse
 
 from werkzeug.exceptions import HTTPException
-from moto.core.utils import camelcase_to_underscores, method_names_from_class
+from moto.core.metrics import action_metrics
+from moto.core.profiling import action_profiler
+from moto.core.utils import (
+    camelcase_to_underscores, method_names_from_class, Querystring,
+    ResponseStream, get_tree_node, tree_value, flatten_tree)
 
 
 def _decode_dict(d):
@@ -43,46 +49,116 @@ def _decode_dict(d):
     return decoded
 
 
-class DynamicDictLoader(DictLoader):
+class TemplateRegistry(object):
     """
-      Note: There's a bug in jinja2 pre-2.7.3 DictLoader where caching does not work.
-        Including the fixed (current) method version here to ensure performance benefit
-        even for those using older jinja versions.
+    Process-wide cache of compiled response templates, keyed by the template
+    source and the autoescape setting. Response objects are created for every
+    request, so compiling here instead of per instance means each template is
+    only ever compiled once per process.
     """
-    def get_source(self, environment, template):
-        if template in self.mapping:
-            source = self.mapping[template]
-            return source, None, lambda: source == self.mapping.get(template)
-        raise TemplateNotFound(template)
 
-    def update(self, mapping):
-        self.mapping.update(mapping)
+    def __init__(self):
+        self.lock = RLock()
+        self.environments = {}
+        self.templates = {}
+
+    def environment(self, autoescape=False):
+        try:
+            return self.environments[autoescape]
+        except KeyError:
+            with self.lock:
+                return self.environments.setdefault(
+                    autoescape, Environment(autoescape=autoescape))
+
+    def contains(self, source, autoescape=False):
+        return (source, autoescape) in self.templates
+
+    def get_template(self, source, autoescape=False):
+        key = (source, autoescape)
+        try:
+            return self.templates[key]
+        except KeyError:
+            pass
+        with self.lock:
+            # Another thread may have compiled it while we waited
+            template = self.templates.get(key)
+            if template is None:
+                template = self.environment(autoescape).from_string(source)
+                self.templates[key] = template
+            return template
+
+    def warm(self, sources, autoescape=False):
+        """
+        Compile the given template sources ahead of the first request
+        """
+        for source in sources:
+            self.get_template(source, autoescape)
 
-    def contains(self, template):
-        return bool(template in self.mapping)
+    def clear(self):
+        with self.lock:
+            self.templates.clear()
 
 
-class _TemplateEnvironmentMixin(object):
+template_registry = TemplateRegistry()
 
-    def __init__(self):
-        super(_TemplateEnvironmentMixin, self).__init__()
-        self.loader = DynamicDictLoader({})
-        self.environment = Environment(loader=self.loader, autoescape=self.should_autoescape)
+
+class _TemplateEnvironmentMixin(object):
 
     @property
     def should_autoescape(self):
         # Allow for subclass to overwrite
         return False
 
-    def contains_template(self, template_id):
-        return self.loader.contains(template_id)
+    @property
+    def environment(self):
+        return template_registry.environment(self.should_autoescape)
+
+    def contains_template(self, source):
+        return template_registry.contains(source, self.should_autoescape)
 
     def response_template(self, source):
-        template_id = id(source)
-        if not self.contains_template(template_id):
-            self.loader.update({template_id: source})
-            self.environment = Environment(loader=self.loader, autoescape=self.should_autoescape)
-        return self.environment.get_template(template_id)
+        return template_registry.get_template(source, self.should_autoescape)
+
+    def response_stream(self, source, **context):
+        """
+        Renders a template as it is sent, for responses that list many resources
+        """
+        return ResponseStream(self.response_template(source).generate(**context))
+
+
+class ActionDispatchTable(object):
+    """
+    Per response class lookup from AWS action names to handler method names.
+
+    The handler names are collected from the class once, and each action name
+    is converted to its underscore form the first time it is requested, so
+    dispatching a request is a single dict lookup.
+    """
+
+    def __init__(self, clazz):
+        # Response classes live in moto.<service>.responses
+        module_parts = clazz.__module__.split('.')
+        self.service_name = module_parts[1] if len(module_parts) > 1 else module_parts[0]
+        self.method_names = frozenset(method_names_from_class(clazz))
+        self.handlers = {}
+        self.counts = defaultdict(int)
+
+    def get_handler_name(self, action):
+        try:
+            return self.handlers[action]
+        except KeyError:
+            pass
+        method_name = camelcase_to_underscores(action)
+        if method_name not in self.method_names:
+            return None
+        self.handlers[action] = method_name
+        return method_name
+
+    def record_call(self, action):
+        self.counts[action] += 1
+
+    def reset_counts(self):
+        self.counts.clear()
 
 
 class BaseResponse(_TemplateEnvironmentMixin):
@@ -94,6 +170,27 @@ class BaseResponse(_TemplateEnvironmentMixin):
     def dispatch(cls, *args, **kwargs):
         return cls()._dispatch(*args, **kwargs)
 
+    @classmethod
+    def dispatch_table(cls):
+        # Look in the class __dict__ so subclasses never share their parent's table
+        table = cls.__dict__.get('_dispatch_table')
+        if table is None:
+            table = ActionDispatchTable(cls)
+            cls._dispatch_table = table
+        return table
+
+    @classmethod
+    def action_counts(cls):
+        """
+        Returns a dict of how many times each action has been called on this
+        response class
+        """
+        return dict(cls.dispatch_table().counts)
+
+    @classmethod
+    def reset_action_counts(cls):
+        cls.dispatch_table().reset_counts()
+
     def _dispatch(self, request, full_url, headers):
         querystring = {}
 
@@ -123,7 +220,7 @@ class BaseResponse(_TemplateEnvironmentMixin):
 
         self.uri = full_url
         self.path = urlparse(full_url).path
-        self.querystring = querystring
+        self.querystring = Querystring(querystring)
         self.method = request.method
         region = re.search(self.region_regex, full_url)
         if region:
@@ -144,22 +241,28 @@ class BaseResponse(_TemplateEnvironmentMixin):
             if match:
                 action = match.split(".")[-1]
 
-        action = camelcase_to_underscores(action)
-        method_names = method_names_from_class(self.__class__)
-        if action in method_names:
-            method = getattr(self, action)
-            try:
-                response = method()
-            except HTTPException as http_error:
-                response = http_error.description, dict(status=http_error.code)
-            if isinstance(response, six.string_types):
-                return 200, headers, response
-            else:
-                body, new_headers = response
-                status = new_headers.get('status', 200)
-                headers.update(new_headers)
-                return status, headers, body
-        raise NotImplementedError("The {0} action has not been implemented".format(action))
+        table = self.dispatch_table()
+        method_name = table.get_handler_name(action)
+        if method_name is not None:
+            table.record_call(action)
+            with action_metrics.timer((table.service_name, action)) as timer:
+                method = getattr(self, method_name)
+                try:
+                    response = action_profiler.call(table.service_name, action, method)
+                except HTTPException as http_error:
+                    response = http_error.description, dict(status=http_error.code)
+                if isinstance(response, ResponseStream):
+                    timer.until_rendered(response)
+                    return 200, headers, response
+                if isinstance(response, six.string_types):
+                    return 200, headers, response
+                else:
+                    body, new_headers = response
+                    status = new_headers.get('status', 200)
+                    headers.update(new_headers)
+                    timer.status = status
+                    return status, headers, body
+        raise NotImplementedError("The {0} action has not been implemented".format(camelcase_to_underscores(action)))
 
     def _get_param(self, param_name):
         return self.querystring.get(param_name, [None])[0]
@@ -182,19 +285,17 @@ class BaseResponse(_TemplateEnvironmentMixin):
         Given a querystring of ?LaunchConfigurationNames.member.1=my-test-1&LaunchConfigurationNames.member.2=my-test-2
         this will return ['my-test-1', 'my-test-2']
         """
-        if param_prefix.endswith("."):
-            prefix = param_prefix
-        else:
-            prefix = param_prefix + "."
+        node = get_tree_node(self.querystring, param_prefix)
         values = []
+        if not isinstance(node, dict):
+            return values
         index = 1
         while True:
-            try:
-                values.append(self.querystring[prefix + str(index)][0])
-            except KeyError:
+            value = tree_value(node.get(six.text_type(index)))
+            if value is None:
                 break
-            else:
-                index += 1
+            values.append(value)
+            index += 1
         return values
 
     def _get_dict_param(self, param_prefix):
@@ -211,11 +312,12 @@ class BaseResponse(_TemplateEnvironmentMixin):
             "InstanceCount": "1",
         }
         """
-        params = {}
-        for key, value in self.querystring.items():
-            if key.startswith(param_prefix):
-                params[camelcase_to_underscores(key.replace(param_prefix, ""))] = value[0]
-        return params
+        node = get_tree_node(self.querystring, param_prefix)
+        if not isinstance(node, dict):
+            return {}
+        return dict(
+            (camelcase_to_underscores(key), value[0])
+            for key, value in flatten_tree(node) if key)
 
     def _get_list_prefix(self, param_prefix):
         """
@@ -240,14 +342,15 @@ class BaseResponse(_TemplateEnvironmentMixin):
             'hadoop_jar_step._jar': u'streaming2.jar',
         }]
         """
+        node = get_tree_node(self.querystring, param_prefix)
         results = []
+        if not isinstance(node, dict):
+            return results
         param_index = 1
         while True:
-            index_prefix = "{0}.{1}.".format(param_prefix, param_index)
-            new_items = {}
-            for key, value in self.querystring.items():
-                if key.startswith(index_prefix):
-                    new_items[camelcase_to_underscores(key.replace(index_prefix, ""))] = value[0]
+            new_items = dict(
+                (camelcase_to_underscores(key), value[0])
+                for key, value in flatten_tree(node.get(six.text_type(param_index), {})) if key)
             if not new_items:
                 break
             results.append(new_items)
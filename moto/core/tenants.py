@@ -0,0 +1,123 @@
+from __future__ import unicode_literals
+import contextlib
+import re
+import threading
+import weakref
+
+import six
+from six.moves.urllib.parse import parse_qs
+
+
+# The access key in "AWS AKID:signature" and in the Credential of a
+# Signature Version 4 Authorization header
+AUTHORIZATION_ACCESS_KEY = re.compile(r'^AWS (?P<v2>[^:]+):|Credential=(?P<v4>[^/,\s]+)/')
+ACCESS_KEY_PARAMETERS = ['AWSAccessKeyId', 'X-Amz-Credential']
+
+
+class TenantBackends(object):
+    """
+    Gives every tenant its own backends in the server. While tenants are
+    enabled, a RegionBackends looked up in a thread which is handling a
+    tenant's request hands out that tenant's backends instead of the shared
+    ones. They are created, empty, the first time a tenant uses a region, so
+    the module level backends and the code using them are unchanged.
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.enabled = False
+        # By tenant, by the id of a RegionBackends: a weak reference to it,
+        # so a new one at the same address isn't confused with it, and the
+        # tenant's backends by region name
+        self.instances = {}
+
+    @property
+    def current_tenant(self):
+        return getattr(self.local, 'tenant', None)
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        self.reset_all()
+
+    @contextlib.contextmanager
+    def activate(self, tenant):
+        """
+        Use the backends of `tenant` in this thread
+        """
+        self.use(tenant)
+        try:
+            yield
+        finally:
+            self.use(None)
+
+    def use(self, tenant):
+        """
+        Use the backends of `tenant` in this thread from now on, or the shared
+        backends if tenant is None
+        """
+        self.local.tenant = tenant
+
+    def backends_for(self, region_backends):
+        """
+        The dict of backends by region name that `region_backends` hands out
+        in this thread, or None when it should hand out the shared ones
+        """
+        tenant = self.current_tenant
+        if tenant is None or not self.enabled:
+            return None
+
+        instances = self.instances.get(tenant, {})
+        reference, backends = instances.get(id(region_backends), (None, None))
+        if reference is not None and reference() is region_backends:
+            return backends
+
+        with self.lock:
+            instances = self.instances.setdefault(tenant, {})
+            reference, backends = instances.get(id(region_backends), (None, None))
+            if reference is None or reference() is not region_backends:
+                backends = {}
+                instances[id(region_backends)] = (weakref.ref(region_backends), backends)
+        return backends
+
+    def reset(self, tenant):
+        """
+        Drop all the state of `tenant`
+        """
+        with self.lock:
+            self.instances.pop(tenant, None)
+
+    def reset_all(self):
+        with self.lock:
+            self.instances = {}
+
+
+tenant_backends = TenantBackends()
+
+
+def get_tenant(environ, header=None):
+    """
+    The tenant of a WSGI request: the value of `header` if one is given,
+    otherwise the AWS access key the request was signed with
+    """
+    if header:
+        return environ.get('HTTP_' + header.upper().replace('-', '_'))
+
+    match = AUTHORIZATION_ACCESS_KEY.search(environ.get('HTTP_AUTHORIZATION', ''))
+    if match:
+        return match.group('v2') or match.group('v4')
+
+    parameters = parse_qs(environ.get('QUERY_STRING', ''))
+    if environ.get('CONTENT_TYPE', '').startswith('application/x-www-form-urlencoded'):
+        # Query API calls sent as POST have the access key in the body, which
+        # has to be put back for the application to read
+        body = environ['wsgi.input'].read(int(environ.get('CONTENT_LENGTH') or 0))
+        environ['wsgi.input'] = six.BytesIO(body)
+        parameters.update(parse_qs(body.decode('utf-8')))
+    for name in ACCESS_KEY_PARAMETERS:
+        if name in parameters:
+            return parameters[name][0].split('/')[0]
+    return None
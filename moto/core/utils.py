@@ -1,12 +1,18 @@
 from __future__ import unicode_literals
 
+import contextlib
 import datetime
 import inspect
+import os
 import random
 import re
+import shutil
 import six
+import threading
 
-from flask import request
+from flask import Response, request
+
+from .metrics import handler_metrics
 
 
 def camelcase_to_underscores(argument):
@@ -53,6 +59,143 @@ def method_names_from_class(clazz):
     return [x[0] for x in inspect.getmembers(clazz, predicate=predicate)]
 
 
+class Querystring(dict):
+    """
+    A flat querystring dict of lists, as returned by parse_qs, that lazily
+    builds and caches the nested parameter tree of its dotted keys. The tree
+    is dropped whenever the querystring is modified.
+    """
+    _tree = None
+
+    @property
+    def tree(self):
+        if self._tree is None:
+            self._tree = querystring_tree(self)
+        return self._tree
+
+    def __setitem__(self, key, value):
+        self._tree = None
+        super(Querystring, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._tree = None
+        super(Querystring, self).__delitem__(key)
+
+    def update(self, *args, **kwargs):
+        self._tree = None
+        super(Querystring, self).update(*args, **kwargs)
+
+    def setdefault(self, key, default=None):
+        self._tree = None
+        return super(Querystring, self).setdefault(key, default)
+
+    def pop(self, *args):
+        self._tree = None
+        return super(Querystring, self).pop(*args)
+
+    def popitem(self):
+        self._tree = None
+        return super(Querystring, self).popitem()
+
+    def clear(self):
+        self._tree = None
+        super(Querystring, self).clear()
+
+
+def querystring_tree(querystring):
+    """
+    Given a querystring of
+    {
+        'Filter.1.Name': ['instance-state-name'],
+        'Filter.1.Value.1': ['running'],
+        'Filter.1.Value.2': ['pending'],
+    }
+
+    returns
+    {
+        'Filter': {'1': {'Name': ['instance-state-name'],
+                         'Value': {'1': ['running'], '2': ['pending']}}},
+    }
+
+    in a single pass over the parameters. If a name is both a value and a
+    prefix of other names, the value is kept in its node under the None key.
+    """
+    tree = {}
+    for key, value in querystring.items():
+        parts = key.split('.')
+        node = tree
+        for part in parts[:-1]:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                child = {} if child is None else {None: child}
+                node[part] = child
+            node = child
+        last = parts[-1]
+        if isinstance(node.get(last), dict):
+            node[last][None] = value
+        else:
+            node[last] = value
+    return tree
+
+
+def get_tree_node(querystring, path):
+    """
+    Returns the subtree (or value list) of the querystring found under the
+    dotted path, or None if nothing was passed under it
+    """
+    if isinstance(querystring, Querystring):
+        node = querystring.tree
+    else:
+        node = querystring_tree(querystring)
+    for part in path.strip('.').split('.'):
+        if not isinstance(node, dict):
+            return None
+        node = node.get(part)
+        if node is None:
+            return None
+    return node
+
+
+def tree_value(node):
+    """
+    Returns the first value stored directly at a tree node
+    """
+    if isinstance(node, dict):
+        node = node.get(None)
+    if node:
+        return node[0]
+
+
+def tree_members(node):
+    """
+    Returns the children of a node of numbered members (Filter.1, Filter.2,
+    ...) ordered by their index
+    """
+    if not isinstance(node, dict):
+        return []
+    indexes = sorted((int(key), key) for key in node if key is not None and key.isdigit())
+    return [node[key] for _, key in indexes]
+
+
+def flatten_tree(node, prefix=''):
+    """
+    Yields (dotted_name, values) for every value below a tree node, with the
+    names relative to that node
+    """
+    if not isinstance(node, dict):
+        yield prefix, node
+        return
+    for key, child in node.items():
+        if key is None:
+            yield prefix, child
+        elif prefix:
+            for item in flatten_tree(child, "{0}.{1}".format(prefix, key)):
+                yield item
+        else:
+            for item in flatten_tree(child, key):
+                yield item
+
+
 def get_random_hex(length=8):
     chars = list(range(10)) + ['a', 'b', 'c', 'd', 'e', 'f']
     return ''.join(six.text_type(random.choice(chars)) for x in range(length))
@@ -77,24 +220,157 @@ def convert_regex_to_flask_path(url_path):
     return url_path
 
 
+class ResponseStream(object):
+    """
+    A response body rendered from a template a chunk at a time, so that
+    listing many resources never builds the whole body in memory. The server
+    sends the chunks as they are rendered, and the mocks join them once.
+
+    As rendering happens after the handler has returned, whatever has to be
+    in effect while it runs, such as a metrics timer, is added with within().
+    """
+    # Template output comes in many small pieces, which are sent in chunks of about this size
+    chunk_size = 64 * 1024
+    # Whether producing the chunks is part of handling the request, as
+    # rendering a template is, rather than only sending a stored body
+    renders = True
+    # The context managers to render in, outermost first
+    contexts = ()
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def within(self, context):
+        """
+        Render inside `context`, which is entered when rendering starts and
+        exited after the last chunk
+        """
+        self.contexts = tuple(self.contexts) + (context,)
+        return self
+
+    def __iter__(self):
+        return self._iter_within(self.contexts)
+
+    def _iter_within(self, contexts):
+        if not contexts:
+            for chunk in self.iter_chunks():
+                yield chunk
+            return
+        with contexts[0]:
+            for chunk in self._iter_within(contexts[1:]):
+                yield chunk
+
+    def join(self):
+        return self._join_within(self.contexts)
+
+    def _join_within(self, contexts):
+        if not contexts:
+            return self.join_chunks()
+        with contexts[0]:
+            return self._join_within(contexts[1:])
+
+    def iter_chunks(self):
+        buffered = []
+        size = 0
+        for chunk in self.chunks:
+            buffered.append(chunk)
+            size += len(chunk)
+            if size >= self.chunk_size:
+                yield ''.join(buffered).encode('utf-8')
+                buffered = []
+                size = 0
+        if buffered:
+            yield ''.join(buffered).encode('utf-8')
+
+    def join_chunks(self):
+        return ''.join(self.chunks).encode('utf-8')
+
+
+def join_response(body):
+    """
+    Returns the body of a response as one string, or as bytes if it was
+    streamed
+    """
+    if isinstance(body, ResponseStream):
+        return body.join()
+    return body
+
+
+def head_content_length(method, headers):
+    """
+    Returns the Content-Length a handler gave the response to a HEAD
+    request, which is the length of the body a GET would send rather than of
+    the empty body sent, or None
+    """
+    if method != 'HEAD':
+        return None
+    for name, value in headers.items():
+        if name.lower() == 'content-length':
+            return value
+    return None
+
+
+class HeadResponseHeaders(dict):
+    """
+    The headers of a response to a HEAD request, for HTTPretty. After calling
+    a callable body, HTTPretty 0.8.10 (as pinned in setup.py) sets the
+    Content-Length with `headers.update({'content-length': len(body)})`, and
+    offers no way to send another length. As the body of a HEAD response is
+    always empty, this keeps the Content-Length the handler gave instead.
+    tests/test_core/test_url_registration.py checks this against HTTPretty.
+    """
+
+    def update(self, *args, **kwargs):
+        length = self['content-length']
+        super(HeadResponseHeaders, self).update(*args, **kwargs)
+        self['content-length'] = length
+
+
+def head_response_headers(method, headers):
+    """
+    The headers of a response to hand to HTTPretty, keeping the
+    Content-Length of a response to a HEAD request
+    """
+    length = head_content_length(method, headers)
+    if length is None:
+        return headers
+    headers = HeadResponseHeaders(
+        (name, value) for name, value in headers.items()
+        if name.lower() != 'content-length')
+    headers['content-length'] = length
+    return headers
+
+
 class convert_flask_to_httpretty_response(object):
     def __init__(self, callback):
         self.callback = callback
-
-    @property
-    def __name__(self):
         # For instance methods, use class and method names. Otherwise
         # use module and method name
-        if inspect.ismethod(self.callback):
-            outer = self.callback.__self__.__class__.__name__
+        if inspect.ismethod(callback):
+            outer = callback.__self__.__class__.__name__
         else:
-            outer = self.callback.__module__
-        return "{0}.{1}".format(outer, self.callback.__name__)
+            outer = callback.__module__
+        self.name = "{0}.{1}".format(outer, callback.__name__)
+
+    @property
+    def __name__(self):
+        return self.name
 
     def __call__(self, args=None, **kwargs):
-        result = self.callback(request, request.url, {})
-        # result is a status, headers, response tuple
-        status, headers, response = result
+        with handler_metrics.timer((self.name,)) as timer, state_lock.reading():
+            result = self.callback(request, request.url, {})
+            # result is a status, headers, response tuple
+            status, headers, response = result
+            timer.status = status
+            if isinstance(response, ResponseStream):
+                timer.until_rendered(response)
+        length = head_content_length(request.method, headers)
+        if isinstance(response, ResponseStream) or length is not None:
+            response = Response(response, status=status, headers=headers)
+            if length is not None:
+                # Werkzeug sets it to the length of the empty body
+                response.headers['Content-Length'] = length
+            return response
         return response, status, headers
 
 
@@ -116,3 +392,226 @@ def unix_time(dt=None):
 
 def unix_time_millis(dt=None):
     return unix_time(dt) * 1000.0
+
+
+class Immutable(object):
+    """
+    Base class of values which never change once made, such as the bodies of
+    S3 objects. They are shared rather than copied, and snapshots keep them
+    by reference.
+    """
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class ContentFile(object):
+    """
+    A file named after a hash of its contents, which pickles by path. The
+    StateStore links it into its own directory, so the saved state doesn't
+    depend on the original file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    @property
+    def name(self):
+        return os.path.basename(self.path)
+
+
+def link_or_copy(source, destination):
+    """
+    Hard links destination to the source file, or copies it where that isn't
+    possible, such as across file systems. The destination appears whole.
+    """
+    temp_path = destination + '.tmp'
+    try:
+        os.link(source, temp_path)
+    except (AttributeError, OSError):
+        shutil.copyfile(source, temp_path)
+    os.rename(temp_path, destination)
+
+
+class TrackedDict(dict):
+    """
+    A dict of resources, such as the queues of a backend, which can record
+    which of its keys change. Once track() is called, it records the keys
+    that are set or removed, and the keys of the resources whose lock is
+    taken, so the models must only change a resource while holding its
+    ResourceLock. Resources without a `lock` count as always changed.
+    Snapshots use this to restore only what changed since.
+    """
+    # The keys changed since track(), or None when not tracked
+    changed = None
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+    def track(self):
+        """
+        Start recording changes afresh
+        """
+        self.changed = set()
+        for key, value in self.items():
+            self._track_value(key, value)
+
+    def _track_value(self, key, value):
+        lock = getattr(value, 'lock', None)
+        if isinstance(lock, ResourceLock):
+            lock.tracker = (self.changed, key)
+        else:
+            self.changed.add(key)
+
+    def revert(self, original_keys, load):
+        """
+        Undo the changes recorded since track(): the changed keys in
+        `original_keys` get load(key) as their value again, and the others
+        are removed.
+        """
+        changed = list(self.changed)
+        self.changed.clear()
+        for key in changed:
+            if key in original_keys:
+                value = load(key)
+                dict.__setitem__(self, key, value)
+                self._track_value(key, value)
+            else:
+                dict.pop(self, key, None)
+
+    def _record(self, key):
+        if self.changed is not None:
+            self.changed.add(key)
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._record(key)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._record(key)
+
+    def pop(self, key, *default):
+        self._record(key)
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        self._record(key)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        value = dict.setdefault(self, key, default)
+        if value is default:
+            self._record(key)
+        return value
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        if self.changed is not None:
+            self.changed.update(self)
+        dict.clear(self)
+
+
+class StateLock(object):
+    """
+    Lets any number of requests use the backends at once, or one thread,
+    such as the StateStore saving, read all of them while no request runs.
+    Waiting writers go first, so a steady stream of requests can't hold off
+    a save. A thread handling a request can take the lock again, as when a
+    handler makes a mocked request of its own.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+        self._local = threading.local()
+
+    @contextlib.contextmanager
+    def reading(self):
+        depth = getattr(self._local, 'depth', 0)
+        if not depth:
+            with self._condition:
+                while self._writing or self._writers_waiting:
+                    self._condition.wait()
+                self._readers += 1
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            if not depth:
+                with self._condition:
+                    self._readers -= 1
+                    if not self._readers:
+                        self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def writing(self):
+        with self._condition:
+            self._writers_waiting += 1
+            try:
+                while self._writing or self._readers:
+                    self._condition.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    def yield_to_writers(self):
+        """
+        Let waiting writers go first, from a request which keeps waiting for
+        something, such as a long poll, and holds no resource lock
+        """
+        if not getattr(self._local, 'depth', 0) or not self._writers_waiting:
+            return
+        with self._condition:
+            self._readers -= 1
+            self._condition.notify_all()
+            while self._writing or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+
+
+# Held for reading by every request to the backends
+state_lock = StateLock()
+
+
+class ResourceLock(object):
+    """
+    A reentrant lock guarding the state of one resource, such as a queue or
+    a bucket, against concurrent requests in the threaded server. It pickles
+    and copies as a new, unlocked lock, so the models holding one can still
+    be snapshotted.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        # The changed keys and the key of the TrackedDict entry this lock
+        # guards, while that dict is tracked
+        self.tracker = None
+
+    def __enter__(self):
+        self._lock.acquire()
+        tracker = self.tracker
+        if tracker is not None:
+            tracker[0].add(tracker[1])
+        return self
+
+    def __exit__(self, *args):
+        self._lock.release()
+
+    def __reduce__(self):
+        return (self.__class__, ())
@@ -2,7 +2,7 @@ from __future__ import unicode_literals
 
 import datetime
 import boto.datapipeline
-from moto.core import BaseBackend
+from moto.core import BaseBackend, RegionBackends
 from .utils import get_random_pipeline_id, remove_capitalization_of_dict_keys
 
 
@@ -144,6 +144,6 @@ class DataPipelineBackend(BaseBackend):
         pipeline.activate()
 
 
-datapipeline_backends = {}
-for region in boto.datapipeline.regions():
-    datapipeline_backends[region.name] = DataPipelineBackend()
+datapipeline_backends = RegionBackends(
+    [region.name for region in boto.datapipeline.regions()],
+    lambda region_name: DataPipelineBackend())
@@ -1,3 +1,10 @@
 from __future__ import unicode_literals
-from .models import dynamodb_backend
-mock_dynamodb = dynamodb_backend.decorator
+from .models import dynamodb_backend, dynamodb_backends  # flake8: noqa
+from ..core.models import MockAWS
+
+
+def mock_dynamodb(func=None):
+    if func:
+        return MockAWS(dynamodb_backends)(func)
+    else:
+        return MockAWS(dynamodb_backends)
@@ -4,8 +4,8 @@ import datetime
 import json
 
 from moto.compat import OrderedDict
-from moto.core import BaseBackend
-from moto.core.utils import unix_time
+from moto.core import BaseBackend, GlobalBackends
+from moto.core.utils import unix_time, ResourceLock
 from .comparisons import get_comparison_func
 
 
@@ -102,6 +102,7 @@ class Table(object):
         self.write_capacity = write_capacity
         self.created_at = datetime.datetime.now()
         self.items = defaultdict(dict)
+        self.lock = ResourceLock()
 
     @property
     def has_range_key(self):
@@ -136,13 +137,14 @@ class Table(object):
         return results
 
     def __len__(self):
-        count = 0
-        for key, value in self.items.items():
-            if self.has_range_key:
-                count += len(value)
-            else:
-                count += 1
-        return count
+        with self.lock:
+            count = 0
+            for key, value in self.items.items():
+                if self.has_range_key:
+                    count += len(value)
+                else:
+                    count += 1
+            return count
 
     def __nonzero__(self):
         return True
@@ -159,31 +161,34 @@ class Table(object):
 
         item = Item(hash_value, self.hash_key_type, range_value, self.range_key_type, item_attrs)
 
-        if range_value:
-            self.items[hash_value][range_value] = item
-        else:
-            self.items[hash_value] = item
-        return item
+        with self.lock:
+            if range_value:
+                self.items[hash_value][range_value] = item
+            else:
+                self.items[hash_value] = item
+            return item
 
     def get_item(self, hash_key, range_key):
         if self.has_range_key and not range_key:
             raise ValueError("Table has a range key, but no range key was passed into get_item")
-        try:
-            if range_key:
-                return self.items[hash_key][range_key]
-            else:
-                return self.items[hash_key]
-        except KeyError:
-            return None
+        with self.lock:
+            try:
+                if range_key:
+                    return self.items[hash_key][range_key]
+                else:
+                    return self.items[hash_key]
+            except KeyError:
+                return None
 
     def query(self, hash_key, range_comparison, range_objs):
         results = []
         last_page = True  # Once pagination is implemented, change this
 
-        if self.range_key_attr:
-            possible_results = self.items[hash_key].values()
-        else:
-            possible_results = list(self.all_items())
+        with self.lock:
+            if self.range_key_attr:
+                possible_results = list(self.items[hash_key].values())
+            else:
+                possible_results = list(self.all_items())
 
         if range_comparison:
             for result in possible_results:
@@ -207,7 +212,10 @@ class Table(object):
         scanned_count = 0
         last_page = True  # Once pagination is implemented, change this
 
-        for result in self.all_items():
+        with self.lock:
+            all_items = list(self.all_items())
+
+        for result in all_items:
             scanned_count += 1
             passes_all_conditions = True
             for attribute_name, (comparison_operator, comparison_objs) in filters.items():
@@ -232,13 +240,14 @@ class Table(object):
         return results, scanned_count, last_page
 
     def delete_item(self, hash_key, range_key):
-        try:
-            if range_key:
-                return self.items[hash_key].pop(range_key)
-            else:
-                return self.items.pop(hash_key)
-        except KeyError:
-            return None
+        with self.lock:
+            try:
+                if range_key:
+                    return self.items[hash_key].pop(range_key)
+                else:
+                    return self.items.pop(hash_key)
+            except KeyError:
+                return None
 
 
 class DynamoDBBackend(BaseBackend):
@@ -310,4 +319,5 @@ class DynamoDBBackend(BaseBackend):
         return table.delete_item(hash_key, range_key)
 
 
-dynamodb_backend = DynamoDBBackend()
+dynamodb_backends = GlobalBackends(DynamoDBBackend)
+dynamodb_backend = dynamodb_backends['global']
@@ -4,7 +4,7 @@ import six
 
 from moto.core.responses import BaseResponse
 from moto.core.utils import camelcase_to_underscores
-from .models import dynamodb_backend, dynamo_json_dump
+from .models import dynamodb_backends, dynamo_json_dump
 
 
 GET_SESSION_TOKEN_RESULT = """
@@ -36,6 +36,10 @@ def sts_handler():
 
 class DynamoHandler(BaseResponse):
 
+    @property
+    def dynamodb_backend(self):
+        return dynamodb_backends['global']
+
     def get_endpoint_name(self, headers):
         """Parses request headers and extracts part od the X-Amz-Target
         that corresponds to a method of DynamoHandler
@@ -75,10 +79,10 @@ class DynamoHandler(BaseResponse):
         limit = body.get('Limit')
         if body.get("ExclusiveStartTableName"):
             last = body.get("ExclusiveStartTableName")
-            start = list(dynamodb_backend.tables.keys()).index(last) + 1
+            start = list(self.dynamodb_backend.tables.keys()).index(last) + 1
         else:
             start = 0
-        all_tables = list(dynamodb_backend.tables.keys())
+        all_tables = list(self.dynamodb_backend.tables.keys())
         if limit:
             tables = all_tables[start:start + limit]
         else:
@@ -105,7 +109,7 @@ class DynamoHandler(BaseResponse):
         read_units = throughput["ReadCapacityUnits"]
         write_units = throughput["WriteCapacityUnits"]
 
-        table = dynamodb_backend.create_table(
+        table = self.dynamodb_backend.create_table(
             name,
             hash_key_attr=hash_key_attr,
             hash_key_type=hash_key_type,
@@ -118,7 +122,7 @@ class DynamoHandler(BaseResponse):
 
     def delete_table(self):
         name = self.body['TableName']
-        table = dynamodb_backend.delete_table(name)
+        table = self.dynamodb_backend.delete_table(name)
         if table:
             return dynamo_json_dump(table.describe)
         else:
@@ -130,13 +134,13 @@ class DynamoHandler(BaseResponse):
         throughput = self.body["ProvisionedThroughput"]
         new_read_units = throughput["ReadCapacityUnits"]
         new_write_units = throughput["WriteCapacityUnits"]
-        table = dynamodb_backend.update_table_throughput(name, new_read_units, new_write_units)
+        table = self.dynamodb_backend.update_table_throughput(name, new_read_units, new_write_units)
         return dynamo_json_dump(table.describe)
 
     def describe_table(self):
         name = self.body['TableName']
         try:
-            table = dynamodb_backend.tables[name]
+            table = self.dynamodb_backend.tables[name]
         except KeyError:
             er = 'com.amazonaws.dynamodb.v20111205#ResourceNotFoundException'
             return self.error(er)
@@ -145,7 +149,7 @@ class DynamoHandler(BaseResponse):
     def put_item(self):
         name = self.body['TableName']
         item = self.body['Item']
-        result = dynamodb_backend.put_item(name, item)
+        result = self.dynamodb_backend.put_item(name, item)
         if result:
             item_dict = result.to_json()
             item_dict['ConsumedCapacityUnits'] = 1
@@ -164,12 +168,12 @@ class DynamoHandler(BaseResponse):
 
                 if request_type == 'PutRequest':
                     item = request['Item']
-                    dynamodb_backend.put_item(table_name, item)
+                    self.dynamodb_backend.put_item(table_name, item)
                 elif request_type == 'DeleteRequest':
                     key = request['Key']
                     hash_key = key['HashKeyElement']
                     range_key = key.get('RangeKeyElement')
-                    item = dynamodb_backend.delete_item(table_name, hash_key, range_key)
+                    item = self.dynamodb_backend.delete_item(table_name, hash_key, range_key)
 
         response = {
             "Responses": {
@@ -192,7 +196,7 @@ class DynamoHandler(BaseResponse):
         range_key = key.get('RangeKeyElement')
         attrs_to_get = self.body.get('AttributesToGet')
         try:
-            item = dynamodb_backend.get_item(name, hash_key, range_key)
+            item = self.dynamodb_backend.get_item(name, hash_key, range_key)
         except ValueError:
             er = 'com.amazon.coral.validate#ValidationException'
             return self.error(er, status=400)
@@ -221,7 +225,7 @@ class DynamoHandler(BaseResponse):
             for key in keys:
                 hash_key = key["HashKeyElement"]
                 range_key = key.get("RangeKeyElement")
-                item = dynamodb_backend.get_item(table_name, hash_key, range_key)
+                item = self.dynamodb_backend.get_item(table_name, hash_key, range_key)
                 if item:
                     item_describe = item.describe_attrs(attributes_to_get)
                     items.append(item_describe)
@@ -239,7 +243,7 @@ class DynamoHandler(BaseResponse):
             range_comparison = None
             range_values = []
 
-        items, last_page = dynamodb_backend.query(name, hash_key, range_comparison, range_values)
+        items, last_page = self.dynamodb_backend.query(name, hash_key, range_comparison, range_values)
 
         if items is None:
             er = 'com.amazonaws.dynamodb.v20111205#ResourceNotFoundException'
@@ -270,7 +274,7 @@ class DynamoHandler(BaseResponse):
             comparison_values = scan_filter.get("AttributeValueList", [])
             filters[attribute_name] = (comparison_operator, comparison_values)
 
-        items, scanned_count, last_page = dynamodb_backend.scan(name, filters)
+        items, scanned_count, last_page = self.dynamodb_backend.scan(name, filters)
 
         if items is None:
             er = 'com.amazonaws.dynamodb.v20111205#ResourceNotFoundException'
@@ -297,7 +301,7 @@ class DynamoHandler(BaseResponse):
         hash_key = key['HashKeyElement']
         range_key = key.get('RangeKeyElement')
         return_values = self.body.get('ReturnValues', '')
-        item = dynamodb_backend.delete_item(name, hash_key, range_key)
+        item = self.dynamodb_backend.delete_item(name, hash_key, range_key)
         if item:
             if return_values == 'ALL_OLD':
                 item_dict = item.to_json()
@@ -1,3 +1,10 @@
 from __future__ import unicode_literals
-from .models import dynamodb_backend2
-mock_dynamodb2 = dynamodb_backend2.decorator
+from .models import dynamodb_backend2, dynamodb_backends2  # flake8: noqa
+from ..core.models import MockAWS
+
+
+def mock_dynamodb2(func=None):
+    if func:
+        return MockAWS(dynamodb_backends2)(func)
+    else:
+        return MockAWS(dynamodb_backends2)
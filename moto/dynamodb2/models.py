@@ -4,8 +4,8 @@ import datetime
 import json
 
 from moto.compat import OrderedDict
-from moto.core import BaseBackend
-from moto.core.utils import unix_time
+from moto.core import BaseBackend, GlobalBackends
+from moto.core.utils import unix_time, ResourceLock
 from .comparisons import get_comparison_func
 
 
@@ -170,6 +170,7 @@ class Table(object):
         self.global_indexes = global_indexes if global_indexes else []
         self.created_at = datetime.datetime.now()
         self.items = defaultdict(dict)
+        self.lock = ResourceLock()
 
     @property
     def describe(self):
@@ -189,13 +190,14 @@ class Table(object):
         return results
 
     def __len__(self):
-        count = 0
-        for key, value in self.items.items():
-            if self.has_range_key:
-                count += len(value)
-            else:
-                count += 1
-        return count
+        with self.lock:
+            count = 0
+            for key, value in self.items.items():
+                if self.has_range_key:
+                    count += len(value)
+                else:
+                    count += 1
+            return count
 
     @property
     def hash_key_names(self):
@@ -224,40 +226,41 @@ class Table(object):
 
         item = Item(hash_value, self.hash_key_type, range_value, self.range_key_type, item_attrs)
 
-        if not overwrite:
-            if expected is None:
-                expected = {}
-                lookup_range_value = range_value
-            else:
-                expected_range_value = expected.get(self.range_key_attr, {}).get("Value")
-                if(expected_range_value is None):
+        with self.lock:
+            if not overwrite:
+                if expected is None:
+                    expected = {}
                     lookup_range_value = range_value
                 else:
-                    lookup_range_value = DynamoType(expected_range_value)
-
-            current = self.get_item(hash_value, lookup_range_value)
-
-            if current is None:
-                current_attr = {}
-            elif hasattr(current, 'attrs'):
-                current_attr = current.attrs
-            else:
-                current_attr = current
+                    expected_range_value = expected.get(self.range_key_attr, {}).get("Value")
+                    if(expected_range_value is None):
+                        lookup_range_value = range_value
+                    else:
+                        lookup_range_value = DynamoType(expected_range_value)
+
+                current = self.get_item(hash_value, lookup_range_value)
+
+                if current is None:
+                    current_attr = {}
+                elif hasattr(current, 'attrs'):
+                    current_attr = current.attrs
+                else:
+                    current_attr = current
 
-            for key, val in expected.items():
-                if 'Exists' in val and val['Exists'] is False:
-                    if key in current_attr:
+                for key, val in expected.items():
+                    if 'Exists' in val and val['Exists'] is False:
+                        if key in current_attr:
+                            raise ValueError("The conditional request failed")
+                    elif key not in current_attr:
+                        raise ValueError("The conditional request failed")
+                    elif DynamoType(val['Value']).value != current_attr[key].value:
                         raise ValueError("The conditional request failed")
-                elif key not in current_attr:
-                    raise ValueError("The conditional request failed")
-                elif DynamoType(val['Value']).value != current_attr[key].value:
-                    raise ValueError("The conditional request failed")
 
-        if range_value:
-            self.items[hash_value][range_value] = item
-        else:
-            self.items[hash_value] = item
-        return item
+            if range_value:
+                self.items[hash_value][range_value] = item
+            else:
+                self.items[hash_value] = item
+            return item
 
     def __nonzero__(self):
         return True
@@ -272,22 +275,24 @@ class Table(object):
     def get_item(self, hash_key, range_key=None):
         if self.has_range_key and not range_key:
             raise ValueError("Table has a range key, but no range key was passed into get_item")
-        try:
-            if range_key:
-                return self.items[hash_key][range_key]
-            else:
-                return self.items[hash_key]
-        except KeyError:
-            return None
+        with self.lock:
+            try:
+                if range_key:
+                    return self.items[hash_key][range_key]
+                else:
+                    return self.items[hash_key]
+            except KeyError:
+                return None
 
     def delete_item(self, hash_key, range_key):
-        try:
-            if range_key:
-                return self.items[hash_key].pop(range_key)
-            else:
-                return self.items.pop(hash_key)
-        except KeyError:
-            return None
+        with self.lock:
+            try:
+                if range_key:
+                    return self.items[hash_key].pop(range_key)
+                else:
+                    return self.items.pop(hash_key)
+            except KeyError:
+                return None
 
     def query(self, hash_key, range_comparison, range_objs, index_name=None):
         results = []
@@ -307,15 +312,20 @@ class Table(object):
             except IndexError:
                 raise ValueError('Missing Hash Key. KeySchema: %s' % index['KeySchema'])
 
+            with self.lock:
+                all_items = list(self.all_items())
+
             possible_results = []
-            for item in self.all_items():
+            for item in all_items:
                 if not isinstance(item, Item):
                     continue
                 item_hash_key = item.attrs.get(index_hash_key['AttributeName'])
                 if item_hash_key and item_hash_key == hash_key:
                     possible_results.append(item)
         else:
-            possible_results = [item for item in list(self.all_items()) if isinstance(item, Item) and item.hash_key == hash_key]
+            with self.lock:
+                all_items = list(self.all_items())
+            possible_results = [item for item in all_items if isinstance(item, Item) and item.hash_key == hash_key]
 
         if index_name:
             try:
@@ -361,7 +371,10 @@ class Table(object):
         scanned_count = 0
         last_page = True  # Once pagination is implemented, change this
 
-        for result in self.all_items():
+        with self.lock:
+            all_items = list(self.all_items())
+
+        for result in all_items:
             scanned_count += 1
             passes_all_conditions = True
             for attribute_name, (comparison_operator, comparison_objs) in filters.items():
@@ -524,11 +537,12 @@ class DynamoDBBackend(BaseBackend):
             hash_value = DynamoType(key)
             range_value = None
 
-        item = table.get_item(hash_value, range_value)
-        if update_expression:
-            item.update(update_expression)
-        else:
-            item.update_with_attribute_updates(attribute_updates)
+        with table.lock:
+            item = table.get_item(hash_value, range_value)
+            if update_expression:
+                item.update(update_expression)
+            else:
+                item.update_with_attribute_updates(attribute_updates)
         return item
 
     def delete_item(self, table_name, keys):
@@ -539,4 +553,5 @@ class DynamoDBBackend(BaseBackend):
         return table.delete_item(hash_key, range_key)
 
 
-dynamodb_backend2 = DynamoDBBackend()
+dynamodb_backends2 = GlobalBackends(DynamoDBBackend)
+dynamodb_backend2 = dynamodb_backends2['global']
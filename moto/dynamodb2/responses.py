@@ -4,7 +4,7 @@ import six
 
 from moto.core.responses import BaseResponse
 from moto.core.utils import camelcase_to_underscores
-from .models import dynamodb_backend2, dynamo_json_dump
+from .models import dynamodb_backends2, dynamo_json_dump
 
 
 GET_SESSION_TOKEN_RESULT = """
@@ -36,6 +36,10 @@ def sts_handler():
 
 class DynamoHandler(BaseResponse):
 
+    @property
+    def dynamodb_backend2(self):
+        return dynamodb_backends2['global']
+
     def get_endpoint_name(self, headers):
         """Parses request headers and extracts part od the X-Amz-Target
         that corresponds to a method of DynamoHandler
@@ -75,10 +79,10 @@ class DynamoHandler(BaseResponse):
         limit = body.get('Limit')
         if body.get("ExclusiveStartTableName"):
             last = body.get("ExclusiveStartTableName")
-            start = list(dynamodb_backend2.tables.keys()).index(last) + 1
+            start = list(self.dynamodb_backend2.tables.keys()).index(last) + 1
         else:
             start = 0
-        all_tables = list(dynamodb_backend2.tables.keys())
+        all_tables = list(self.dynamodb_backend2.tables.keys())
         if limit:
             tables = all_tables[start:start + limit]
         else:
@@ -101,7 +105,7 @@ class DynamoHandler(BaseResponse):
         # getting the indexes
         global_indexes = body.get("GlobalSecondaryIndexes", [])
 
-        table = dynamodb_backend2.create_table(table_name,
+        table = self.dynamodb_backend2.create_table(table_name,
                    schema=key_schema,
                    throughput=throughput,
                    attr=attr,
@@ -114,7 +118,7 @@ class DynamoHandler(BaseResponse):
 
     def delete_table(self):
         name = self.body['TableName']
-        table = dynamodb_backend2.delete_table(name)
+        table = self.dynamodb_backend2.delete_table(name)
         if table is not None:
             return dynamo_json_dump(table.describe)
         else:
@@ -124,16 +128,16 @@ class DynamoHandler(BaseResponse):
     def update_table(self):
         name = self.body['TableName']
         if 'GlobalSecondaryIndexUpdates' in self.body:
-            table = dynamodb_backend2.update_table_global_indexes(name, self.body['GlobalSecondaryIndexUpdates'])
+            table = self.dynamodb_backend2.update_table_global_indexes(name, self.body['GlobalSecondaryIndexUpdates'])
         if 'ProvisionedThroughput' in self.body:
             throughput = self.body["ProvisionedThroughput"]
-            table = dynamodb_backend2.update_table_throughput(name, throughput)
+            table = self.dynamodb_backend2.update_table_throughput(name, throughput)
         return dynamo_json_dump(table.describe)
 
     def describe_table(self):
         name = self.body['TableName']
         try:
-            table = dynamodb_backend2.tables[name]
+            table = self.dynamodb_backend2.tables[name]
         except KeyError:
             er = 'com.amazonaws.dynamodb.v20111205#ResourceNotFoundException'
             return self.error(er)
@@ -149,7 +153,7 @@ class DynamoHandler(BaseResponse):
             expected = None
 
         try:
-            result = dynamodb_backend2.put_item(name, item, expected, overwrite)
+            result = self.dynamodb_backend2.put_item(name, item, expected, overwrite)
         except Exception:
             er = 'com.amazonaws.dynamodb.v20111205#ConditionalCheckFailedException'
             return self.error(er)
@@ -171,10 +175,10 @@ class DynamoHandler(BaseResponse):
                 request = list(table_request.values())[0]
                 if request_type == 'PutRequest':
                     item = request['Item']
-                    dynamodb_backend2.put_item(table_name, item)
+                    self.dynamodb_backend2.put_item(table_name, item)
                 elif request_type == 'DeleteRequest':
                     keys = request['Key']
-                    item = dynamodb_backend2.delete_item(table_name, keys)
+                    item = self.dynamodb_backend2.delete_item(table_name, keys)
 
         response = {
             "Responses": {
@@ -194,7 +198,7 @@ class DynamoHandler(BaseResponse):
         name = self.body['TableName']
         key = self.body['Key']
         try:
-            item = dynamodb_backend2.get_item(name, key)
+            item = self.dynamodb_backend2.get_item(name, key)
         except ValueError:
             er = 'com.amazon.coral.validate#ValidationException'
             return self.error(er, status=400)
@@ -223,7 +227,7 @@ class DynamoHandler(BaseResponse):
             attributes_to_get = table_request.get('AttributesToGet')
             results["Responses"][table_name] = []
             for key in keys:
-                item = dynamodb_backend2.get_item(table_name, key)
+                item = self.dynamodb_backend2.get_item(table_name, key)
                 if item:
                     item_describe = item.describe_attrs(attributes_to_get)
                     results["Responses"][table_name].append(item_describe["Item"])
@@ -242,7 +246,7 @@ class DynamoHandler(BaseResponse):
         if key_condition_expression:
             value_alias_map = self.body['ExpressionAttributeValues']
 
-            table = dynamodb_backend2.get_table(name)
+            table = self.dynamodb_backend2.get_table(name)
             index_name = self.body.get('IndexName')
             if index_name:
                 all_indexes = (table.global_indexes or []) + (table.indexes or [])
@@ -293,7 +297,7 @@ class DynamoHandler(BaseResponse):
             # 'KeyConditions': {u'forum_name': {u'ComparisonOperator': u'EQ', u'AttributeValueList': [{u'S': u'the-key'}]}}
             key_conditions = self.body.get('KeyConditions')
             if key_conditions:
-                hash_key_name, range_key_name = dynamodb_backend2.get_table_keys_name(name, key_conditions.keys())
+                hash_key_name, range_key_name = self.dynamodb_backend2.get_table_keys_name(name, key_conditions.keys())
                 if hash_key_name is None:
                     er = "'com.amazonaws.dynamodb.v20120810#ResourceNotFoundException"
                     return self.error(er)
@@ -315,7 +319,7 @@ class DynamoHandler(BaseResponse):
                             range_values = []
 
         index_name = self.body.get('IndexName')
-        items, last_page = dynamodb_backend2.query(name, hash_key, range_comparison, range_values, index_name=index_name)
+        items, last_page = self.dynamodb_backend2.query(name, hash_key, range_comparison, range_values, index_name=index_name)
         if items is None:
             er = 'com.amazonaws.dynamodb.v20111205#ResourceNotFoundException'
             return self.error(er)
@@ -354,7 +358,7 @@ class DynamoHandler(BaseResponse):
             comparison_values = scan_filter.get("AttributeValueList", [])
             filters[attribute_name] = (comparison_operator, comparison_values)
 
-        items, scanned_count, last_page = dynamodb_backend2.scan(name, filters)
+        items, scanned_count, last_page = self.dynamodb_backend2.scan(name, filters)
 
         if items is None:
             er = 'com.amazonaws.dynamodb.v20111205#ResourceNotFoundException'
@@ -383,7 +387,7 @@ class DynamoHandler(BaseResponse):
         name = self.body['TableName']
         keys = self.body['Key']
         return_values = self.body.get('ReturnValues', '')
-        item = dynamodb_backend2.delete_item(name, keys)
+        item = self.dynamodb_backend2.delete_item(name, keys)
         if item:
             if return_values == 'ALL_OLD':
                 item_dict = item.to_json()
@@ -400,7 +404,7 @@ class DynamoHandler(BaseResponse):
         key = self.body['Key']
         update_expression = self.body.get('UpdateExpression')
         attribute_updates = self.body.get('AttributeUpdates')
-        item = dynamodb_backend2.update_item(name, key, update_expression, attribute_updates)
+        item = self.dynamodb_backend2.update_item(name, key, update_expression, attribute_updates)
 
         item_dict = item.to_json()
         item_dict['ConsumedCapacityUnits'] = 0.5
@@ -13,7 +13,7 @@ from boto.ec2.blockdevicemapping import BlockDeviceMapping, BlockDeviceType
 from boto.ec2.spotinstancerequest import SpotInstanceRequest as BotoSpotRequest
 from boto.ec2.launchspecification import LaunchSpecification
 
-from moto.core import BaseBackend
+from moto.core import BaseBackend, RegionBackends
 from moto.core.models import Model
 from .exceptions import (
     EC2ClientError,
@@ -2972,6 +2972,5 @@ class EC2Backend(BaseBackend, InstanceBackend, TagBackend, AmiBackend,
                 self.get_vpn_gateway(vpn_gateway_id=resource_id)
         return True
 
-ec2_backends = {}
-for region in boto.ec2.regions():
-    ec2_backends[region.name] = EC2Backend(region.name)
+ec2_backends = RegionBackends(
+    [region.name for region in boto.ec2.regions()], EC2Backend)
@@ -60,8 +60,7 @@ class ElasticBlockStore(BaseResponse):
         volumes = self.ec2_backend.describe_volumes(filters=filters)
         # Describe volumes to handle filter on volume_ids
         volumes = [v for v in volumes if v.id in volume_ids] if volume_ids else volumes
-        template = self.response_template(DESCRIBE_VOLUMES_RESPONSE)
-        return template.render(volumes=volumes)
+        return self.response_stream(DESCRIBE_VOLUMES_RESPONSE, volumes=volumes)
 
     def describe_volume_attribute(self):
         raise NotImplementedError('ElasticBlockStore.describe_volume_attribute is not yet implemented')
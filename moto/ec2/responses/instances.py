@@ -15,8 +15,7 @@ class InstanceResponse(BaseResponse):
         else:
             reservations = self.ec2_backend.all_reservations(make_copy=True, filters=filter_dict)
 
-        template = self.response_template(EC2_DESCRIBE_INSTANCES)
-        return template.render(reservations=reservations)
+        return self.response_stream(EC2_DESCRIBE_INSTANCES, reservations=reservations)
 
     def run_instances(self):
         min_count = int(self.querystring.get('MinCount', ['1'])[0])
@@ -3,6 +3,8 @@ import random
 import re
 import six
 
+from moto.core.utils import get_tree_node, tree_members, tree_value, flatten_tree
+
 EC2_RESOURCE_TO_PREFIX = {
     'customer-gateway': 'cgw',
     'dhcp-options': 'dopt',
@@ -202,26 +204,23 @@ def vpc_ids_from_querystring(querystring_dict):
 
 
 def sequence_from_querystring(parameter, querystring_dict):
-    parameter_values = []
-    for key, value in querystring_dict.items():
-        if parameter in key:
-            parameter_values.append(value[0])
-    return parameter_values
+    node = get_tree_node(querystring_dict, parameter)
+    if node is None:
+        return []
+    if not isinstance(node, dict):
+        return [node[0]]
+    values = [tree_value(member) for member in tree_members(node)]
+    return [value for value in values if value is not None]
 
 
 def tags_from_query_string(querystring_dict):
-    prefix = 'Tag'
-    suffix = 'Key'
     response_values = {}
-    for key, value in querystring_dict.items():
-        if key.startswith(prefix) and key.endswith(suffix):
-            tag_index = key.replace(prefix + ".", "").replace("." + suffix, "")
-            tag_key = querystring_dict.get("Tag.{0}.Key".format(tag_index))[0]
-            tag_value_key = "Tag.{0}.Value".format(tag_index)
-            if tag_value_key in querystring_dict:
-                response_values[tag_key] = querystring_dict.get(tag_value_key)[0]
-            else:
-                response_values[tag_key] = None
+    for tag in tree_members(get_tree_node(querystring_dict, 'Tag')):
+        if not isinstance(tag, dict):
+            continue
+        tag_key = tree_value(tag.get('Key'))
+        if tag_key is not None:
+            response_values[tag_key] = tree_value(tag.get('Value'))
     return response_values
 
 
@@ -244,22 +243,19 @@ def dhcp_configuration_from_querystring(querystring, option=u'DhcpConfiguration'
         {u'domain-name': [u'example.com'], u'domain-name-servers': [u'10.0.0.6', u'10.0.0.7']}
     """
 
-    key_needle = re.compile(u'{0}.[0-9]+.Key'.format(option), re.UNICODE)
     response_values = {}
-
-    for key, value in querystring.items():
-        if key_needle.match(key):
-            values = []
-            key_index = key.split(".")[1]
-            value_index = 1
-            while True:
-                value_key = u'{0}.{1}.Value.{2}'.format(option, key_index, value_index)
-                if value_key in querystring:
-                    values.extend(querystring[value_key])
-                else:
-                    break
-                value_index += 1
-            response_values[value[0]] = values
+    for configuration in tree_members(get_tree_node(querystring, option)):
+        if not isinstance(configuration, dict):
+            continue
+        key = tree_value(configuration.get('Key'))
+        if key is None:
+            continue
+        values = []
+        for value in tree_members(configuration.get('Value')):
+            if isinstance(value, dict):
+                value = value.get(None, [])
+            values.extend(value)
+        response_values[key] = values
     return response_values
 
 
@@ -270,28 +266,28 @@ def optional_from_querystring(parameter, querystring):
 
 def filters_from_querystring(querystring_dict):
     response_values = {}
-    for key, value in querystring_dict.items():
-        match = re.search(r"Filter.(\d).Name", key)
-        if match:
-            filter_index = match.groups()[0]
-            value_prefix = "Filter.{0}.Value".format(filter_index)
-            filter_values = [filter_value[0] for filter_key, filter_value in querystring_dict.items() if
-                             filter_key.startswith(value_prefix)]
-            response_values[value[0]] = filter_values
+    for filter_node in tree_members(get_tree_node(querystring_dict, 'Filter')):
+        if not isinstance(filter_node, dict):
+            continue
+        filter_name = tree_value(filter_node.get('Name'))
+        if filter_name is not None:
+            response_values[filter_name] = [
+                value[0] for _, value in flatten_tree(filter_node.get('Value', {}))]
     return response_values
 
 
 def dict_from_querystring(parameter, querystring_dict):
     use_dict = {}
-    for key, value in querystring_dict.items():
-        match = re.search(r"{0}.(\d).(\w+)".format(parameter), key)
-        if match:
-            use_dict_index = match.groups()[0]
-            use_dict_element_property = match.groups()[1]
-
-            if not use_dict.get(use_dict_index):
-                use_dict[use_dict_index] = {}
-            use_dict[use_dict_index][use_dict_element_property] = value[0]
+    node = get_tree_node(querystring_dict, parameter)
+    if not isinstance(node, dict):
+        return use_dict
+    for use_dict_index, element in node.items():
+        if use_dict_index is None or not use_dict_index.isdigit():
+            continue
+        for element_property, value in flatten_tree(element):
+            if element_property:
+                use_dict_element_property = element_property.split('.')[0]
+                use_dict.setdefault(use_dict_index, {})[use_dict_element_property] = value[0]
 
     return use_dict
 
@@ -1,7 +1,7 @@
 from __future__ import unicode_literals
 import uuid
 
-from moto.core import BaseBackend
+from moto.core import BaseBackend, RegionBackends
 from moto.ec2 import ec2_backends
 
 
@@ -199,6 +199,5 @@ class EC2ContainerServiceBackend(BaseBackend):
             raise Exception("cluster {0} or service {1} does not exist".format(cluster_name, service_name))
 
 
-ecs_backends = {}
-for region, ec2_backend in ec2_backends.items():
-    ecs_backends[region] = EC2ContainerServiceBackend()
+ecs_backends = RegionBackends(
+    ec2_backends, lambda region_name: EC2ContainerServiceBackend())
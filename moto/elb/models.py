@@ -9,7 +9,7 @@ from boto.ec2.elb.attributes import (
     CrossZoneLoadBalancingAttribute,
 )
 from boto.ec2.elb.policies import Policies
-from moto.core import BaseBackend
+from moto.core import BaseBackend, RegionBackends
 from .exceptions import LoadBalancerNotFoundError, TooManyTagsError, BadHealthCheckDefinition
 
 
@@ -284,6 +284,6 @@ class ELBBackend(BaseBackend):
         return load_balancer
 
 
-elb_backends = {}
-for region in boto.ec2.elb.regions():
-    elb_backends[region.name] = ELBBackend()
+elb_backends = RegionBackends(
+    [region.name for region in boto.ec2.elb.regions()],
+    lambda region_name: ELBBackend())
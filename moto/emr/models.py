@@ -1,7 +1,7 @@
 from __future__ import unicode_literals
 
 import boto.emr
-from moto.core import BaseBackend
+from moto.core import BaseBackend, RegionBackends
 
 from .utils import random_instance_group_id, random_job_id
 
@@ -258,6 +258,6 @@ class ElasticMapReduceBackend(BaseBackend):
         cluster.remove_tags(tag_keys)
 
 
-emr_backends = {}
-for region in boto.emr.regions():
-    emr_backends[region.name] = ElasticMapReduceBackend()
+emr_backends = RegionBackends(
+    [region.name for region in boto.emr.regions()],
+    lambda region_name: ElasticMapReduceBackend())
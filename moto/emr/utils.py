@@ -3,6 +3,8 @@ import random
 import string
 import six
 
+from moto.core.utils import get_tree_node, tree_members, tree_value
+
 
 def random_job_id(size=13):
     chars = list(range(10)) + list(string.ascii_uppercase)
@@ -17,16 +19,15 @@ def random_instance_group_id(size=13):
 
 
 def tags_from_query_string(querystring_dict):
-    prefix = 'Tags'
-    suffix = 'Key'
     response_values = {}
-    for key, value in querystring_dict.items():
-        if key.startswith(prefix) and key.endswith(suffix):
-            tag_index = key.replace(prefix + ".", "").replace("." + suffix, "")
-            tag_key = querystring_dict.get("Tags.{0}.Key".format(tag_index))[0]
-            tag_value_key = "Tags.{0}.Value".format(tag_index)
-            if tag_value_key in querystring_dict:
-                response_values[tag_key] = querystring_dict.get(tag_value_key)[0]
-            else:
-                response_values[tag_key] = None
+    tags = get_tree_node(querystring_dict, 'Tags')
+    if isinstance(tags, dict) and 'member' in tags:
+        # Tags.member.1.Key as well as Tags.1.Key
+        tags = tags['member']
+    for tag in tree_members(tags):
+        if not isinstance(tag, dict):
+            continue
+        tag_key = tree_value(tag.get('Key'))
+        if tag_key is not None:
+            response_values[tag_key] = tree_value(tag.get('Value'))
     return response_values
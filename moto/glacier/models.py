@@ -3,7 +3,7 @@ from __future__ import unicode_literals
 import hashlib
 
 import boto.glacier
-from moto.core import BaseBackend
+from moto.core import BaseBackend, RegionBackends
 
 from .utils import get_job_id
 
@@ -118,6 +118,5 @@ class GlacierBackend(BaseBackend):
         return vault.list_jobs()
 
 
-glacier_backends = {}
-for region in boto.glacier.regions():
-    glacier_backends[region.name] = GlacierBackend(region)
+glacier_backends = RegionBackends(
+    [region.name for region in boto.glacier.regions()], GlacierBackend)
@@ -1,3 +1,10 @@
 from __future__ import unicode_literals
-from .models import iam_backend
-mock_iam = iam_backend.decorator
+from .models import iam_backend, iam_backends  # flake8: noqa
+from ..core.models import MockAWS
+
+
+def mock_iam(func=None):
+    if func:
+        return MockAWS(iam_backends)(func)
+    else:
+        return MockAWS(iam_backends)
@@ -1,6 +1,6 @@
 from __future__ import unicode_literals
 
-from moto.core import BaseBackend
+from moto.core import BaseBackend, GlobalBackends
 from .exceptions import IAMNotFoundException, IAMConflictException, IAMReportNotPresentException
 from .utils import random_access_key, random_alphanumeric, random_resource_id
 from datetime import datetime
@@ -20,7 +20,7 @@ class Role(object):
     def create_from_cloudformation_json(cls, resource_name, cloudformation_json, region_name):
         properties = cloudformation_json['Properties']
 
-        role = iam_backend.create_role(
+        role = iam_backends['global'].create_role(
             role_name=resource_name,
             assume_role_policy_document=properties['AssumeRolePolicyDocument'],
             path=properties['Path'],
@@ -60,7 +60,7 @@ class InstanceProfile(object):
         properties = cloudformation_json['Properties']
 
         role_ids = properties['Roles']
-        return iam_backend.create_instance_profile(
+        return iam_backends['global'].create_instance_profile(
             name=resource_name,
             path=properties['Path'],
             role_ids=role_ids,
@@ -271,7 +271,7 @@ class IAMBackend(BaseBackend):
     def create_instance_profile(self, name, path, role_ids):
         instance_profile_id = random_resource_id()
 
-        roles = [iam_backend.get_role_by_id(role_id) for role_id in role_ids]
+        roles = [self.get_role_by_id(role_id) for role_id in role_ids]
         instance_profile = InstanceProfile(instance_profile_id, name, path, roles)
         self.instance_profiles[instance_profile_id] = instance_profile
         return instance_profile
@@ -426,4 +426,5 @@ class IAMBackend(BaseBackend):
             report += self.users[user].to_csv()
         return base64.b64encode(report.encode('ascii')).decode('ascii')
 
-iam_backend = IAMBackend()
+iam_backends = GlobalBackends(IAMBackend)
+iam_backend = iam_backends['global']
@@ -1,30 +1,34 @@
 from __future__ import unicode_literals
 
 from moto.core.responses import BaseResponse
-from .models import iam_backend
+from .models import iam_backends
 
 
 class IamResponse(BaseResponse):
 
+    @property
+    def iam_backend(self):
+        return iam_backends['global']
+
     def create_role(self):
         role_name = self._get_param('RoleName')
         path = self._get_param('Path')
         assume_role_policy_document = self._get_param('AssumeRolePolicyDocument')
 
-        role = iam_backend.create_role(role_name, assume_role_policy_document, path)
+        role = self.iam_backend.create_role(role_name, assume_role_policy_document, path)
         template = self.response_template(CREATE_ROLE_TEMPLATE)
         return template.render(role=role)
 
     def get_role(self):
         role_name = self._get_param('RoleName')
-        role = iam_backend.get_role(role_name)
+        role = self.iam_backend.get_role(role_name)
 
         template = self.response_template(GET_ROLE_TEMPLATE)
         return template.render(role=role)
 
     def list_role_policies(self):
         role_name = self._get_param('RoleName')
-        role_policies_names = iam_backend.list_role_policies(role_name)
+        role_policies_names = self.iam_backend.list_role_policies(role_name)
         template = self.response_template(LIST_ROLE_POLICIES)
         return template.render(role_policies=role_policies_names)
 
@@ -32,14 +36,14 @@ class IamResponse(BaseResponse):
         role_name = self._get_param('RoleName')
         policy_name = self._get_param('PolicyName')
         policy_document = self._get_param('PolicyDocument')
-        iam_backend.put_role_policy(role_name, policy_name, policy_document)
+        self.iam_backend.put_role_policy(role_name, policy_name, policy_document)
         template = self.response_template(GENERIC_EMPTY_TEMPLATE)
         return template.render(name="PutRolePolicyResponse")
 
     def get_role_policy(self):
         role_name = self._get_param('RoleName')
         policy_name = self._get_param('PolicyName')
-        policy_name, policy_document = iam_backend.get_role_policy(role_name, policy_name)
+        policy_name, policy_document = self.iam_backend.get_role_policy(role_name, policy_name)
         template = self.response_template(GET_ROLE_POLICY_TEMPLATE)
         return template.render(role_name=role_name,
                                policy_name=policy_name,
@@ -47,7 +51,7 @@ class IamResponse(BaseResponse):
 
     def update_assume_role_policy(self):
         role_name = self._get_param('RoleName')
-        role = iam_backend.get_role(role_name)
+        role = self.iam_backend.get_role(role_name)
         role.assume_role_policy_document = self._get_param('PolicyDocument')
         template = self.response_template(GENERIC_EMPTY_TEMPLATE)
         return template.render(name="UpdateAssumeRolePolicyResponse")
@@ -56,13 +60,13 @@ class IamResponse(BaseResponse):
         profile_name = self._get_param('InstanceProfileName')
         path = self._get_param('Path')
 
-        profile = iam_backend.create_instance_profile(profile_name, path, role_ids=[])
+        profile = self.iam_backend.create_instance_profile(profile_name, path, role_ids=[])
         template = self.response_template(CREATE_INSTANCE_PROFILE_TEMPLATE)
         return template.render(profile=profile)
 
     def get_instance_profile(self):
         profile_name = self._get_param('InstanceProfileName')
-        profile = iam_backend.get_instance_profile(profile_name)
+        profile = self.iam_backend.get_instance_profile(profile_name)
 
         template = self.response_template(GET_INSTANCE_PROFILE_TEMPLATE)
         return template.render(profile=profile)
@@ -71,25 +75,25 @@ class IamResponse(BaseResponse):
         profile_name = self._get_param('InstanceProfileName')
         role_name = self._get_param('RoleName')
 
-        iam_backend.add_role_to_instance_profile(profile_name, role_name)
+        self.iam_backend.add_role_to_instance_profile(profile_name, role_name)
         template = self.response_template(ADD_ROLE_TO_INSTANCE_PROFILE_TEMPLATE)
         return template.render()
 
     def list_roles(self):
-        roles = iam_backend.get_roles()
+        roles = self.iam_backend.get_roles()
 
         template = self.response_template(LIST_ROLES_TEMPLATE)
         return template.render(roles=roles)
 
     def list_instance_profiles(self):
-        profiles = iam_backend.get_instance_profiles()
+        profiles = self.iam_backend.get_instance_profiles()
 
         template = self.response_template(LIST_INSTANCE_PROFILES_TEMPLATE)
         return template.render(instance_profiles=profiles)
 
     def list_instance_profiles_for_role(self):
         role_name = self._get_param('RoleName')
-        profiles = iam_backend.get_instance_profiles_for_role(role_name=role_name)
+        profiles = self.iam_backend.get_instance_profiles_for_role(role_name=role_name)
 
         template = self.response_template(LIST_INSTANCE_PROFILES_FOR_ROLE_TEMPLATE)
         return template.render(instance_profiles=profiles)
@@ -101,18 +105,18 @@ class IamResponse(BaseResponse):
         private_key = self._get_param('PrivateKey')
         cert_chain = self._get_param('CertificateName')
 
-        cert = iam_backend.upload_server_cert(cert_name, cert_body, private_key, cert_chain=cert_chain, path=path)
+        cert = self.iam_backend.upload_server_cert(cert_name, cert_body, private_key, cert_chain=cert_chain, path=path)
         template = self.response_template(UPLOAD_CERT_TEMPLATE)
         return template.render(certificate=cert)
 
     def list_server_certificates(self, marker=None):
-        certs = iam_backend.get_all_server_certs(marker=marker)
+        certs = self.iam_backend.get_all_server_certs(marker=marker)
         template = self.response_template(LIST_SERVER_CERTIFICATES_TEMPLATE)
         return template.render(server_certificates=certs)
 
     def get_server_certificate(self):
         cert_name = self._get_param('ServerCertificateName')
-        cert = iam_backend.get_server_certificate(cert_name)
+        cert = self.iam_backend.get_server_certificate(cert_name)
         template = self.response_template(GET_SERVER_CERTIFICATE_TEMPLATE)
         return template.render(certificate=cert)
 
@@ -120,26 +124,26 @@ class IamResponse(BaseResponse):
         group_name = self._get_param('GroupName')
         path = self._get_param('Path')
 
-        group = iam_backend.create_group(group_name, path)
+        group = self.iam_backend.create_group(group_name, path)
         template = self.response_template(CREATE_GROUP_TEMPLATE)
         return template.render(group=group)
 
     def get_group(self):
         group_name = self._get_param('GroupName')
 
-        group = iam_backend.get_group(group_name)
+        group = self.iam_backend.get_group(group_name)
         template = self.response_template(GET_GROUP_TEMPLATE)
         return template.render(group=group)
 
     def list_groups(self):
-        groups = iam_backend.list_groups()
+        groups = self.iam_backend.list_groups()
         template = self.response_template(LIST_GROUPS_TEMPLATE)
         return template.render(groups=groups)
 
     def list_groups_for_user(self):
         user_name = self._get_param('UserName')
 
-        groups = iam_backend.get_groups_for_user(user_name)
+        groups = self.iam_backend.get_groups_for_user(user_name)
         template = self.response_template(LIST_GROUPS_FOR_USER_TEMPLATE)
         return template.render(groups=groups)
 
@@ -147,20 +151,20 @@ class IamResponse(BaseResponse):
         user_name = self._get_param('UserName')
         path = self._get_param('Path')
 
-        user = iam_backend.create_user(user_name, path)
+        user = self.iam_backend.create_user(user_name, path)
         template = self.response_template(USER_TEMPLATE)
         return template.render(action='Create', user=user)
 
     def get_user(self):
         user_name = self._get_param('UserName')
-        user = iam_backend.get_user(user_name)
+        user = self.iam_backend.get_user(user_name)
         template = self.response_template(USER_TEMPLATE)
         return template.render(action='Get', user=user)
 
     def create_login_profile(self):
         user_name = self._get_param('UserName')
         password = self._get_param('Password')
-        iam_backend.create_login_profile(user_name, password)
+        self.iam_backend.create_login_profile(user_name, password)
 
         template = self.response_template(CREATE_LOGIN_PROFILE_TEMPLATE)
         return template.render(user_name=user_name)
@@ -169,7 +173,7 @@ class IamResponse(BaseResponse):
         group_name = self._get_param('GroupName')
         user_name = self._get_param('UserName')
 
-        iam_backend.add_user_to_group(group_name, user_name)
+        self.iam_backend.add_user_to_group(group_name, user_name)
         template = self.response_template(GENERIC_EMPTY_TEMPLATE)
         return template.render(name='AddUserToGroup')
 
@@ -177,7 +181,7 @@ class IamResponse(BaseResponse):
         group_name = self._get_param('GroupName')
         user_name = self._get_param('UserName')
 
-        iam_backend.remove_user_from_group(group_name, user_name)
+        self.iam_backend.remove_user_from_group(group_name, user_name)
         template = self.response_template(GENERIC_EMPTY_TEMPLATE)
         return template.render(name='RemoveUserFromGroup')
 
@@ -185,7 +189,7 @@ class IamResponse(BaseResponse):
         user_name = self._get_param('UserName')
         policy_name = self._get_param('PolicyName')
 
-        policy_document = iam_backend.get_user_policy(user_name, policy_name)
+        policy_document = self.iam_backend.get_user_policy(user_name, policy_name)
         template = self.response_template(GET_USER_POLICY_TEMPLATE)
         return template.render(
             user_name=user_name,
@@ -198,7 +202,7 @@ class IamResponse(BaseResponse):
         policy_name = self._get_param('PolicyName')
         policy_document = self._get_param('PolicyDocument')
 
-        iam_backend.put_user_policy(user_name, policy_name, policy_document)
+        self.iam_backend.put_user_policy(user_name, policy_name, policy_document)
         template = self.response_template(GENERIC_EMPTY_TEMPLATE)
         return template.render(name='PutUserPolicy')
 
@@ -206,21 +210,21 @@ class IamResponse(BaseResponse):
         user_name = self._get_param('UserName')
         policy_name = self._get_param('PolicyName')
 
-        iam_backend.delete_user_policy(user_name, policy_name)
+        self.iam_backend.delete_user_policy(user_name, policy_name)
         template = self.response_template(GENERIC_EMPTY_TEMPLATE)
         return template.render(name='DeleteUserPolicy')
 
     def create_access_key(self):
         user_name = self._get_param('UserName')
 
-        key = iam_backend.create_access_key(user_name)
+        key = self.iam_backend.create_access_key(user_name)
         template = self.response_template(CREATE_ACCESS_KEY_TEMPLATE)
         return template.render(key=key)
 
     def list_access_keys(self):
         user_name = self._get_param('UserName')
 
-        keys = iam_backend.get_all_access_keys(user_name)
+        keys = self.iam_backend.get_all_access_keys(user_name)
         template = self.response_template(LIST_ACCESS_KEYS_TEMPLATE)
         return template.render(user_name=user_name, keys=keys)
 
@@ -228,26 +232,26 @@ class IamResponse(BaseResponse):
         user_name = self._get_param('UserName')
         access_key_id = self._get_param('AccessKeyId')
 
-        iam_backend.delete_access_key(access_key_id, user_name)
+        self.iam_backend.delete_access_key(access_key_id, user_name)
         template = self.response_template(GENERIC_EMPTY_TEMPLATE)
         return template.render(name='DeleteAccessKey')
 
     def delete_user(self):
         user_name = self._get_param('UserName')
-        iam_backend.delete_user(user_name)
+        self.iam_backend.delete_user(user_name)
         template = self.response_template(GENERIC_EMPTY_TEMPLATE)
         return template.render(name='DeleteUser')
 
     def generate_credential_report(self):
-        if iam_backend.report_generated():
+        if self.iam_backend.report_generated():
             template = self.response_template(CREDENTIAL_REPORT_GENERATED)
         else:
             template = self.response_template(CREDENTIAL_REPORT_GENERATING)
-        iam_backend.generate_report()
+        self.iam_backend.generate_report()
         return template.render()
 
     def get_credential_report(self):
-        report = iam_backend.get_credential_report()
+        report = self.iam_backend.get_credential_report()
         template = self.response_template(CREDENTIAL_REPORT)
         return template.render(report=report)
 
@@ -0,0 +1,136 @@
+from __future__ import unicode_literals
+import json
+import shutil
+import struct
+import tempfile
+import threading
+import time
+
+# Every record is the length of its header and of its body, then the header
+# as JSON, then the raw request body
+RECORD_PREFIX = struct.Struct('>II')
+ENVIRON_HEADERS = {'CONTENT_TYPE': 'Content-Type', 'CONTENT_LENGTH': 'Content-Length'}
+# Recorded bodies larger than this are kept in a temporary file until written
+SPOOL_SIZE = 1024 * 1024
+
+
+def environ_headers(environ):
+    headers = []
+    for key, value in environ.items():
+        if key.startswith('HTTP_'):
+            headers.append((key[5:].replace('_', '-').title(), value))
+        elif key in ENVIRON_HEADERS and value:
+            headers.append((ENVIRON_HEADERS[key], value))
+    return headers
+
+
+class TeeInput(object):
+    """
+    A wsgi.input which copies everything the application reads from the
+    original input to `copy`
+    """
+
+    def __init__(self, stream, copy):
+        self.stream = stream
+        self.copy = copy
+
+    def read(self, *args):
+        data = self.stream.read(*args)
+        self.copy.write(data)
+        return data
+
+    def readline(self, *args):
+        line = self.stream.readline(*args)
+        self.copy.write(line)
+        return line
+
+    def readlines(self, *args):
+        lines = self.stream.readlines(*args)
+        for line in lines:
+            self.copy.write(line)
+        return lines
+
+    def __iter__(self):
+        return iter(self.readline, b'')
+
+
+class RequestJournal(object):
+    """
+    Appends every request the server handles to a file, with its method,
+    host, path, headers, body, and when it arrived and how long it took, so
+    the stream can be replayed later with moto_replay.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'ab')
+        self.lock = threading.Lock()
+        self.start = time.time()
+
+    def wrap(self, app):
+        """
+        A WSGI application which hands each request to app and then records
+        it. The recorded body is what app read of the request body, which is
+        copied aside as it is read, so a body without a Content-Length, such
+        as a chunked upload, still reaches app.
+        """
+        def journaled_app(environ, start_response):
+            body = tempfile.SpooledTemporaryFile(SPOOL_SIZE)
+            environ['wsgi.input'] = TeeInput(environ['wsgi.input'], body)
+            statuses = []
+
+            def journaled_start_response(status, headers, *args):
+                statuses.append(int(status.split(' ', 1)[0]))
+                return start_response(status, headers, *args)
+
+            started = time.time()
+            try:
+                return app(environ, journaled_start_response)
+            finally:
+                try:
+                    self.record(environ, body, started, time.time() - started, statuses[0] if statuses else None)
+                finally:
+                    body.close()
+        return journaled_app
+
+    def record(self, environ, body, started, duration, status):
+        """
+        Append a request to the journal, with the body read from the file `body`
+        """
+        header = json.dumps({
+            'method': environ['REQUEST_METHOD'],
+            'host': environ.get('HTTP_HOST', ''),
+            'path': environ.get('PATH_INFO', ''),
+            'query': environ.get('QUERY_STRING', ''),
+            'headers': environ_headers(environ),
+            'offset': started - self.start,
+            'duration': duration,
+            'status': status,
+        }, separators=(',', ':')).encode('utf-8')
+        body_length = body.tell()
+        body.seek(0)
+        with self.lock:
+            self.file.write(RECORD_PREFIX.pack(len(header), body_length))
+            self.file.write(header)
+            shutil.copyfileobj(body, self.file)
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+def read_journal(path):
+    """
+    Yields the recorded requests of a journal as dicts, with the body under
+    'body'
+    """
+    with open(path, 'rb') as journal_file:
+        while True:
+            prefix = journal_file.read(RECORD_PREFIX.size)
+            if len(prefix) < RECORD_PREFIX.size:
+                return
+            header_length, body_length = RECORD_PREFIX.unpack(prefix)
+            request = json.loads(journal_file.read(header_length).decode('utf-8'))
+            request['body'] = journal_file.read(body_length)
+            yield request
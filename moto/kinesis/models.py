@@ -11,7 +11,8 @@ from operator import attrgetter
 from hashlib import md5
 
 from moto.compat import OrderedDict
-from moto.core import BaseBackend
+from moto.core import BaseBackend, RegionBackends
+from moto.core.utils import ResourceLock
 from .exceptions import StreamNotFoundError, ShardNotFoundError, ResourceInUseError, \
     ResourceNotFoundError, InvalidArgumentError
 from .utils import compose_shard_iterator, compose_new_shard_iterator, decompose_shard_iterator
@@ -38,6 +39,7 @@ class Shard(object):
         self.starting_hash = starting_hash
         self.ending_hash = ending_hash
         self.records = OrderedDict()
+        self.lock = ResourceLock()
 
     @property
     def shard_id(self):
@@ -47,24 +49,25 @@ class Shard(object):
         last_sequence_id = int(last_sequence_id)
         results = []
 
-        for sequence_number, record in self.records.items():
-            if sequence_number > last_sequence_id:
-                results.append(record)
-                last_sequence_id = sequence_number
+        with self.lock:
+            for sequence_number, record in self.records.items():
+                if sequence_number > last_sequence_id:
+                    results.append(record)
+                    last_sequence_id = sequence_number
 
-            if len(results) == limit:
-                break
+                if len(results) == limit:
+                    break
 
         return results, last_sequence_id
 
     def put_record(self, partition_key, data, explicit_hash_key):
-        # Note: this function is not safe for concurrency
-        if self.records:
-            last_sequence_number = self.get_max_sequence_number()
-        else:
-            last_sequence_number = 0
-        sequence_number = last_sequence_number + 1
-        self.records[sequence_number] = Record(partition_key, data, sequence_number, explicit_hash_key)
+        with self.lock:
+            if self.records:
+                last_sequence_number = self.get_max_sequence_number()
+            else:
+                last_sequence_number = 0
+            sequence_number = last_sequence_number + 1
+            self.records[sequence_number] = Record(partition_key, data, sequence_number, explicit_hash_key)
         return sequence_number
 
     def get_min_sequence_number(self):
@@ -338,8 +341,9 @@ class KinesisBackend(BaseBackend):
         else:
             raise InvalidArgumentError(new_starting_hash_key)
 
-        records = shard.records
-        shard.records = OrderedDict()
+        with shard.lock:
+            records = shard.records
+            shard.records = OrderedDict()
 
         for index in records:
             record = records[index]
@@ -427,6 +431,6 @@ class KinesisBackend(BaseBackend):
                del stream.tags[key]
 
 
-kinesis_backends = {}
-for region in boto.kinesis.regions():
-    kinesis_backends[region.name] = KinesisBackend()
+kinesis_backends = RegionBackends(
+    [region.name for region in boto.kinesis.regions()],
+    lambda region_name: KinesisBackend())
@@ -1,7 +1,7 @@
 from __future__ import unicode_literals
 
 import boto.kms
-from moto.core import BaseBackend
+from moto.core import BaseBackend, RegionBackends
 from .utils import generate_key_id
 from collections import defaultdict
 
@@ -85,6 +85,6 @@ class KmsBackend(BaseBackend):
         return self.keys[key_id].policy
 
 
-kms_backends = {}
-for region in boto.kms.regions():
-    kms_backends[region.name] = KmsBackend()
+kms_backends = RegionBackends(
+    [region.name for region in boto.kms.regions()],
+    lambda region_name: KmsBackend())
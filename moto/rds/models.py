@@ -6,7 +6,7 @@ import boto.rds
 from jinja2 import Template
 
 from moto.cloudformation.exceptions import UnformattedGetAttTemplateException
-from moto.core import BaseBackend
+from moto.core import BaseBackend, RegionBackends
 from moto.core.utils import get_random_hex
 from moto.ec2.models import ec2_backends
 from .exceptions import DBInstanceNotFoundError, DBSecurityGroupNotFoundError, DBSubnetGroupNotFoundError
@@ -421,6 +421,6 @@ class RDSBackend(BaseBackend):
             raise DBSubnetGroupNotFoundError(subnet_name)
 
 
-rds_backends = {}
-for region in boto.rds.regions():
-    rds_backends[region.name] = RDSBackend()
+rds_backends = RegionBackends(
+    [region.name for region in boto.rds.regions()],
+    lambda region_name: RDSBackend())
@@ -7,7 +7,7 @@ import json
 from jinja2 import Template
 from re import compile as re_compile
 from moto.cloudformation.exceptions import UnformattedGetAttTemplateException
-from moto.core import BaseBackend
+from moto.core import BaseBackend, RegionBackends
 from moto.core.utils import get_random_hex
 from moto.ec2.models import ec2_backends
 from .exceptions import RDSClientError, DBInstanceNotFoundError, DBSecurityGroupNotFoundError, DBSubnetGroupNotFoundError
@@ -781,6 +781,6 @@ class OptionGroupOption(object):
         return template.render(option_group=self)
 
 
-rds2_backends = {}
-for region in boto.rds2.regions():
-    rds2_backends[region.name] = RDS2Backend()
+rds2_backends = RegionBackends(
+    [region.name for region in boto.rds2.regions()],
+    lambda region_name: RDS2Backend())
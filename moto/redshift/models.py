@@ -1,7 +1,7 @@
 from __future__ import unicode_literals
 
 import boto.redshift
-from moto.core import BaseBackend
+from moto.core import BaseBackend, RegionBackends
 from moto.ec2 import ec2_backends
 from .exceptions import (
     ClusterNotFoundError,
@@ -372,6 +372,6 @@ class RedshiftBackend(BaseBackend):
         raise ClusterParameterGroupNotFoundError(parameter_group_name)
 
 
-redshift_backends = {}
-for region in boto.redshift.regions():
-    redshift_backends[region.name] = RedshiftBackend(ec2_backends[region.name])
+redshift_backends = RegionBackends(
+    [region.name for region in boto.redshift.regions()],
+    lambda region_name: RedshiftBackend(ec2_backends[region_name]))
@@ -0,0 +1,183 @@
+from __future__ import unicode_literals
+import argparse
+import sys
+import time
+from threading import Lock, Thread
+
+from six.moves.queue import Queue
+
+from moto.journal import read_journal
+
+
+class ReplayResult(object):
+    def __init__(self):
+        self.latencies = []
+        self.mismatches = 0
+        self.errors = 0
+        self.elapsed = 0.0
+        self.lock = Lock()
+
+    def add(self, recorded, status, latency):
+        with self.lock:
+            if status is None:
+                self.errors += 1
+                return
+            self.latencies.append(latency)
+            if recorded['status'] is not None and status != recorded['status']:
+                self.mismatches += 1
+
+    @property
+    def count(self):
+        return len(self.latencies)
+
+    @property
+    def requests_per_second(self):
+        return self.count / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, percent):
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100.0))]
+
+    def summary(self):
+        return (
+            "{0} requests in {1:.2f}s ({2:.1f} req/s), p50 {3:.2f}ms, p99 {4:.2f}ms, "
+            "{5} status mismatches, {6} errors".format(
+                self.count, self.elapsed, self.requests_per_second,
+                self.percentile(50) * 1000, self.percentile(99) * 1000,
+                self.mismatches, self.errors))
+
+
+def wsgi_sender(app):
+    """
+    Sends recorded requests straight to a WSGI application, in-process
+    """
+    from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+    def send(recorded):
+        headers = [(name, value) for name, value in recorded['headers'] if name != 'Content-Length']
+        builder = EnvironBuilder(
+            path=recorded['path'], method=recorded['method'],
+            query_string=recorded['query'], headers=headers, data=recorded['body'])
+        try:
+            app_iter, status, _ = run_wsgi_app(app, builder.get_environ())
+            for _ in app_iter:
+                pass
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+        finally:
+            builder.close()
+        return int(status.split(' ', 1)[0])
+    return send
+
+
+def http_sender(base_url):
+    """
+    Sends recorded requests to a running server, keeping their Host header
+    """
+    import requests
+    from threading import local
+
+    sessions = local()
+
+    def send(recorded):
+        session = getattr(sessions, 'session', None)
+        if session is None:
+            session = sessions.session = requests.Session()
+        url = base_url.rstrip('/') + recorded['path']
+        if recorded['query']:
+            url += '?' + recorded['query']
+        headers = dict(recorded['headers'])
+        headers.pop('Content-Length', None)
+        response = session.request(
+            recorded['method'], url, headers=headers, data=recorded['body'], allow_redirects=False)
+        return response.status_code
+    return send
+
+
+def replay(recorded_requests, send, concurrency=1, speed=0):
+    """
+    Replays recorded requests with `concurrency` requests in flight at a
+    time. With a speed of 0 every request is sent as soon as a worker is
+    free, otherwise the recorded gaps between requests are divided by speed.
+
+    Requests which depend on each other, such as creating a bucket and
+    writing to it, can only be relied on to run in order with a concurrency
+    of 1.
+    """
+    result = ReplayResult()
+    pending = Queue(maxsize=concurrency * 2)
+
+    def work():
+        while True:
+            recorded = pending.get()
+            if recorded is None:
+                return
+            started = time.time()
+            try:
+                status = send(recorded)
+            except Exception:
+                status = None
+            result.add(recorded, status, time.time() - started)
+
+    workers = [Thread(target=work) for _ in range(concurrency)]
+    for worker in workers:
+        worker.daemon = True
+        worker.start()
+
+    started = time.time()
+    first_offset = None
+    for recorded in recorded_requests:
+        if speed:
+            if first_offset is None:
+                first_offset = recorded['offset']
+            delay = started + (recorded['offset'] - first_offset) / speed - time.time()
+            if delay > 0:
+                time.sleep(delay)
+        pending.put(recorded)
+    for _ in workers:
+        pending.put(None)
+    for worker in workers:
+        worker.join()
+    result.elapsed = time.time() - started
+    return result
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(
+        description='Replay a journal recorded with moto_server --journal')
+    parser.add_argument('journal', type=str, help='The journal file')
+    parser.add_argument(
+        '-u', '--url', type=str,
+        help='Replay against the server at this URL, instead of in-process',
+        default=None)
+    parser.add_argument(
+        '-c', '--concurrency', type=int,
+        help='Number of requests in flight at a time',
+        default=1)
+    parser.add_argument(
+        '--speed', type=float,
+        help='Replay at this multiple of the recorded rate. 0 sends requests as fast as possible',
+        default=0)
+    parser.add_argument(
+        '-r', '--repeat', type=int,
+        help='Number of times to replay the journal',
+        default=1)
+
+    args = parser.parse_args(argv)
+
+    if args.url:
+        send = http_sender(args.url)
+    else:
+        from moto.server import DomainDispatcherApplication, create_backend_app
+        send = wsgi_sender(DomainDispatcherApplication(create_backend_app))
+
+    # Read into memory so that replaying doesn't wait on the disk
+    recorded_requests = list(read_journal(args.journal))
+    for _ in range(args.repeat):
+        result = replay(recorded_requests, send, concurrency=args.concurrency, speed=args.speed)
+        print(result.summary())
+
+if __name__ == '__main__':
+    main()
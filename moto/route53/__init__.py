@@ -1,3 +1,10 @@
 from __future__ import unicode_literals
-from .models import route53_backend
-mock_route53 = route53_backend.decorator
+from .models import route53_backend, route53_backends  # flake8: noqa
+from ..core.models import MockAWS
+
+
+def mock_route53(func=None):
+    if func:
+        return MockAWS(route53_backends)(func)
+    else:
+        return MockAWS(route53_backends)
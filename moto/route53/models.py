@@ -3,7 +3,7 @@ from __future__ import unicode_literals
 import uuid
 from jinja2 import Template
 
-from moto.core import BaseBackend
+from moto.core import BaseBackend, GlobalBackends
 from moto.core.utils import get_random_hex
 
 
@@ -36,7 +36,7 @@ class HealthCheck(object):
             "request_interval": properties.get('RequestInterval'),
             "failure_threshold": properties.get('FailureThreshold'),
         }
-        health_check = route53_backend.create_health_check(health_check_args)
+        health_check = route53_backends['global'].create_health_check(health_check_args)
         return health_check
 
     def to_xml(self):
@@ -76,7 +76,7 @@ class RecordSet(object):
         properties = cloudformation_json['Properties']
 
         zone_name = properties["HostedZoneName"]
-        hosted_zone = route53_backend.get_hosted_zone_by_name(zone_name)
+        hosted_zone = route53_backends['global'].get_hosted_zone_by_name(zone_name)
         record_set = hosted_zone.add_rrset(properties)
         return record_set
 
@@ -145,7 +145,7 @@ class FakeZone(object):
         properties = cloudformation_json['Properties']
         name = properties["Name"]
 
-        hosted_zone = route53_backend.create_hosted_zone(name)
+        hosted_zone = route53_backends['global'].create_hosted_zone(name)
         return hosted_zone
 
 
@@ -163,7 +163,7 @@ class RecordSetGroup(object):
         properties = cloudformation_json['Properties']
 
         zone_name = properties["HostedZoneName"]
-        hosted_zone = route53_backend.get_hosted_zone_by_name(zone_name)
+        hosted_zone = route53_backends['global'].get_hosted_zone_by_name(zone_name)
         record_sets = properties["RecordSets"]
         for record_set in record_sets:
             hosted_zone.add_rrset(record_set)
@@ -213,4 +213,5 @@ class Route53Backend(BaseBackend):
     def delete_health_check(self, health_check_id):
         return self.health_checks.pop(health_check_id, None)
 
-route53_backend = Route53Backend()
+route53_backends = GlobalBackends(Route53Backend)
+route53_backend = route53_backends['global']
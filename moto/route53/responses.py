@@ -1,7 +1,7 @@
 from __future__ import unicode_literals
-from jinja2 import Template
+from moto.core.responses import template_registry
 from six.moves.urllib.parse import parse_qs, urlparse
-from .models import route53_backend
+from .models import route53_backends
 import xmltodict
 
 
@@ -10,28 +10,28 @@ def list_or_create_hostzone_response(request, full_url, headers):
     if request.method == "POST":
         elements = xmltodict.parse(request.body)
         comment = elements["CreateHostedZoneRequest"]["HostedZoneConfig"]["Comment"]
-        new_zone = route53_backend.create_hosted_zone(elements["CreateHostedZoneRequest"]["Name"], comment=comment)
-        template = Template(CREATE_HOSTED_ZONE_RESPONSE)
+        new_zone = route53_backends['global'].create_hosted_zone(elements["CreateHostedZoneRequest"]["Name"], comment=comment)
+        template = template_registry.get_template(CREATE_HOSTED_ZONE_RESPONSE)
         return 201, headers, template.render(zone=new_zone)
 
     elif request.method == "GET":
-        all_zones = route53_backend.get_all_hosted_zones()
-        template = Template(LIST_HOSTED_ZONES_RESPONSE)
+        all_zones = route53_backends['global'].get_all_hosted_zones()
+        template = template_registry.get_template(LIST_HOSTED_ZONES_RESPONSE)
         return 200, headers, template.render(zones=all_zones)
 
 
 def get_or_delete_hostzone_response(request, full_url, headers):
     parsed_url = urlparse(full_url)
     zoneid = parsed_url.path.rstrip('/').rsplit('/', 1)[1]
-    the_zone = route53_backend.get_hosted_zone(zoneid)
+    the_zone = route53_backends['global'].get_hosted_zone(zoneid)
     if not the_zone:
         return 404, headers, "Zone %s not Found" % zoneid
 
     if request.method == "GET":
-        template = Template(GET_HOSTED_ZONE_RESPONSE)
+        template = template_registry.get_template(GET_HOSTED_ZONE_RESPONSE)
         return 200, headers, template.render(zone=the_zone)
     elif request.method == "DELETE":
-        route53_backend.delete_hosted_zone(zoneid)
+        route53_backends['global'].delete_hosted_zone(zoneid)
         return 200, headers, DELETE_HOSTED_ZONE_RESPONSE
 
 
@@ -40,7 +40,7 @@ def rrset_response(request, full_url, headers):
     method = request.method
 
     zoneid = parsed_url.path.rstrip('/').rsplit('/', 2)[1]
-    the_zone = route53_backend.get_hosted_zone(zoneid)
+    the_zone = route53_backends['global'].get_hosted_zone(zoneid)
     if not the_zone:
         return 404, headers, "Zone %s Not Found" % zoneid
 
@@ -75,7 +75,7 @@ def rrset_response(request, full_url, headers):
 
     elif method == "GET":
         querystring = parse_qs(parsed_url.query)
-        template = Template(LIST_RRSET_REPONSE)
+        template = template_registry.get_template(LIST_RRSET_REPONSE)
         type_filter = querystring.get("type", [None])[0]
         name_filter = querystring.get("name", [None])[0]
         record_sets = the_zone.get_record_sets(type_filter, name_filter)
@@ -98,16 +98,16 @@ def health_check_response(request, full_url, headers):
             "request_interval": properties.get('RequestInterval'),
             "failure_threshold": properties.get('FailureThreshold'),
         }
-        health_check = route53_backend.create_health_check(health_check_args)
-        template = Template(CREATE_HEALTH_CHECK_RESPONSE)
+        health_check = route53_backends['global'].create_health_check(health_check_args)
+        template = template_registry.get_template(CREATE_HEALTH_CHECK_RESPONSE)
         return 201, headers, template.render(health_check=health_check)
     elif method == "DELETE":
         health_check_id = parsed_url.path.split("/")[-1]
-        route53_backend.delete_health_check(health_check_id)
+        route53_backends['global'].delete_health_check(health_check_id)
         return 200, headers, DELETE_HEALTH_CHECK_REPONSE
     elif method == "GET":
-        template = Template(LIST_HEALTH_CHECKS_REPONSE)
-        health_checks = route53_backend.get_health_checks()
+        template = template_registry.get_template(LIST_HEALTH_CHECKS_REPONSE)
+        health_checks = route53_backends['global'].get_health_checks()
         return 200, headers, template.render(health_checks=health_checks)
 
 
@@ -1,3 +1,10 @@
 from __future__ import unicode_literals
-from .models import s3_backend
-mock_s3 = s3_backend.decorator
+from .models import s3_backend, s3_backends  # flake8: noqa
+from ..core.models import MockAWS
+
+
+def mock_s3(func=None):
+    if func:
+        return MockAWS(s3_backends)(func)
+    else:
+        return MockAWS(s3_backends)
@@ -0,0 +1,392 @@
+from __future__ import unicode_literals
+import atexit
+import hashlib
+from bisect import bisect_right
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+
+import six
+
+from moto.core.utils import ContentFile, Immutable, ResponseStream, link_or_copy
+
+# Objects of at least this many bytes are written to disk instead of memory
+SPILL_THRESHOLD_ENV_VAR = 'MOTO_S3_SPILL_THRESHOLD'
+# The most bytes of object bodies to keep in memory, in total
+MEMORY_BUDGET_ENV_VAR = 'MOTO_S3_MEMORY_BUDGET'
+# Directory to write the objects to, instead of a temporary directory
+BLOB_DIR_ENV_VAR = 'MOTO_S3_BLOB_DIR'
+
+DEFAULT_SPILL_THRESHOLD = 8 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+
+def _to_bytes(data):
+    if isinstance(data, six.text_type):
+        return data.encode('utf-8')
+    if isinstance(data, bytearray):
+        return bytes(data)
+    return data
+
+
+def _load_blob(data):
+    return blob_store.put(data)
+
+
+def _open_file_blob(content_file, size, md5):
+    return blob_store.open_file(content_file.path, size, md5)
+
+
+class Blob(Immutable):
+    """
+    The body of an S3 object
+    """
+
+    def __reduce__(self):
+        # Whichever store the blob came from, it is loaded back into the
+        # current one
+        return (_load_blob, (self.read(),))
+
+    def __len__(self):
+        return self.size
+
+    def read(self):
+        return self.read_range(0, self.size)
+
+    def iter_chunks(self, start=0, stop=None, chunk_size=CHUNK_SIZE):
+        stop = self.size if stop is None else min(stop, self.size)
+        for offset in range(start, stop, chunk_size):
+            yield self.read_range(offset, min(offset + chunk_size, stop))
+
+
+class MemoryBlob(Blob):
+
+    def __init__(self, data, store=None):
+        self.data = data
+        self.size = len(data)
+        self.store = store
+        self._md5 = None
+
+    def __del__(self):
+        if self.store is not None:
+            self.store.release_memory(self.size)
+
+    @property
+    def md5(self):
+        if self._md5 is None:
+            self._md5 = hashlib.md5(self.data).hexdigest()
+        return self._md5
+
+    def read(self):
+        return self.data
+
+    def read_range(self, start, stop):
+        if start == 0 and stop >= self.size:
+            return self.data
+        return self.data[start:stop]
+
+    def iter_chunks(self, start=0, stop=None, chunk_size=CHUNK_SIZE):
+        stop = self.size if stop is None else min(stop, self.size)
+        # WSGI servers only write bytes, so each chunk is a copy rather than
+        # a memoryview
+        for offset in range(start, stop, chunk_size):
+            yield self.data[offset:min(offset + chunk_size, stop)]
+
+
+class FileBlob(Blob):
+    """
+    A blob in a file of the store, which is read through a memory map
+    """
+
+    def __init__(self, path, size, md5, store):
+        self.path = path
+        self.size = size
+        self.md5 = md5
+        self.store = store
+
+    def __del__(self):
+        self.store.release_file(self.path)
+
+    def __reduce__(self):
+        # By path, so the body is neither read nor copied
+        return (_open_file_blob, (ContentFile(self.path), self.size, self.md5))
+
+    def _map(self):
+        with open(self.path, 'rb') as blob_file:
+            return mmap.mmap(blob_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def read_range(self, start, stop):
+        mapped = self._map()
+        try:
+            return mapped[start:stop]
+        finally:
+            mapped.close()
+
+    def iter_chunks(self, start=0, stop=None, chunk_size=CHUNK_SIZE):
+        stop = self.size if stop is None else min(stop, self.size)
+        mapped = self._map()
+        try:
+            for offset in range(start, stop, chunk_size):
+                yield mapped[offset:min(offset + chunk_size, stop)]
+        finally:
+            mapped.close()
+
+
+class SegmentedBlob(Blob):
+    """
+    A blob made of other blobs one after the other, such as the parts of a
+    completed multipart upload, which are read where they are
+    """
+
+    def __init__(self, segments):
+        self.segments = list(segments)
+        # The offset of each segment in the blob
+        self.offsets = []
+        size = 0
+        for segment in self.segments:
+            self.offsets.append(size)
+            size += segment.size
+        self.size = size
+        self._md5 = None
+
+    def __reduce__(self):
+        return (SegmentedBlob, (self.segments,))
+
+    @property
+    def md5(self):
+        if self._md5 is None:
+            md5 = hashlib.md5()
+            for chunk in self.iter_chunks():
+                md5.update(chunk)
+            self._md5 = md5.hexdigest()
+        return self._md5
+
+    def _spans(self, start, stop):
+        index = max(bisect_right(self.offsets, start) - 1, 0)
+        while index < len(self.segments) and self.offsets[index] < stop:
+            offset = self.offsets[index]
+            segment = self.segments[index]
+            yield segment, max(start - offset, 0), min(stop - offset, segment.size)
+            index += 1
+
+    def read_range(self, start, stop):
+        return b''.join(
+            segment.read_range(segment_start, segment_stop)
+            for segment, segment_start, segment_stop in self._spans(start, stop))
+
+    def iter_chunks(self, start=0, stop=None, chunk_size=CHUNK_SIZE):
+        stop = self.size if stop is None else min(stop, self.size)
+        for segment, segment_start, segment_stop in self._spans(start, stop):
+            for chunk in segment.iter_chunks(segment_start, segment_stop, chunk_size):
+                yield chunk
+
+
+class BlobStream(ResponseStream):
+    """
+    A response body made of ranges of blobs and literal bytes, which is sent
+    a chunk at a time. Each chunk, of at most CHUNK_SIZE bytes, is copied
+    once out of its blob, from memory or from a memory map, so sending a body
+    never holds more than one chunk of it besides the blob itself.
+    """
+    renders = False
+
+    def __init__(self, segments):
+        # Each segment is either bytes or a (blob, start, stop) range
+        self.segments = segments
+
+    @classmethod
+    def of(cls, blob, start=0, stop=None):
+        stop = blob.size if stop is None else min(stop, blob.size)
+        return cls([(blob, start, stop)])
+
+    def __len__(self):
+        return sum(
+            len(segment) if isinstance(segment, six.binary_type) else segment[2] - segment[1]
+            for segment in self.segments)
+
+    def iter_chunks(self):
+        for segment in self.segments:
+            if isinstance(segment, six.binary_type):
+                yield segment
+            else:
+                blob, start, stop = segment
+                for chunk in blob.iter_chunks(start, stop):
+                    yield chunk
+
+    def join_chunks(self):
+        parts = []
+        for segment in self.segments:
+            if isinstance(segment, six.binary_type):
+                parts.append(segment)
+            else:
+                blob, start, stop = segment
+                parts.append(blob.read_range(start, stop))
+        if len(parts) == 1:
+            return parts[0]
+        return b''.join(parts)
+
+    def slice(self, start, stop):
+        """
+        The bytes from start up to stop of this body, without copying them
+        """
+        segments = []
+        offset = 0
+        for segment in self.segments:
+            if isinstance(segment, six.binary_type):
+                blob, segment_start, segment_stop = segment, 0, len(segment)
+            else:
+                blob, segment_start, segment_stop = segment
+            length = segment_stop - segment_start
+            begin = max(start - offset, 0)
+            end = min(stop - offset, length)
+            if begin < end:
+                if isinstance(blob, six.binary_type):
+                    segments.append(blob[begin:end])
+                else:
+                    segments.append((blob, segment_start + begin, segment_start + end))
+            offset += length
+        return BlobStream(segments)
+
+
+class BlobStore(object):
+    """
+    Stores the bodies of S3 objects. Bodies smaller than the spill threshold
+    are kept in memory while the memory budget allows, and the others are
+    written to files named after the SHA-256 of their contents, so identical
+    bodies share one file. A file is removed when the last blob using it is.
+
+    Without a directory, the files go to a temporary directory which is
+    removed on exit.
+    """
+
+    def __init__(self, spill_threshold=DEFAULT_SPILL_THRESHOLD, memory_budget=None, directory=None):
+        self.lock = threading.RLock()
+        self.memory_used = 0
+        self.file_refs = {}
+        self._directory = None
+        self.configure(spill_threshold, memory_budget, directory)
+
+    @classmethod
+    def from_environment(cls, environ=os.environ):
+        def size_setting(name, default):
+            value = environ.get(name)
+            return int(value) if value else default
+        return cls(
+            spill_threshold=size_setting(SPILL_THRESHOLD_ENV_VAR, DEFAULT_SPILL_THRESHOLD),
+            memory_budget=size_setting(MEMORY_BUDGET_ENV_VAR, None),
+            directory=environ.get(BLOB_DIR_ENV_VAR) or None)
+
+    def configure(self, spill_threshold=DEFAULT_SPILL_THRESHOLD, memory_budget=None, directory=None):
+        """
+        Changes where new blobs are stored. A spill threshold of None keeps
+        everything in memory, and a memory budget of None doesn't limit it.
+        """
+        with self.lock:
+            self.spill_threshold = spill_threshold
+            self.memory_budget = memory_budget
+            if directory is not None:
+                self._directory = directory
+
+    @property
+    def directory(self):
+        with self.lock:
+            if self._directory is None:
+                self._directory = tempfile.mkdtemp(prefix='moto-s3-')
+                atexit.register(shutil.rmtree, self._directory, True)
+            elif not os.path.isdir(self._directory):
+                os.makedirs(self._directory)
+            return self._directory
+
+    def reserve_memory(self, size):
+        """
+        Checks that a body of the given size is kept in memory and, if it
+        is, counts it against the memory budget in the same step
+        """
+        with self.lock:
+            if not size:
+                return True
+            if self.spill_threshold is not None and size >= self.spill_threshold:
+                return False
+            if self.memory_budget is not None and self.memory_used + size > self.memory_budget:
+                return False
+            self.memory_used += size
+            return True
+
+    def put(self, data):
+        data = _to_bytes(data)
+        if self.reserve_memory(len(data)):
+            return MemoryBlob(data, self)
+        return self._put_file([data], len(data))
+
+    def put_chunks(self, chunks, size):
+        """
+        Stores a body of the given size from an iterable of its chunks,
+        without joining them in memory when it is spilled to disk
+        """
+        if not self.reserve_memory(size):
+            return self._put_file(chunks, size)
+        try:
+            data = b''.join(_to_bytes(chunk) for chunk in chunks)
+        except Exception:
+            self.release_memory(size)
+            raise
+        self.release_memory(size - len(data))
+        return MemoryBlob(data, self)
+
+    def _put_file(self, chunks, size):
+        md5 = hashlib.md5()
+        sha256 = hashlib.sha256()
+        descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as blob_file:
+                for chunk in chunks:
+                    chunk = _to_bytes(chunk)
+                    md5.update(chunk)
+                    sha256.update(chunk)
+                    blob_file.write(chunk)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+        path = os.path.join(self.directory, sha256.hexdigest())
+        with self.lock:
+            if path in self.file_refs or os.path.exists(path):
+                os.remove(temp_path)
+            else:
+                os.rename(temp_path, path)
+            self.file_refs[path] = self.file_refs.get(path, 0) + 1
+        return FileBlob(path, size, md5.hexdigest(), self)
+
+    def open_file(self, path, size, md5):
+        """
+        A blob of a file named after the SHA-256 of its contents, such as
+        one of a pickled FileBlob. A file outside the directory of the store
+        is linked or copied into it.
+        """
+        store_path = os.path.join(self.directory, os.path.basename(path))
+        with self.lock:
+            if store_path not in self.file_refs and not os.path.exists(store_path):
+                link_or_copy(path, store_path)
+            self.file_refs[store_path] = self.file_refs.get(store_path, 0) + 1
+        return FileBlob(store_path, size, md5, self)
+
+    def release_memory(self, size):
+        with self.lock:
+            self.memory_used -= size
+
+    def release_file(self, path):
+        with self.lock:
+            refs = self.file_refs.get(path, 0) - 1
+            if refs > 0:
+                self.file_refs[path] = refs
+                return
+            self.file_refs.pop(path, None)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+blob_store = BlobStore.from_environment()
@@ -71,3 +71,23 @@ class EntityTooSmall(S3ClientError):
             "EntityTooSmall",
             "Your proposed upload is smaller than the minimum allowed object size.",
             *args, **kwargs)
+
+
+class InvalidMaxKeys(S3ClientError):
+    code = 400
+
+    def __init__(self, *args, **kwargs):
+        super(InvalidMaxKeys, self).__init__(
+            "InvalidArgument",
+            "Provided max-keys not an integer or within integer range",
+            *args, **kwargs)
+
+
+class InvalidContinuationToken(S3ClientError):
+    code = 400
+
+    def __init__(self, *args, **kwargs):
+        super(InvalidContinuationToken, self).__init__(
+            "InvalidArgument",
+            "The continuation token provided is incorrect",
+            *args, **kwargs)
@@ -6,11 +6,11 @@ import hashlib
 import copy
 import itertools
 import codecs
-import six
 
 from bisect import insort
-from moto.core import BaseBackend
-from moto.core.utils import iso_8601_datetime_with_milliseconds, rfc_1123_datetime
+from moto.core import BaseBackend, GlobalBackends
+from moto.core.utils import iso_8601_datetime_with_milliseconds, rfc_1123_datetime, ResourceLock, TrackedDict
+from .blobs import Blob, SegmentedBlob, blob_store
 from .exceptions import BucketAlreadyExists, MissingBucket, InvalidPart, EntityTooSmall
 from .utils import clean_key_name, _VersionedKeyStore
 
@@ -33,9 +33,13 @@ class FakeKey(object):
         self._is_versioned = is_versioned
 
     def copy(self, new_name=None):
-        r = copy.deepcopy(self)
+        # Bodies are immutable, so the copy shares the body and its ETag and
+        # only gets its own metadata and ACL
+        r = copy.copy(self)
         if new_name is not None:
             r.name = new_name
+        r._metadata = dict(self._metadata)
+        r.acl = copy.deepcopy(self.acl)
         return r
 
     def set_metadata(self, metadata, replace=False):
@@ -49,8 +53,26 @@ class FakeKey(object):
     def set_acl(self, acl):
         self.acl = acl
 
+    @property
+    def value(self):
+        return self._blob.read()
+
+    @value.setter
+    def value(self, value):
+        if isinstance(value, Blob):
+            self._blob = value
+        else:
+            self._blob = blob_store.put(value)
+
+    @property
+    def blob(self):
+        return self._blob
+
     def append_to_value(self, value):
-        self.value += value
+        value = blob_store.put(value)
+        self.value = blob_store.put_chunks(
+            itertools.chain(self._blob.iter_chunks(), value.iter_chunks()),
+            self._blob.size + value.size)
         self.last_modified = datetime.datetime.utcnow()
         self._etag = None  # must recalculate etag
         if self._is_versioned:
@@ -64,13 +86,7 @@ class FakeKey(object):
     @property
     def etag(self):
         if self._etag is None:
-            value_md5 = hashlib.md5()
-            if isinstance(self.value, six.text_type):
-                value = self.value.encode("utf-8")
-            else:
-                value = self.value
-            value_md5.update(value)
-            self._etag = value_md5.hexdigest()
+            self._etag = self._blob.md5
         return '"{0}"'.format(self._etag)
 
     @property
@@ -106,7 +122,7 @@ class FakeKey(object):
 
     @property
     def size(self):
-        return len(self.value)
+        return self._blob.size
 
     @property
     def storage_class(self):
@@ -129,7 +145,7 @@ class FakeMultipart(object):
 
     def complete(self, body):
         decode_hex = codecs.getdecoder("hex_codec")
-        total = bytearray()
+        segments = []
         md5s = bytearray()
 
         last = None
@@ -138,17 +154,18 @@ class FakeMultipart(object):
             part = self.parts.get(pn)
             if part is None or part.etag != etag:
                 raise InvalidPart()
-            if last is not None and len(last.value) < UPLOAD_PART_MIN_SIZE:
+            if last is not None and last.size < UPLOAD_PART_MIN_SIZE:
                 raise EntityTooSmall()
             part_etag = part.etag.replace('"', '')
             md5s.extend(decode_hex(part_etag)[0])
-            total.extend(part.value)
+            # The parts become the object as they are, without being copied
+            segments.append(part.blob)
             last = part
             count += 1
 
         etag = hashlib.md5()
         etag.update(bytes(md5s))
-        return total, "{0}-{1}".format(etag.hexdigest(), count)
+        return SegmentedBlob(segments), "{0}-{1}".format(etag.hexdigest(), count)
 
     def set_part(self, part_id, value):
         if part_id < 1:
@@ -246,6 +263,7 @@ class FakeBucket(object):
         self.policy = None
         self.website_configuration = None
         self.acl = get_canned_acl('private')
+        self.lock = ResourceLock()
 
     @property
     def location(self):
@@ -292,7 +310,8 @@ class FakeBucket(object):
 class S3Backend(BaseBackend):
 
     def __init__(self):
-        self.buckets = {}
+        # Every change to a bucket or its keys is made holding its lock
+        self.buckets = TrackedDict()
 
     def create_bucket(self, bucket_name, region_name):
         if bucket_name in self.buckets:
@@ -319,7 +338,9 @@ class S3Backend(BaseBackend):
             return self.buckets.pop(bucket_name)
 
     def set_bucket_versioning(self, bucket_name, status):
-        self.get_bucket(bucket_name).versioning_status = status
+        bucket = self.get_bucket(bucket_name)
+        with bucket.lock:
+            bucket.versioning_status = status
 
     def get_bucket_versioning(self, bucket_name):
         return self.get_bucket(bucket_name).versioning_status
@@ -341,19 +362,29 @@ class S3Backend(BaseBackend):
         return self.get_bucket(bucket_name).policy
 
     def set_bucket_policy(self, bucket_name, policy):
-        self.get_bucket(bucket_name).policy = policy
+        bucket = self.get_bucket(bucket_name)
+        with bucket.lock:
+            bucket.policy = policy
 
     def delete_bucket_policy(self, bucket_name, body):
         bucket = self.get_bucket(bucket_name)
-        bucket.policy = None
+        with bucket.lock:
+            bucket.policy = None
 
     def set_bucket_lifecycle(self, bucket_name, rules):
         bucket = self.get_bucket(bucket_name)
-        bucket.set_lifecycle(rules)
+        with bucket.lock:
+            bucket.set_lifecycle(rules)
+
+    def delete_bucket_lifecycle(self, bucket_name):
+        bucket = self.get_bucket(bucket_name)
+        with bucket.lock:
+            bucket.delete_lifecycle()
 
     def set_bucket_website_configuration(self, bucket_name, website_configuration):
         bucket = self.get_bucket(bucket_name)
-        bucket.set_website_configuration(website_configuration)
+        with bucket.lock:
+            bucket.set_website_configuration(website_configuration)
 
     def get_bucket_website_configuration(self, bucket_name):
         bucket = self.get_bucket(bucket_name)
@@ -364,28 +395,31 @@ class S3Backend(BaseBackend):
 
         bucket = self.get_bucket(bucket_name)
 
-        old_key = bucket.keys.get(key_name, None)
-        if old_key is not None and bucket.is_versioned:
-            new_version_id = old_key._version_id + 1
-        else:
-            new_version_id = 0
+        with bucket.lock:
+            old_key = bucket.keys.get(key_name, None)
+            if old_key is not None and bucket.is_versioned:
+                new_version_id = old_key._version_id + 1
+            else:
+                new_version_id = 0
 
-        new_key = FakeKey(
-            name=key_name,
-            value=value,
-            storage=storage,
-            etag=etag,
-            is_versioned=bucket.is_versioned,
-            version_id=new_version_id)
-        bucket.keys[key_name] = new_key
+            new_key = FakeKey(
+                name=key_name,
+                value=value,
+                storage=storage,
+                etag=etag,
+                is_versioned=bucket.is_versioned,
+                version_id=new_version_id)
+            bucket.keys[key_name] = new_key
 
         return new_key
 
     def append_to_key(self, bucket_name, key_name, value):
         key_name = clean_key_name(key_name)
 
-        key = self.get_key(bucket_name, key_name)
-        key.append_to_value(value)
+        bucket = self.get_bucket(bucket_name)
+        with bucket.lock:
+            key = bucket.keys.get(key_name)
+            key.append_to_value(value)
         return key
 
     def get_key(self, bucket_name, key_name, version_id=None):
@@ -402,17 +436,19 @@ class S3Backend(BaseBackend):
     def initiate_multipart(self, bucket_name, key_name, metadata):
         bucket = self.get_bucket(bucket_name)
         new_multipart = FakeMultipart(key_name, metadata)
-        bucket.multiparts[new_multipart.id] = new_multipart
+        with bucket.lock:
+            bucket.multiparts[new_multipart.id] = new_multipart
 
         return new_multipart
 
     def complete_multipart(self, bucket_name, multipart_id, body):
         bucket = self.get_bucket(bucket_name)
-        multipart = bucket.multiparts[multipart_id]
-        value, etag = multipart.complete(body)
-        if value is None:
-            return
-        del bucket.multiparts[multipart_id]
+        with bucket.lock:
+            multipart = bucket.multiparts[multipart_id]
+            value, etag = multipart.complete(body)
+            if value is None:
+                return
+            del bucket.multiparts[multipart_id]
 
         key = self.set_key(bucket_name, multipart.key_name, value, etag=etag)
         key.set_metadata(multipart.metadata)
@@ -420,7 +456,8 @@ class S3Backend(BaseBackend):
 
     def cancel_multipart(self, bucket_name, multipart_id):
         bucket = self.get_bucket(bucket_name)
-        del bucket.multiparts[multipart_id]
+        with bucket.lock:
+            del bucket.multiparts[multipart_id]
 
     def list_multipart(self, bucket_name, multipart_id):
         bucket = self.get_bucket(bucket_name)
@@ -433,7 +470,8 @@ class S3Backend(BaseBackend):
     def set_part(self, bucket_name, multipart_id, part_id, value):
         bucket = self.get_bucket(bucket_name)
         multipart = bucket.multiparts[multipart_id]
-        return multipart.set_part(part_id, value)
+        with bucket.lock:
+            return multipart.set_part(part_id, value)
 
     def copy_part(self, dest_bucket_name, multipart_id, part_id,
                   src_bucket_name, src_key_name):
@@ -441,60 +479,61 @@ class S3Backend(BaseBackend):
         src_bucket = self.get_bucket(src_bucket_name)
         dest_bucket = self.get_bucket(dest_bucket_name)
         multipart = dest_bucket.multiparts[multipart_id]
-        return multipart.set_part(part_id, src_bucket.keys[src_key_name].value)
+        # The part shares the body of the source, along with its MD5
+        with dest_bucket.lock:
+            return multipart.set_part(part_id, src_bucket.keys[src_key_name].blob)
+
+    def list_objects(self, bucket, prefix, delimiter, marker=None, max_keys=None):
+        """
+        Returns the keys and common prefixes of one page of a bucket listing,
+        whether there are more pages, and the marker of the next one
+        """
+        with bucket.lock:
+            return bucket.keys.list_keys(
+                prefix=prefix, delimiter=delimiter, marker=marker, max_keys=max_keys)
 
     def prefix_query(self, bucket, prefix, delimiter):
-        key_results = set()
-        folder_results = set()
-        if prefix:
-            for key_name, key in bucket.keys.items():
-                if key_name.startswith(prefix):
-                    key_without_prefix = key_name.replace(prefix, "", 1)
-                    if delimiter and delimiter in key_without_prefix:
-                        # If delimiter, we need to split out folder_results
-                        key_without_delimiter = key_without_prefix.split(delimiter)[0]
-                        folder_results.add("{0}{1}{2}".format(prefix, key_without_delimiter, delimiter))
-                    else:
-                        key_results.add(key)
-        else:
-            for key_name, key in bucket.keys.items():
-                if delimiter and delimiter in key_name:
-                    # If delimiter, we need to split out folder_results
-                    folder_results.add(key_name.split(delimiter)[0] + delimiter)
-                else:
-                    key_results.add(key)
-
-        key_results = sorted(key_results, key=lambda key: key.name)
-        folder_results = [folder_name for folder_name in sorted(folder_results, key=lambda key: key)]
-
+        key_results, folder_results, _, _ = self.list_objects(bucket, prefix, delimiter)
         return key_results, folder_results
 
     def delete_key(self, bucket_name, key_name):
         key_name = clean_key_name(key_name)
         bucket = self.get_bucket(bucket_name)
-        return bucket.keys.pop(key_name)
+        with bucket.lock:
+            return bucket.keys.pop(key_name)
 
     def copy_key(self, src_bucket_name, src_key_name, dest_bucket_name, dest_key_name, storage=None, acl=None):
         src_key_name = clean_key_name(src_key_name)
         dest_key_name = clean_key_name(dest_key_name)
         src_bucket = self.get_bucket(src_bucket_name)
         dest_bucket = self.get_bucket(dest_bucket_name)
-        key = src_bucket.keys[src_key_name]
-        if dest_key_name != src_key_name:
-            key = key.copy(dest_key_name)
-        dest_bucket.keys[dest_key_name] = key
-        if storage is not None:
-            key.set_storage_class(storage)
-        if acl is not None:
-            key.set_acl(acl)
+        key = src_bucket.keys[src_key_name].copy(dest_key_name)
+        with dest_bucket.lock:
+            dest_bucket.keys[dest_key_name] = key
+            if storage is not None:
+                key.set_storage_class(storage)
+            if acl is not None:
+                key.set_acl(acl)
+
+    def set_key_acl(self, bucket_name, key_name, acl):
+        bucket = self.get_bucket(bucket_name)
+        with bucket.lock:
+            bucket.keys[clean_key_name(key_name)].set_acl(acl)
+
+    def restore_key(self, bucket_name, key_name, days):
+        bucket = self.get_bucket(bucket_name)
+        with bucket.lock:
+            bucket.keys[clean_key_name(key_name)].restore(days)
 
     def set_bucket_acl(self, bucket_name, acl):
         bucket = self.get_bucket(bucket_name)
-        bucket.set_acl(acl)
+        with bucket.lock:
+            bucket.set_acl(acl)
 
     def get_bucket_acl(self, bucket_name):
         bucket = self.get_bucket(bucket_name)
         return bucket.acl
 
 
-s3_backend = S3Backend()
+s3_backends = GlobalBackends(S3Backend)
+s3_backend = s3_backends['global']
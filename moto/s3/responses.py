@@ -1,20 +1,86 @@
 from __future__ import unicode_literals
 
+import base64
+import binascii
 import re
+import uuid
 
 import six
 from six.moves.urllib.parse import parse_qs, urlparse
 import xmltodict
 
+from moto.core.metrics import action_metrics
+from moto.core.profiling import action_profiler
 from moto.core.responses import _TemplateEnvironmentMixin
+from moto.core.utils import ResponseStream
 
-from .exceptions import BucketAlreadyExists, S3ClientError, InvalidPartOrder
-from .models import s3_backend, get_canned_acl, FakeGrantee, FakeGrant, FakeAcl
+from .blobs import BlobStream
+from .exceptions import (
+    BucketAlreadyExists, S3ClientError, InvalidContinuationToken, InvalidMaxKeys, InvalidPartOrder)
+from .models import s3_backends, get_canned_acl, FakeGrantee, FakeGrant, FakeAcl
 from .utils import bucket_name_from_url, metadata_from_headers
 from xml.dom import minidom
 
 REGION_URL_REGEX = r'\.s3-(.+?)\.amazonaws\.com'
 DEFAULT_REGION_NAME = 'us-east-1'
+DEFAULT_MAX_KEYS = 1000
+# A byte range or suffix byte range of a Range header
+BYTE_RANGE_REGEX = re.compile(r'^\s*(\d*)-(\d*)\s*$')
+# The S3 action of a request by method and subresource, for the metrics and
+# profiles, in the order the handlers check the subresources
+BUCKET_SUBRESOURCE_ACTIONS = {
+    'GET': [
+        ('uploads', 'ListMultipartUploads'),
+        ('location', 'GetBucketLocation'),
+        ('lifecycle', 'GetBucketLifecycle'),
+        ('versioning', 'GetBucketVersioning'),
+        ('policy', 'GetBucketPolicy'),
+        ('website', 'GetBucketWebsite'),
+        ('acl', 'GetBucketAcl'),
+        ('versions', 'ListObjectVersions'),
+    ],
+    'PUT': [
+        ('versioning', 'PutBucketVersioning'),
+        ('lifecycle', 'PutBucketLifecycle'),
+        ('policy', 'PutBucketPolicy'),
+        ('acl', 'PutBucketAcl'),
+        ('website', 'PutBucketWebsite'),
+    ],
+    'DELETE': [
+        ('policy', 'DeleteBucketPolicy'),
+        ('lifecycle', 'DeleteBucketLifecycle'),
+    ],
+}
+BUCKET_ACTIONS = {
+    'HEAD': 'HeadBucket',
+    'GET': 'ListObjects',
+    'PUT': 'CreateBucket',
+    'DELETE': 'DeleteBucket',
+    'POST': 'PostObject',
+}
+KEY_SUBRESOURCE_ACTIONS = {
+    'GET': [
+        ('uploadId', 'ListParts'),
+        ('acl', 'GetObjectAcl'),
+    ],
+    'PUT': [
+        ('acl', 'PutObjectAcl'),
+    ],
+    'DELETE': [
+        ('uploadId', 'AbortMultipartUpload'),
+    ],
+    'POST': [
+        ('uploads', 'CreateMultipartUpload'),
+        ('uploadId', 'CompleteMultipartUpload'),
+        ('restore', 'RestoreObject'),
+    ],
+}
+KEY_ACTIONS = {
+    'HEAD': 'HeadObject',
+    'GET': 'GetObject',
+    'PUT': 'PutObject',
+    'DELETE': 'DeleteObject',
+}
 
 
 def parse_key_name(pth):
@@ -22,15 +88,19 @@ def parse_key_name(pth):
 
 
 class ResponseObject(_TemplateEnvironmentMixin):
-    def __init__(self, backend, bucket_name_from_url, parse_key_name,
+    def __init__(self, backends, bucket_name_from_url, parse_key_name,
                  is_delete_keys=None):
         super(ResponseObject, self).__init__()
-        self.backend = backend
+        self.backends = backends
         self.bucket_name_from_url = bucket_name_from_url
         self.parse_key_name = parse_key_name
         if is_delete_keys:
             self.is_delete_keys = is_delete_keys
 
+    @property
+    def backend(self):
+        return self.backends['global']
+
     @staticmethod
     def is_delete_keys(path, bucket_name):
         return path == u'/?delete'
@@ -41,17 +111,41 @@ class ResponseObject(_TemplateEnvironmentMixin):
         template = self.response_template(S3_ALL_BUCKETS)
         return template.render(buckets=all_buckets)
 
+    def _bucket_action(self, request, full_url):
+        """
+        The name of the S3 action of a request to a bucket
+        """
+        method = request.method
+        bucket_name = self.bucket_name_from_url(full_url)
+        if not bucket_name:
+            return 'ListBuckets'
+        querystring = parse_qs(urlparse(full_url).query, keep_blank_values=True)
+        for subresource, action in BUCKET_SUBRESOURCE_ACTIONS.get(method, []):
+            if subresource in querystring:
+                return action
+        if method == 'GET' and querystring.get('list-type', [None])[0] == '2':
+            return 'ListObjectsV2'
+        if method == 'POST' and self.is_delete_keys(request.path, bucket_name):
+            return 'DeleteObjects'
+        return BUCKET_ACTIONS.get(method, method)
+
     def bucket_response(self, request, full_url, headers):
-        try:
-            response = self._bucket_response(request, full_url, headers)
-        except S3ClientError as s3error:
-            response = s3error.code, headers, s3error.description
+        action = self._bucket_action(request, full_url)
+        with action_metrics.timer(('s3', action)) as timer:
+            try:
+                response = action_profiler.call('s3', action, self._bucket_response, request, full_url, headers)
+            except S3ClientError as s3error:
+                response = s3error.code, headers, s3error.description
 
-        if isinstance(response, six.string_types):
-            return 200, headers, response.encode("utf-8")
-        else:
-            status_code, headers, response_content = response
-            return status_code, headers, response_content.encode("utf-8")
+            if isinstance(response, six.string_types):
+                return 200, headers, response.encode("utf-8")
+            else:
+                status_code, headers, response_content = response
+                timer.status = status_code
+                if isinstance(response_content, ResponseStream):
+                    timer.until_rendered(response_content)
+                    return status_code, headers, response_content
+                return status_code, headers, response_content.encode("utf-8")
 
     def _bucket_response(self, request, full_url, headers):
         parsed_url = urlparse(full_url)
@@ -162,16 +256,69 @@ class ResponseObject(_TemplateEnvironmentMixin):
         bucket = self.backend.get_bucket(bucket_name)
         prefix = querystring.get('prefix', [None])[0]
         delimiter = querystring.get('delimiter', [None])[0]
-        result_keys, result_folders = self.backend.prefix_query(bucket, prefix, delimiter)
-        template = self.response_template(S3_BUCKET_GET_RESPONSE)
-        return 200, headers, template.render(
+        max_keys = self._get_max_keys(querystring)
+        if querystring.get('list-type', [None])[0] == '2':
+            return self._bucket_response_list_v2(bucket, querystring, prefix, delimiter, max_keys, headers)
+
+        marker = querystring.get('marker', [None])[0]
+        result_keys, result_folders, is_truncated, next_marker = self.backend.list_objects(
+            bucket, prefix, delimiter, marker=marker, max_keys=max_keys)
+        return 200, headers, self.response_stream(
+            S3_BUCKET_GET_RESPONSE,
+            bucket=bucket,
+            prefix=prefix,
+            delimiter=delimiter,
+            marker=marker,
+            max_keys=max_keys,
+            is_truncated=is_truncated,
+            next_marker=next_marker,
+            result_keys=result_keys,
+            result_folders=result_folders
+        )
+
+    def _bucket_response_list_v2(self, bucket, querystring, prefix, delimiter, max_keys, headers):
+        continuation_token = querystring.get('continuation-token', [None])[0]
+        start_after = querystring.get('start-after', [None])[0]
+        fetch_owner = querystring.get('fetch-owner', [None])[0] == 'true'
+        if continuation_token:
+            try:
+                marker = base64.b64decode(continuation_token.encode('utf-8')).decode('utf-8')
+            except (binascii.Error, TypeError, ValueError):
+                # Not base64, or not of UTF-8
+                raise InvalidContinuationToken()
+        else:
+            marker = start_after
+
+        result_keys, result_folders, is_truncated, next_marker = self.backend.list_objects(
+            bucket, prefix, delimiter, marker=marker, max_keys=max_keys)
+        next_continuation_token = None
+        if is_truncated and next_marker is not None:
+            next_continuation_token = base64.b64encode(next_marker.encode('utf-8')).decode('utf-8')
+        return 200, headers, self.response_stream(
+            S3_BUCKET_GET_RESPONSE_V2,
             bucket=bucket,
             prefix=prefix,
             delimiter=delimiter,
+            continuation_token=continuation_token,
+            next_continuation_token=next_continuation_token,
+            start_after=start_after,
+            fetch_owner=fetch_owner,
+            max_keys=max_keys,
+            key_count=len(result_keys) + len(result_folders),
+            is_truncated=is_truncated,
             result_keys=result_keys,
             result_folders=result_folders
         )
 
+    def _get_max_keys(self, querystring):
+        try:
+            max_keys = int(querystring.get('max-keys', [DEFAULT_MAX_KEYS])[0])
+        except ValueError:
+            raise InvalidMaxKeys()
+        if max_keys < 0:
+            raise InvalidMaxKeys()
+        return max_keys
+
     def _bucket_response_put(self, request, body, region_name, bucket_name, querystring, headers):
         if 'versioning' in querystring:
             ver = re.search('<Status>([A-Za-z]+)</Status>', body)
@@ -216,8 +363,7 @@ class ResponseObject(_TemplateEnvironmentMixin):
             self.backend.delete_bucket_policy(bucket_name, body)
             return 204, headers, ""
         elif 'lifecycle' in querystring:
-            bucket = self.backend.get_bucket(bucket_name)
-            bucket.delete_lifecycle()
+            self.backend.delete_bucket_lifecycle(bucket_name)
             return 204, headers, ""
 
         removed_bucket = self.backend.delete_bucket(bucket_name)
@@ -278,42 +424,90 @@ class ResponseObject(_TemplateEnvironmentMixin):
         return 200, headers, template.render(deleted=deleted_names, delete_errors=error_names)
 
     def _handle_range_header(self, request, headers, response_content):
+        if not isinstance(response_content, BlobStream):
+            # Only object bodies are served in ranges
+            return 200, headers, response_content
         length = len(response_content)
         last = length - 1
-        _, rspec = request.headers.get('range').split('=')
-        if ',' in rspec:
-            raise NotImplementedError(
-                "Multiple range specifiers not supported")
+        unit, _, rspecs = request.headers.get('range').partition('=')
+        # Empty elements of the list are allowed, and ignored
+        matches = [BYTE_RANGE_REGEX.match(rspec) for rspec in rspecs.split(',') if rspec.strip()]
+        if unit.strip() != 'bytes' or not matches or not all(match and any(match.groups()) for match in matches):
+            # Like S3, ignore a Range header which can't be parsed
+            return 200, headers, response_content
         toint = lambda i: int(i) if i else None
-        begin, end = map(toint, rspec.split('-'))
-        if begin is not None:  # byte range
-            end = last if end is None else min(end, last)
-        elif end is not None:  # suffix byte range
-            begin = length - min(end, length)
-            end = last
-        else:
-            return 400, headers, ""
-        if begin < 0 or end > last or begin > min(end, last):
+        ranges = []
+        for match in matches:
+            begin, end = map(toint, match.groups())
+            if begin is not None:  # byte range
+                end = last if end is None else min(end, last)
+            else:  # suffix byte range
+                begin = length - min(end, length)
+                end = last
+            if begin < 0 or end > last or begin > min(end, last):
+                # Unsatisfiable ranges are left out, unless none are left
+                continue
+            ranges.append((begin, end))
+        if not ranges:
+            headers['content-range'] = "bytes */{0}".format(length)
             return 416, headers, ""
-        headers['content-range'] = "bytes {0}-{1}/{2}".format(
-            begin, end, length)
-        return 206, headers, response_content[begin:end + 1]
+
+        if len(ranges) == 1:
+            begin, end = ranges[0]
+            headers['content-range'] = "bytes {0}-{1}/{2}".format(
+                begin, end, length)
+            return 206, headers, response_content.slice(begin, end + 1)
+
+        # Several ranges are sent as the parts of a multipart/byteranges body
+        boundary = uuid.uuid4().hex
+        content_type = headers.pop('content-type', None) or 'binary/octet-stream'
+        segments = []
+        for begin, end in ranges:
+            part_header = "\r\n--{0}\r\nContent-Type: {1}\r\nContent-Range: bytes {2}-{3}/{4}\r\n\r\n".format(
+                boundary, content_type, begin, end, length)
+            segments.append(part_header.encode('utf-8'))
+            segments.extend(response_content.slice(begin, end + 1).segments)
+        segments.append("\r\n--{0}--\r\n".format(boundary).encode('utf-8'))
+        headers['content-type'] = 'multipart/byteranges; boundary={0}'.format(boundary)
+        return 206, headers, BlobStream(segments)
+
+    def _key_action(self, request, full_url):
+        """
+        The name of the S3 action of a request to a key
+        """
+        method = request.method
+        query = parse_qs(urlparse(full_url).query, keep_blank_values=True)
+        if method == 'PUT' and query.get('uploadId') and query.get('partNumber'):
+            return 'UploadPartCopy' if 'x-amz-copy-source' in request.headers else 'UploadPart'
+        for subresource, action in KEY_SUBRESOURCE_ACTIONS.get(method, []):
+            if subresource in query:
+                return action
+        if method == 'PUT' and 'x-amz-copy-source' in request.headers:
+            return 'CopyObject'
+        return KEY_ACTIONS.get(method, method)
 
     def key_response(self, request, full_url, headers):
-        try:
-            response = self._key_response(request, full_url, headers)
-        except S3ClientError as s3error:
-            response = s3error.code, headers, s3error.description
+        action = self._key_action(request, full_url)
+        with action_metrics.timer(('s3', action)) as timer:
+            try:
+                response = action_profiler.call('s3', action, self._key_response, request, full_url, headers)
+            except S3ClientError as s3error:
+                response = s3error.code, headers, s3error.description
 
-        if isinstance(response, six.string_types):
-            status_code = 200
-            response_content = response
-        else:
-            status_code, headers, response_content = response
+            if isinstance(response, six.string_types):
+                status_code = 200
+                response_content = response
+            else:
+                status_code, headers, response_content = response
+            timer.status = status_code
 
-        if status_code == 200 and 'range' in request.headers:
-            return self._handle_range_header(request, headers, response_content)
-        return status_code, headers, response_content
+            if request.method == 'GET':
+                if status_code == 200 and 'range' in request.headers:
+                    status_code, headers, response_content = self._handle_range_header(
+                        request, headers, response_content)
+                if isinstance(response_content, BlobStream):
+                    headers['content-length'] = str(len(response_content))
+            return status_code, headers, response_content
 
     def _key_response(self, request, full_url, headers):
         parsed_url = urlparse(full_url)
@@ -364,7 +558,7 @@ class ResponseObject(_TemplateEnvironmentMixin):
 
         if key:
             headers.update(key.metadata)
-            return 200, headers, key.value
+            return 200, headers, BlobStream.of(key.blob)
         else:
             return 404, headers, ""
 
@@ -391,9 +585,8 @@ class ResponseObject(_TemplateEnvironmentMixin):
         acl = self._acl_from_headers(request.headers)
 
         if 'acl' in query:
-            key = self.backend.get_key(bucket_name, key_name)
             # TODO: Support the XML-based ACL format
-            key.set_acl(acl)
+            self.backend.set_key_acl(bucket_name, key_name, acl)
             return 200, headers, ""
 
         if 'x-amz-copy-source' in request.headers:
@@ -434,7 +627,9 @@ class ResponseObject(_TemplateEnvironmentMixin):
         if key:
             headers.update(key.metadata)
             headers.update(key.response_dict)
-            return 200, headers, key.value
+            # The length of the body, which is not sent
+            headers['content-length'] = str(key.size)
+            return 200, headers, ""
         else:
             return 404, headers, ""
 
@@ -521,12 +716,12 @@ class ResponseObject(_TemplateEnvironmentMixin):
             r = 202
             if key.expiry_date is not None:
                 r = 200
-            key.restore(int(days))
+            self.backend.restore_key(bucket_name, key_name, int(days))
             return r, headers, ""
         else:
             raise NotImplementedError("Method POST had only been implemented for multipart uploads and restore operations, so far")
 
-S3ResponseInstance = ResponseObject(s3_backend, bucket_name_from_url, parse_key_name)
+S3ResponseInstance = ResponseObject(s3_backends, bucket_name_from_url, parse_key_name)
 
 S3_ALL_BUCKETS = """<ListAllMyBucketsResult xmlns="http://s3.amazonaws.com/doc/2006-03-01">
   <Owner>
@@ -547,9 +742,54 @@ S3_BUCKET_GET_RESPONSE = """<?xml version="1.0" encoding="UTF-8"?>
 <ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">
   <Name>{{ bucket.name }}</Name>
   <Prefix>{{ prefix }}</Prefix>
-  <MaxKeys>1000</MaxKeys>
+  <Marker>{{ marker or '' }}</Marker>
+  <MaxKeys>{{ max_keys }}</MaxKeys>
   <Delimiter>{{ delimiter }}</Delimiter>
-  <IsTruncated>false</IsTruncated>
+  <IsTruncated>{{ 'true' if is_truncated else 'false' }}</IsTruncated>
+  {% if is_truncated and delimiter %}
+  <NextMarker>{{ next_marker }}</NextMarker>
+  {% endif %}
+  {% for key in result_keys %}
+    <Contents>
+      <Key>{{ key.name }}</Key>
+      <LastModified>{{ key.last_modified_ISO8601 }}</LastModified>
+      <ETag>{{ key.etag }}</ETag>
+      <Size>{{ key.size }}</Size>
+      <StorageClass>{{ key.storage_class }}</StorageClass>
+      <Owner>
+        <ID>75aa57f09aa0c8caeab4f8c24e99d10f8e7faeebf76c078efc7c6caea54ba06a</ID>
+        <DisplayName>webfile</DisplayName>
+      </Owner>
+    </Contents>
+  {% endfor %}
+  {% if delimiter %}
+    {% for folder in result_folders %}
+      <CommonPrefixes>
+        <Prefix>{{ folder }}</Prefix>
+      </CommonPrefixes>
+    {% endfor %}
+  {% endif %}
+  </ListBucketResult>"""
+
+S3_BUCKET_GET_RESPONSE_V2 = """<?xml version="1.0" encoding="UTF-8"?>
+<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">
+  <Name>{{ bucket.name }}</Name>
+  <Prefix>{{ prefix }}</Prefix>
+  <MaxKeys>{{ max_keys }}</MaxKeys>
+  <KeyCount>{{ key_count }}</KeyCount>
+  {% if delimiter %}
+  <Delimiter>{{ delimiter }}</Delimiter>
+  {% endif %}
+  <IsTruncated>{{ 'true' if is_truncated else 'false' }}</IsTruncated>
+  {% if continuation_token %}
+  <ContinuationToken>{{ continuation_token }}</ContinuationToken>
+  {% endif %}
+  {% if next_continuation_token %}
+  <NextContinuationToken>{{ next_continuation_token }}</NextContinuationToken>
+  {% endif %}
+  {% if start_after %}
+  <StartAfter>{{ start_after }}</StartAfter>
+  {% endif %}
   {% for key in result_keys %}
     <Contents>
       <Key>{{ key.name }}</Key>
@@ -557,10 +797,12 @@ S3_BUCKET_GET_RESPONSE = """<?xml version="1.0" encoding="UTF-8"?>
       <ETag>{{ key.etag }}</ETag>
       <Size>{{ key.size }}</Size>
       <StorageClass>{{ key.storage_class }}</StorageClass>
+      {% if fetch_owner %}
       <Owner>
         <ID>75aa57f09aa0c8caeab4f8c24e99d10f8e7faeebf76c078efc7c6caea54ba06a</ID>
         <DisplayName>webfile</DisplayName>
       </Owner>
+      {% endif %}
     </Contents>
   {% endfor %}
   {% if delimiter %}
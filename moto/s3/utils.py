@@ -1,5 +1,6 @@
 from __future__ import unicode_literals
 
+from bisect import bisect_left, bisect_right, insort
 from boto.s3.key import Key
 import re
 import six
@@ -53,8 +54,22 @@ class _VersionedKeyStore(dict):
 
     """ A simplified/modified version of Django's `MultiValueDict` taken from:
     https://github.com/django/django/blob/70576740b0bb5289873f5a9a9a4e1a26b2c330e5/django/utils/datastructures.py#L282
+
+    It also keeps its key names in a sorted list, so that listing the keys
+    after a marker or under a prefix is a binary search plus the page.
     """
 
+    def __init__(self, lists=()):
+        super(_VersionedKeyStore, self).__init__()
+        self._sorted_keys = []
+        for key, list_ in lists:
+            self.setlist(key, list_)
+
+    def __reduce__(self):
+        # The default pickling of a dict subclass would only keep the latest
+        # version of each key
+        return (self.__class__, (list(self.iterlists()),))
+
     def __sgetitem__(self, key):
         return super(_VersionedKeyStore, self).__getitem__(key)
 
@@ -67,9 +82,23 @@ class _VersionedKeyStore(dict):
             current.append(value)
         except (KeyError, IndexError):
             current = [value]
+            self._index(key)
 
         super(_VersionedKeyStore, self).__setitem__(key, current)
 
+    def __delitem__(self, key):
+        super(_VersionedKeyStore, self).__delitem__(key)
+        self._unindex(key)
+
+    def _index(self, key):
+        if not super(_VersionedKeyStore, self).__contains__(key):
+            insort(self._sorted_keys, key)
+
+    def _unindex(self, key):
+        index = bisect_left(self._sorted_keys, key)
+        if index < len(self._sorted_keys) and self._sorted_keys[index] == key:
+            del self._sorted_keys[index]
+
     def get(self, key, default=None):
         try:
             return self[key]
@@ -90,8 +119,82 @@ class _VersionedKeyStore(dict):
         elif not isinstance(list_, list):
             list_ = [list_]
 
+        self._index(key)
         super(_VersionedKeyStore, self).__setitem__(key, list_)
 
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        # Like setting each item, which adds a version of existing keys
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def pop(self, key, *default):
+        present = super(_VersionedKeyStore, self).__contains__(key)
+        result = super(_VersionedKeyStore, self).pop(key, *default)
+        if present:
+            self._unindex(key)
+        return result
+
+    def popitem(self):
+        key, list_ = super(_VersionedKeyStore, self).popitem()
+        self._unindex(key)
+        return key, list_
+
+    def clear(self):
+        super(_VersionedKeyStore, self).clear()
+        self._sorted_keys = []
+
+    def list_keys(self, prefix=None, delimiter=None, marker=None, max_keys=None):
+        """
+        Lists the latest version of the keys after `marker` whose names start
+        with `prefix`, in name order, the way ListObjects does. With a
+        delimiter, the keys whose names contain it after the prefix are
+        rolled up into common prefixes. At most max_keys keys and common
+        prefixes are returned.
+
+        Returns the keys, the common prefixes, whether the listing was
+        truncated, and the last key name or common prefix returned.
+        """
+        prefix = prefix or ''
+        sorted_keys = self._sorted_keys
+        index = bisect_left(sorted_keys, prefix)
+        if marker:
+            index = max(index, bisect_right(sorted_keys, marker))
+
+        keys = []
+        common_prefixes = []
+        last_name = None
+        while index < len(sorted_keys):
+            name = sorted_keys[index]
+            if not name.startswith(prefix):
+                break
+            if max_keys is not None and len(keys) + len(common_prefixes) >= max_keys:
+                # A page of no keys, as S3 returns for max-keys=0, has no
+                # next page to point to
+                return keys, common_prefixes, last_name is not None, last_name
+
+            position = name.find(delimiter, len(prefix)) if delimiter else -1
+            if position == -1:
+                keys.append(self[name])
+                last_name = name
+                index += 1
+                continue
+
+            common_prefix = name[:position + len(delimiter)]
+            # Skip every other key under the common prefix
+            index = bisect_left(sorted_keys, _prefix_successor(common_prefix), index)
+            if marker and common_prefix <= marker:
+                # Returned before the marker, on an earlier page
+                continue
+            common_prefixes.append(common_prefix)
+            last_name = common_prefix
+
+        return keys, common_prefixes, False, last_name
+
     def _iteritems(self):
         for key in self:
             yield key, self[key]
@@ -117,3 +220,10 @@ class _VersionedKeyStore(dict):
 
         def lists(self):
             return list(self.iterlists())
+
+
+def _prefix_successor(prefix):
+    """
+    The smallest string greater than every string starting with prefix
+    """
+    return prefix[:-1] + six.unichr(ord(prefix[-1]) + 1)
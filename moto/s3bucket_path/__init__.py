@@ -1,3 +1,10 @@
 from __future__ import unicode_literals
-from .models import s3bucket_path_backend
-mock_s3bucket_path = s3bucket_path_backend.decorator
+from .models import s3bucket_path_backend, s3bucket_path_backends  # flake8: noqa
+from ..core.models import MockAWS
+
+
+def mock_s3bucket_path(func=None):
+    if func:
+        return MockAWS(s3bucket_path_backends)(func)
+    else:
+        return MockAWS(s3bucket_path_backends)
@@ -1,8 +1,10 @@
 from __future__ import unicode_literals
+from moto.core import GlobalBackends
 from moto.s3.models import S3Backend
 
 
 class S3BucketPathBackend(S3Backend):
     pass
 
-s3bucket_path_backend = S3BucketPathBackend()
+s3bucket_path_backends = GlobalBackends(S3BucketPathBackend)
+s3bucket_path_backend = s3bucket_path_backends['global']
@@ -1,5 +1,5 @@
 from __future__ import unicode_literals
-from .models import s3bucket_path_backend
+from .models import s3bucket_path_backends
 
 from .utils import bucket_name_from_url
 
@@ -15,7 +15,7 @@ def is_delete_keys(path, bucket_name):
 
 
 S3BucketPathResponseInstance = ResponseObject(
-    s3bucket_path_backend,
+    s3bucket_path_backends,
     bucket_name_from_url,
     parse_key_name,
     is_delete_keys,
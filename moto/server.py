@@ -1,20 +1,34 @@
 from __future__ import unicode_literals
+import atexit
+import errno
+import functools
 import json
 import re
+import select
+import signal
+import socket
 import sys
+import time
 import argparse
 
+from six.moves.queue import Queue
 from six.moves.urllib.parse import urlencode
 
-from threading import Lock
+from threading import Lock, Thread
 
-from flask import Flask
+from flask import Flask, request
 from flask.testing import FlaskClient
 from werkzeug.routing import BaseConverter
-from werkzeug.serving import run_simple
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler, run_simple
 
 from moto.backends import BACKENDS
-from moto.core.utils import convert_flask_to_httpretty_response
+from moto.core.metrics import prometheus_text
+from moto.core.persistence import StateStore
+from moto.core.profiling import action_profiler
+from moto.core.tenants import get_tenant, tenant_backends
+from moto.core.utils import convert_flask_to_httpretty_response, state_lock
+from moto.journal import RequestJournal
+from moto.s3.blobs import blob_store
 
 HTTP_METHODS = ["GET", "POST", "PUT", "DELETE", "HEAD"]
 
@@ -23,38 +37,95 @@ class DomainDispatcherApplication(object):
     """
     Dispatch requests to different applications based on the "Host:" header
     value. We'll match the host header value with the url_bases of each backend.
+
+    With tenants, each request is handled with the backends of the tenant
+    identified by its access key, or by `tenant_header`. With a journal, every
+    request to the backends is recorded to it.
     """
+    # The most hosts to remember the application of
+    max_cached_hosts = 1024
 
-    def __init__(self, create_app, service=None):
+    def __init__(self, create_app, service=None, tenants=False, tenant_header=None, journal=None):
         self.create_app = create_app
         self.lock = Lock()
         self.app_instances = {}
+        self.host_apps = {}
         self.service = service
+        self.tenants = tenants
+        self.tenant_header = tenant_header
+        self.admin_app = create_admin_app(self)
+        self.journal = journal
+        self.backend_app = journal.wrap(self.dispatch) if journal else self.dispatch
+        self._routes = None
+
+    @property
+    def routes(self):
+        """
+        The compiled url_bases of every backend, with the name of the backend
+        """
+        if self._routes is None:
+            self._routes = [
+                (re.compile(url_base), backend_name)
+                for backend_name, backend in BACKENDS.items()
+                for url_base in backend.url_bases
+            ]
+        return self._routes
 
     def get_backend_for_host(self, host):
         if self.service:
             return self.service
 
-        for backend_name, backend in BACKENDS.items():
-            for url_base in backend.url_bases:
-                if re.match(url_base, 'http://%s' % host):
-                    return backend_name
+        url = 'http://%s' % host
+        for url_base, backend_name in self.routes:
+            if url_base.match(url):
+                return backend_name
 
         raise RuntimeError('Invalid host: "%s"' % host)
 
     def get_application(self, host):
         host = host.split(':')[0]
+        try:
+            return self.host_apps[host]
+        except KeyError:
+            pass
+
         with self.lock:
             backend = self.get_backend_for_host(host)
             app = self.app_instances.get(backend, None)
             if app is None:
                 app = self.create_app(backend)
                 self.app_instances[backend] = app
+            if len(self.host_apps) >= self.max_cached_hosts:
+                self.host_apps.clear()
+            self.host_apps[host] = app
             return app
 
     def __call__(self, environ, start_response):
+        if environ.get('PATH_INFO', '').startswith('/moto-api/'):
+            return self.admin_app(environ, start_response)
+        return self.backend_app(environ, start_response)
+
+    def dispatch(self, environ, start_response):
         backend_app = self.get_application(environ['HTTP_HOST'])
-        return backend_app(environ, start_response)
+        if not self.tenants:
+            return backend_app(environ, start_response)
+
+        tenant = get_tenant(environ, self.tenant_header)
+        with tenant_backends.activate(tenant):
+            app_iter = backend_app(environ, start_response)
+        # Streamed bodies are rendered as they are sent, which is after the
+        # application has returned
+        return _iterate_as_tenant(tenant, app_iter)
+
+
+def _iterate_as_tenant(tenant, app_iter):
+    with tenant_backends.activate(tenant):
+        try:
+            for chunk in app_iter:
+                yield chunk
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
 
 
 class RegexConverter(BaseConverter):
@@ -84,12 +155,348 @@ class AWSTestHelper(FlaskClient):
         return json.loads(self.action_data(action_name, **kwargs))
 
 
-def create_backend_app(service):
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    """
+    Keeps connections open between requests, as HTTP/1.1 clients expect.
+
+    A handler lives as long as its connection, and handles one request each
+    time the server calls handle_next(), so the server can wait for the next
+    request of an idle connection without tying up a worker.
+    """
+    protocol_version = 'HTTP/1.1'
+    # Seconds to wait for the rest of a request once it has started to arrive
+    timeout = 5
+
+    def __init__(self, request, client_address, server):
+        # Only set up the connection. The requests are handled by handle_next()
+        self.request = request
+        self.client_address = client_address
+        self.server = server
+        self.setup()
+
+    def fileno(self):
+        return self.connection.fileno()
+
+    def handle_next(self):
+        """
+        Handle the next request of the connection. Returns whether the
+        connection stays open for another one.
+        """
+        self.close_connection = 1
+        try:
+            self.handle_one_request()
+        except (socket.error, socket.timeout) as e:
+            self.connection_dropped(e)
+            self.close_connection = 1
+        return not self.close_connection
+
+    def has_buffered_input(self):
+        """
+        Whether part of the next request has already been read into rfile,
+        where waiting for the socket to become readable would not see it
+        """
+        buffered = getattr(self.rfile, '_rbuf', None)
+        if buffered is not None:
+            # Python 2 socket file
+            return buffered.tell() > 0
+        self.connection.settimeout(0.0)
+        try:
+            return bool(self.rfile.peek(1))
+        except (socket.error, ValueError):
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def close(self):
+        try:
+            self.finish()
+        except (socket.error, ValueError):
+            pass
+        self.server.shutdown_request(self.request)
+
+
+class IdleConnections(object):
+    """
+    Waits, in a single thread, for the next request on the idle keep-alive
+    connections of a PooledWSGIServer, and hands each connection back to
+    `ready` when one arrives. Connections which stay idle for `timeout`
+    seconds are closed.
+    """
+
+    def __init__(self, ready, timeout):
+        self.ready = ready
+        self.timeout = timeout
+        self.lock = Lock()
+        # Connections to start watching, added from the worker threads
+        self.added = []
+        # The watched connections and when they time out, by file number
+        self.connections = {}
+        self.closed = False
+        self.wakeup_receiver, self.wakeup_sender = _socket_pair()
+        self.thread = Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def add(self, connection):
+        with self.lock:
+            self.added.append(connection)
+        self.wakeup_sender.send(b'x')
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+        self.wakeup_sender.send(b'x')
+
+    def run(self):
+        poller = _Poller()
+        wakeup_fileno = self.wakeup_receiver.fileno()
+        poller.register(wakeup_fileno)
+        while True:
+            with self.lock:
+                added, self.added = self.added, []
+                closed = self.closed
+            if closed:
+                break
+            try:
+                self.watch(poller, wakeup_fileno, added)
+            except Exception:
+                # A connection which can no longer be watched, such as one
+                # closed under us, mustn't stop the others from being served
+                self.drop_broken(poller)
+
+        for connection in [connection for connection, _ in self.connections.values()] + added:
+            connection.close()
+        self.connections = {}
+
+    def watch(self, poller, wakeup_fileno, added):
+        now = time.time()
+        for connection in added:
+            try:
+                fileno = connection.fileno()
+            except (socket.error, ValueError):
+                fileno = -1
+            if fileno < 0:
+                connection.close()
+                continue
+            self.connections[fileno] = (connection, now + self.timeout)
+            poller.register(fileno)
+
+        if self.connections:
+            first_deadline = min(deadline for _, deadline in self.connections.values())
+            wait = max(first_deadline - now, 0)
+        else:
+            wait = None
+
+        for fileno in poller.wait(wait):
+            if fileno == wakeup_fileno:
+                self.wakeup_receiver.recv(4096)
+            elif fileno in self.connections:
+                connection, _ = self.connections.pop(fileno)
+                poller.unregister(fileno)
+                self.ready(connection)
+
+        now = time.time()
+        for fileno, (connection, deadline) in list(self.connections.items()):
+            if deadline <= now:
+                del self.connections[fileno]
+                poller.unregister(fileno)
+                connection.close()
+
+    def drop_broken(self, poller):
+        for fileno, (connection, _) in list(self.connections.items()):
+            try:
+                broken = connection.fileno() != fileno
+            except (socket.error, ValueError):
+                broken = True
+            if broken:
+                del self.connections[fileno]
+                poller.unregister(fileno)
+                connection.close()
+
+
+class _Poller(object):
+    """
+    Waits for any of a set of file numbers to become readable, with poll()
+    where there is one. select() can't wait for file numbers of FD_SETSIZE
+    or more, which a busy server soon has.
+    """
+
+    def __init__(self):
+        self.filenos = set()
+        self.poll = select.poll() if hasattr(select, 'poll') else None
+
+    def register(self, fileno):
+        self.filenos.add(fileno)
+        if self.poll is not None:
+            self.poll.register(fileno, select.POLLIN)
+
+    def unregister(self, fileno):
+        if fileno not in self.filenos:
+            return
+        self.filenos.remove(fileno)
+        if self.poll is not None:
+            self.poll.unregister(fileno)
+
+    def wait(self, timeout):
+        """
+        The file numbers which are readable, or have been hung up or closed,
+        after at most `timeout` seconds, or forever if timeout is None
+        """
+        if self.poll is None:
+            return select.select(list(self.filenos), [], [], timeout)[0]
+        try:
+            events = self.poll.poll(None if timeout is None else timeout * 1000)
+        except (select.error, OSError) as e:
+            if e.args[0] == errno.EINTR:
+                return []
+            raise
+        return [fileno for fileno, _ in events]
+
+
+def _socket_pair():
+    if hasattr(socket, 'socketpair'):
+        return socket.socketpair()
+    # Python 2 on Windows
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(1)
+    sender = socket.create_connection(listener.getsockname())
+    receiver = listener.accept()[0]
+    listener.close()
+    return receiver, sender
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """
+    A WSGI server which handles requests with a fixed number of worker
+    threads, rather than starting a thread for every connection. Accepted
+    connections wait in a queue until a worker is free. Between requests,
+    keep-alive connections wait in IdleConnections instead of holding on to
+    a worker, until their next request arrives or `idle_timeout` runs out.
+    """
+
+    def __init__(self, host, port, app, workers=16, backlog=128, idle_timeout=60,
+                 handler=KeepAliveRequestHandler):
+        # The listen backlog, which HTTPServer reads when it starts listening
+        self.request_queue_size = backlog
+        BaseWSGIServer.__init__(self, host, port, app, handler=handler)
+        self.connections = Queue()
+        self.idle_connections = IdleConnections(self.connections.put, idle_timeout)
+        for _ in range(workers):
+            worker = Thread(target=self.process_connections)
+            worker.daemon = True
+            worker.start()
+
+    def process_request(self, request, client_address):
+        self.connections.put(self.RequestHandlerClass(request, client_address, self))
+
+    def process_connections(self):
+        while True:
+            connection = self.connections.get()
+            try:
+                keep_open = connection.handle_next()
+            except Exception:
+                self.handle_error(connection.request, connection.client_address)
+                keep_open = False
+
+            if not keep_open:
+                connection.close()
+            elif connection.has_buffered_input():
+                self.connections.put(connection)
+            else:
+                self.idle_connections.add(connection)
+
+    def server_close(self):
+        BaseWSGIServer.server_close(self)
+        self.idle_connections.close()
+
+
+def create_admin_app(dispatcher):
+    """
+    The control plane of the server, under /moto-api/: a health check,
+    per-service stats, Prometheus metrics, action profiles, and resets of every service, of one service or of the
+    calling tenant, so that test runs can recycle state without a restart
+    """
+    admin_app = Flask(__name__)
+
+    def json_response(body, status=200):
+        return json.dumps(body), status, {'Content-Type': 'application/json'}
+
+    @admin_app.route('/moto-api/health')
+    def health():
+        return json_response({'status': 'ok'})
+
+    @admin_app.route('/moto-api/stats')
+    def stats():
+        body = {}
+        for service in BACKENDS.loaded_backends():
+            body[service] = dict(
+                (region_name, {
+                    'objects': backend.object_counts(),
+                    'memory': backend.approximate_size(),
+                })
+                for region_name, backend in BACKENDS.service_backends(service).items()
+            )
+        return json_response(body)
+
+    @admin_app.route('/moto-api/metrics')
+    def metrics():
+        return prometheus_text(), 200, {'Content-Type': 'text/plain; version=0.0.4'}
+
+    @admin_app.route('/moto-api/profile', methods=['GET'])
+    def profile_report():
+        report = action_profiler.report(
+            action=request.args.get('action'),
+            sort=request.args.get('sort', 'cumulative'),
+            limit=int(request.args.get('limit', 50)))
+        return report, 200, {'Content-Type': 'text/plain'}
+
+    @admin_app.route('/moto-api/profile', methods=['POST'])
+    def start_profiling():
+        actions = request.form.get('actions') or request.args.get('actions', '*')
+        action_profiler.enable(action.strip() for action in actions.split(','))
+        return json_response({'profiling': sorted(action_profiler.actions)})
+
+    @admin_app.route('/moto-api/profile', methods=['DELETE'])
+    def stop_profiling():
+        action_profiler.disable()
+        action_profiler.reset()
+        return json_response({'profiling': []})
+
+    @admin_app.route('/moto-api/reset', methods=['POST'])
+    def reset():
+        with state_lock.reading():
+            services = list(BACKENDS.loaded_backends())
+            for service in services:
+                BACKENDS.reset_service(service)
+            if dispatcher.tenants:
+                tenant_backends.reset_all()
+        return json_response({'reset': services})
+
+    @admin_app.route('/moto-api/reset/<service>', methods=['POST'])
+    def reset_service(service):
+        if service not in BACKENDS:
+            return json_response({'error': 'Unknown service: {0}'.format(service)}, 404)
+        with state_lock.reading():
+            BACKENDS.reset_service(service)
+        return json_response({'reset': [service]})
+
+    @admin_app.route('/moto-api/reset-tenant', methods=['POST'])
+    def reset_tenant():
+        tenant = get_tenant(request.environ, dispatcher.tenant_header)
+        with state_lock.reading():
+            tenant_backends.reset(tenant)
+        return json_response({'reset': tenant})
+
+    return admin_app
+
+
+def create_backend_app(service, debug=False):
     from werkzeug.routing import Map
 
     # Create the backend_app
     backend_app = Flask(__name__)
-    backend_app.debug = True
+    backend_app.debug = debug
     backend_app.service = service
 
     # Reset view functions to reset the app
@@ -119,6 +526,28 @@ def create_backend_app(service):
     return backend_app
 
 
+def save_state_on_exit(state_store):
+    """
+    Save the state when the server exits, including when it is stopped with
+    SIGTERM, as by a deploy or a container stop, or with SIGINT. Those end
+    the process without running atexit handlers unless they are handled.
+    """
+    saved = []
+
+    def save():
+        if not saved:
+            saved.append(True)
+            state_store.save()
+
+    def save_and_exit(signum, frame):
+        save()
+        sys.exit(0)
+
+    atexit.register(save)
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, save_and_exit)
+
+
 def main(argv=sys.argv[1:]):
     parser = argparse.ArgumentParser()
 
@@ -136,14 +565,91 @@ def main(argv=sys.argv[1:]):
         '-p', '--port', type=int,
         help='Port number to use for connection',
         default=5000)
+    parser.add_argument(
+        '--state-dir', type=str,
+        help='Directory to load the state of the backends from at startup and to save it to',
+        default=None)
+    parser.add_argument(
+        '--snapshot-interval', type=float,
+        help='Seconds between saves of the state to --state-dir. It is always saved on exit',
+        default=None)
+
+    parser.add_argument(
+        '-s', '--server', type=str,
+        choices=['simple', 'pooled'],
+        help='The werkzeug development server with a thread per connection, '
+             'or an HTTP/1.1 keep-alive server with a pool of worker threads',
+        default='simple')
+    parser.add_argument(
+        '-w', '--workers', type=int,
+        help='Number of worker threads of the pooled server',
+        default=16)
+    parser.add_argument(
+        '--backlog', type=int,
+        help='Number of connections the pooled server lets wait to be accepted',
+        default=128)
+    parser.add_argument(
+        '--idle-timeout', type=float,
+        help='Seconds the pooled server keeps an idle keep-alive connection open',
+        default=60)
+    parser.add_argument(
+        '--debug', action='store_true',
+        help='Run the Flask applications in debug mode',
+        default=False)
+    parser.add_argument(
+        '--tenants', action='store_true',
+        help='Keep separate state for each AWS access key',
+        default=False)
+    parser.add_argument(
+        '--tenant-header', type=str,
+        help='Keep separate state for each value of this header, instead of each access key',
+        default=None)
+    parser.add_argument(
+        '--journal', type=str,
+        help='File to append every request to, for replaying with moto_replay',
+        default=None)
+    parser.add_argument(
+        '--s3-spill-threshold', type=int,
+        help='Size in bytes from which S3 objects are kept on disk instead of in memory',
+        default=blob_store.spill_threshold)
+    parser.add_argument(
+        '--s3-memory-budget', type=int,
+        help='The most bytes of S3 objects to keep in memory before spilling smaller ones to disk too',
+        default=blob_store.memory_budget)
+    parser.add_argument(
+        '--s3-blob-dir', type=str,
+        help='Directory to keep the S3 objects spilled to disk in, instead of a temporary directory',
+        default=None)
 
     args = parser.parse_args(argv)
 
-    # Wrap the main application
-    main_app = DomainDispatcherApplication(create_backend_app, service=args.service)
-    main_app.debug = True
+    blob_store.configure(args.s3_spill_threshold, args.s3_memory_budget, args.s3_blob_dir)
 
-    run_simple(args.host, args.port, main_app, threaded=True)
+    if args.state_dir:
+        state_store = StateStore(args.state_dir, BACKENDS)
+        state_store.load()
+        if args.snapshot_interval:
+            state_store.save_periodically(args.snapshot_interval)
+        save_state_on_exit(state_store)
+
+    # Wrap the main application
+    create_app = functools.partial(create_backend_app, debug=args.debug)
+    tenants = args.tenants or bool(args.tenant_header)
+    if tenants:
+        tenant_backends.enable()
+    journal = RequestJournal(args.journal) if args.journal else None
+    main_app = DomainDispatcherApplication(
+        create_app, service=args.service, tenants=tenants, tenant_header=args.tenant_header,
+        journal=journal)
+    main_app.debug = args.debug
+
+    if args.server == 'pooled':
+        server = PooledWSGIServer(
+            args.host, args.port, main_app, workers=args.workers, backlog=args.backlog,
+            idle_timeout=args.idle_timeout)
+        server.serve_forever()
+    else:
+        run_simple(args.host, args.port, main_app, threaded=True)
 
 if __name__ == '__main__':
     main()
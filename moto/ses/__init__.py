@@ -1,3 +1,10 @@
 from __future__ import unicode_literals
-from .models import ses_backend
-mock_ses = ses_backend.decorator
+from .models import ses_backend, ses_backends  # flake8: noqa
+from ..core.models import MockAWS
+
+
+def mock_ses(func=None):
+    if func:
+        return MockAWS(ses_backends)(func)
+    else:
+        return MockAWS(ses_backends)
@@ -1,5 +1,5 @@
 from __future__ import unicode_literals
-from moto.core import BaseBackend
+from moto.core import BaseBackend, GlobalBackends
 from .utils import get_random_message_id
 
 
@@ -67,4 +67,5 @@ class SESBackend(BaseBackend):
     def get_send_quota(self):
         return SESQuota(self.sent_messages)
 
-ses_backend = SESBackend()
+ses_backends = GlobalBackends(SESBackend)
+ses_backend = ses_backends['global']
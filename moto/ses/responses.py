@@ -1,37 +1,41 @@
 from __future__ import unicode_literals
 
 from moto.core.responses import BaseResponse
-from .models import ses_backend
+from .models import ses_backends
 
 
 class EmailResponse(BaseResponse):
 
+    @property
+    def ses_backend(self):
+        return ses_backends['global']
+
     def verify_email_identity(self):
         address = self.querystring.get('EmailAddress')[0]
-        ses_backend.verify_email_identity(address)
+        self.ses_backend.verify_email_identity(address)
         template = self.response_template(VERIFY_EMAIL_IDENTITY)
         return template.render()
 
     def list_identities(self):
-        identities = ses_backend.list_identities()
+        identities = self.ses_backend.list_identities()
         template = self.response_template(LIST_IDENTITIES_RESPONSE)
         return template.render(identities=identities)
 
     def verify_domain_dkim(self):
         domain = self.querystring.get('Domain')[0]
-        ses_backend.verify_domain(domain)
+        self.ses_backend.verify_domain(domain)
         template = self.response_template(VERIFY_DOMAIN_DKIM_RESPONSE)
         return template.render()
 
     def verify_domain_identity(self):
         domain = self.querystring.get('Domain')[0]
-        ses_backend.verify_domain(domain)
+        self.ses_backend.verify_domain(domain)
         template = self.response_template(VERIFY_DOMAIN_DKIM_RESPONSE)
         return template.render()
 
     def delete_identity(self):
         domain = self.querystring.get('Identity')[0]
-        ses_backend.delete_identity(domain)
+        self.ses_backend.delete_identity(domain)
         template = self.response_template(DELETE_IDENTITY_RESPONSE)
         return template.render()
 
@@ -43,7 +47,7 @@ class EmailResponse(BaseResponse):
         source = self.querystring.get('Source')[0]
         subject = self.querystring.get('Message.Subject.Data')[0]
         destination = self.querystring.get('Destination.ToAddresses.member.1')[0]
-        message = ses_backend.send_email(source, subject, body, destination)
+        message = self.ses_backend.send_email(source, subject, body, destination)
         if not message:
             return "Did not have authority to send from email {0}".format(source), dict(status=400)
         template = self.response_template(SEND_EMAIL_RESPONSE)
@@ -54,14 +58,14 @@ class EmailResponse(BaseResponse):
         destination = self.querystring.get('Destinations.member.1')[0]
         raw_data = self.querystring.get('RawMessage.Data')[0]
 
-        message = ses_backend.send_raw_email(source, destination, raw_data)
+        message = self.ses_backend.send_raw_email(source, destination, raw_data)
         if not message:
             return "Did not have authority to send from email {0}".format(source), dict(status=400)
         template = self.response_template(SEND_RAW_EMAIL_RESPONSE)
         return template.render(message=message)
 
     def get_send_quota(self):
-        quota = ses_backend.get_send_quota()
+        quota = self.ses_backend.get_send_quota()
         template = self.response_template(GET_SEND_QUOTA_RESPONSE)
         return template.render(quota=quota)
 
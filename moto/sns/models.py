@@ -9,7 +9,7 @@ import requests
 import six
 
 from moto.compat import OrderedDict
-from moto.core import BaseBackend
+from moto.core import BaseBackend, RegionBackends
 from moto.core.utils import iso_8601_datetime_with_milliseconds
 from moto.sqs import sqs_backends
 from .exceptions import SNSNotFoundError
@@ -253,9 +253,8 @@ class SNSBackend(BaseBackend):
         return endpoint
 
 
-sns_backends = {}
-for region in boto.sns.regions():
-    sns_backends[region.name] = SNSBackend(region.name)
+sns_backends = RegionBackends(
+    [region.name for region in boto.sns.regions()], SNSBackend)
 
 
 DEFAULT_TOPIC_POLICY = json.dumps({
@@ -7,8 +7,8 @@ from xml.sax.saxutils import escape
 
 import boto.sqs
 
-from moto.core import BaseBackend
-from moto.core.utils import camelcase_to_underscores, get_random_message_id, unix_time_millis
+from moto.core import BaseBackend, RegionBackends
+from moto.core.utils import camelcase_to_underscores, get_random_message_id, unix_time_millis, ResourceLock, TrackedDict, state_lock
 from .utils import generate_receipt_handle
 from .exceptions import (
     ReceiptHandleIsInvalid,
@@ -114,6 +114,7 @@ class Queue(object):
         # wait_time_seconds will be set to immediate return messages
         self.wait_time_seconds = wait_time_seconds or 0
         self._messages = []
+        self.lock = ResourceLock()
 
         now = time.time()
 
@@ -143,11 +144,12 @@ class Queue(object):
 
         sqs_backend = sqs_backends[region_name]
         queue = sqs_backend.get_queue(queue_name)
-        if 'VisibilityTimeout' in properties:
-            queue.visibility_timeout = int(properties['VisibilityTimeout'])
+        with queue.lock:
+            if 'VisibilityTimeout' in properties:
+                queue.visibility_timeout = int(properties['VisibilityTimeout'])
 
-        if 'WaitTimeSeconds' in properties:
-            queue.wait_time_seconds = int(properties['WaitTimeSeconds'])
+            if 'WaitTimeSeconds' in properties:
+                queue.wait_time_seconds = int(properties['WaitTimeSeconds'])
         return queue
 
     @classmethod
@@ -189,7 +191,8 @@ class Queue(object):
         return [message for message in self._messages if message.visible and not message.delayed]
 
     def add_message(self, message):
-        self._messages.append(message)
+        with self.lock:
+            self._messages.append(message)
 
     def get_cfn_attribute(self, attribute_name):
         from moto.cloudformation.exceptions import UnformattedGetAttTemplateException
@@ -203,7 +206,7 @@ class Queue(object):
 class SQSBackend(BaseBackend):
     def __init__(self, region_name):
         self.region_name = region_name
-        self.queues = {}
+        self.queues = TrackedDict()
         super(SQSBackend, self).__init__()
 
     def reset(self):
@@ -214,8 +217,9 @@ class SQSBackend(BaseBackend):
     def create_queue(self, name, visibility_timeout, wait_time_seconds):
         queue = self.queues.get(name)
         if queue is None:
-            queue = Queue(name, visibility_timeout, wait_time_seconds, self.region_name)
-            self.queues[name] = queue
+            # setdefault keeps the first of two concurrently created queues
+            queue = self.queues.setdefault(
+                name, Queue(name, visibility_timeout, wait_time_seconds, self.region_name))
         return queue
 
     def list_queues(self, queue_name_prefix):
@@ -239,7 +243,8 @@ class SQSBackend(BaseBackend):
 
     def set_queue_attribute(self, queue_name, key, value):
         queue = self.get_queue(queue_name)
-        setattr(queue, key, value)
+        with queue.lock:
+            setattr(queue, key, value)
         return queue
 
     def send_message(self, queue_name, message_body, message_attributes=None, delay_seconds=None):
@@ -284,45 +289,51 @@ class SQSBackend(BaseBackend):
 
         # queue.messages only contains visible messages
         while True:
-            for message in queue.messages:
-                message.mark_received(
-                    visibility_timeout=queue.visibility_timeout
-                )
-                result.append(message)
-                if len(result) >= count:
-                    break
+            # Messages must be marked as received before another receiver
+            # can see them
+            with queue.lock:
+                for message in queue.messages:
+                    message.mark_received(
+                        visibility_timeout=queue.visibility_timeout
+                    )
+                    result.append(message)
+                    if len(result) >= count:
+                        break
 
             if result or time.time() > polling_end:
                 break
+            state_lock.yield_to_writers()
 
         return result
 
     def delete_message(self, queue_name, receipt_handle):
         queue = self.get_queue(queue_name)
-        new_messages = []
-        for message in queue._messages:
-            # Only delete message if it is not visible and the reciept_handle
-            # matches.
-            if message.receipt_handle == receipt_handle:
-                continue
-            new_messages.append(message)
-        queue._messages = new_messages
+        with queue.lock:
+            new_messages = []
+            for message in queue._messages:
+                # Only delete message if it is not visible and the reciept_handle
+                # matches.
+                if message.receipt_handle == receipt_handle:
+                    continue
+                new_messages.append(message)
+            queue._messages = new_messages
 
     def change_message_visibility(self, queue_name, receipt_handle, visibility_timeout):
         queue = self.get_queue(queue_name)
-        for message in queue._messages:
-            if message.receipt_handle == receipt_handle:
-                if message.visible:
-                    raise MessageNotInflight
-                message.change_visibility(visibility_timeout)
-                return
+        with queue.lock:
+            for message in queue._messages:
+                if message.receipt_handle == receipt_handle:
+                    if message.visible:
+                        raise MessageNotInflight
+                    message.change_visibility(visibility_timeout)
+                    return
         raise ReceiptHandleIsInvalid
 
     def purge_queue(self, queue_name):
         queue = self.get_queue(queue_name)
-        queue._messages = []
+        with queue.lock:
+            queue._messages = []
 
 
-sqs_backends = {}
-for region in boto.sqs.regions():
-    sqs_backends[region.name] = SQSBackend(region.name)
+sqs_backends = RegionBackends(
+    [region.name for region in boto.sqs.regions()], SQSBackend)
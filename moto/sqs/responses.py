@@ -57,8 +57,7 @@ class SQSResponse(BaseResponse):
     def list_queues(self):
         queue_name_prefix = self.querystring.get("QueueNamePrefix", [None])[0]
         queues = self.sqs_backend.list_queues(queue_name_prefix)
-        template = self.response_template(LIST_QUEUES_RESPONSE)
-        return template.render(queues=queues)
+        return self.response_stream(LIST_QUEUES_RESPONSE, queues=queues)
 
     def change_message_visibility(self):
         queue_name = self._get_queue_name()
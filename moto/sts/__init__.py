@@ -1,3 +1,10 @@
 from __future__ import unicode_literals
-from .models import sts_backend
-mock_sts = sts_backend.decorator
+from .models import sts_backend, sts_backends  # flake8: noqa
+from ..core.models import MockAWS
+
+
+def mock_sts(func=None):
+    if func:
+        return MockAWS(sts_backends)(func)
+    else:
+        return MockAWS(sts_backends)
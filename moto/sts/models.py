@@ -1,6 +1,6 @@
 from __future__ import unicode_literals
 import datetime
-from moto.core import BaseBackend
+from moto.core import BaseBackend, GlobalBackends
 from moto.core.utils import iso_8601_datetime_with_milliseconds
 
 
@@ -43,4 +43,5 @@ class STSBackend(BaseBackend):
         role = AssumedRole(**kwargs)
         return role
 
-sts_backend = STSBackend()
+sts_backends = GlobalBackends(STSBackend)
+sts_backend = sts_backends['global']
@@ -1,14 +1,18 @@
 from __future__ import unicode_literals
 
 from moto.core.responses import BaseResponse
-from .models import sts_backend
+from .models import sts_backends
 
 
 class TokenResponse(BaseResponse):
 
+    @property
+    def sts_backend(self):
+        return sts_backends['global']
+
     def get_session_token(self):
         duration = int(self.querystring.get('DurationSeconds', [43200])[0])
-        token = sts_backend.get_session_token(duration=duration)
+        token = self.sts_backend.get_session_token(duration=duration)
         template = self.response_template(GET_SESSION_TOKEN_RESPONSE)
         return template.render(token=token)
 
@@ -16,7 +20,7 @@ class TokenResponse(BaseResponse):
         duration = int(self.querystring.get('DurationSeconds', [43200])[0])
         policy = self.querystring.get('Policy', [None])[0]
         name = self.querystring.get('Name')[0]
-        token = sts_backend.get_federation_token(
+        token = self.sts_backend.get_federation_token(
             duration=duration, name=name, policy=policy)
         template = self.response_template(GET_FEDERATION_TOKEN_RESPONSE)
         return template.render(token=token)
@@ -29,7 +33,7 @@ class TokenResponse(BaseResponse):
         duration = int(self.querystring.get('DurationSeconds', [3600])[0])
         external_id = self.querystring.get('ExternalId', [None])[0]
 
-        role = sts_backend.assume_role(
+        role = self.sts_backend.assume_role(
             role_session_name=role_session_name,
             role_arn=role_arn,
             policy=policy,
@@ -3,7 +3,7 @@ import six
 
 import boto.swf
 
-from moto.core import BaseBackend
+from moto.core import BaseBackend, RegionBackends
 
 from ..exceptions import (
     SWFUnknownResourceFault,
@@ -332,6 +332,5 @@ class SWFBackend(BaseBackend):
             activity_task.details = details
 
 
-swf_backends = {}
-for region in boto.swf.regions():
-    swf_backends[region.name] = SWFBackend(region.name)
+swf_backends = RegionBackends(
+    [region.name for region in boto.swf.regions()], SWFBackend)
@@ -29,6 +29,7 @@ setup(
     entry_points={
         'console_scripts': [
             'moto_server = moto.server:main',
+            'moto_replay = moto.replay:main',
         ],
     },
     packages=find_packages(exclude=("tests", "tests.*")),
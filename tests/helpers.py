@@ -26,6 +26,20 @@ class requires_boto_gte(object):
         return skip_test
 
 
+class requires_botocore_gte(object):
+    """Decorator for requiring botocore version greater than or equal to 'version'"""
+    def __init__(self, version):
+        self.version = version
+
+    def __call__(self, test):
+        import botocore
+        botocore_version = version_tuple(botocore.__version__)
+        required = version_tuple(self.version)
+        if botocore_version >= required:
+            return test
+        return skip_test
+
+
 class disable_on_py3(object):
     def __call__(self, test):
         if not six.PY3:
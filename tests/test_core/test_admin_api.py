@@ -0,0 +1,79 @@
+from __future__ import unicode_literals
+import json
+import threading
+import time
+
+import sure  # noqa
+from werkzeug.test import Client
+from werkzeug.wrappers import Response
+
+from moto.core.models import SizeCache, backend_sizes
+from moto.server import DomainDispatcherApplication, create_backend_app
+from moto.s3.models import s3_backend
+from moto.sqs.models import sqs_backends
+
+
+def admin_client():
+    return Client(DomainDispatcherApplication(create_backend_app), Response)
+
+
+def test_health():
+    response = admin_client().get('/moto-api/health')
+    response.status_code.should.equal(200)
+    json.loads(response.get_data(as_text=True)).should.equal({'status': 'ok'})
+
+
+def test_stats():
+    s3_backend.reset()
+    s3_backend.create_bucket('the-bucket', 'us-east-1')
+    backend_sizes.measure(s3_backend)
+    response = admin_client().get('/moto-api/stats')
+    stats = json.loads(response.get_data(as_text=True))
+    stats['s3']['global']['objects'].should.equal({'buckets': 1})
+    stats['s3']['global']['memory'].should.be.greater_than(0)
+    s3_backend.reset()
+
+
+class MeasuredBackend(object):
+    def __init__(self):
+        self.measurements = 0
+        self.measured = threading.Event()
+
+    def measure_size(self):
+        self.measurements += 1
+        self.measured.set()
+        return 42
+
+
+def test_sizes_are_measured_in_the_background():
+    sizes = SizeCache(max_age=60)
+    backend = MeasuredBackend()
+    sizes.get(backend).should.be.none
+    backend.measured.wait(5).should.be.ok
+    while backend in sizes.measuring:
+        time.sleep(0.01)
+    sizes.get(backend).should.equal(42)
+    sizes.get(backend).should.equal(42)
+    backend.measurements.should.equal(1)
+
+
+def test_reset_one_service():
+    s3_backend.create_bucket('the-bucket', 'us-east-1')
+    sqs_backends['us-east-1'].create_queue('the-queue', 30, 0)
+    response = admin_client().post('/moto-api/reset/s3')
+    json.loads(response.get_data(as_text=True)).should.equal({'reset': ['s3']})
+    s3_backend.buckets.should.be.empty
+    sqs_backends['us-east-1'].queues.should.contain('the-queue')
+    sqs_backends.reset()
+
+
+def test_reset_all_services():
+    s3_backend.create_bucket('the-bucket', 'us-east-1')
+    sqs_backends['us-east-1'].create_queue('the-queue', 30, 0)
+    admin_client().post('/moto-api/reset').status_code.should.equal(200)
+    s3_backend.buckets.should.be.empty
+    sqs_backends['us-east-1'].queues.should.be.empty
+
+
+def test_reset_unknown_service():
+    admin_client().post('/moto-api/reset/not-a-service').status_code.should.equal(404)
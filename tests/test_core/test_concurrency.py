@@ -0,0 +1,146 @@
+from __future__ import unicode_literals
+import shutil
+import tempfile
+import threading
+
+import sure  # noqa
+
+from moto.backends import BACKENDS
+from moto.core.persistence import StateStore
+from moto.core.utils import state_lock
+from moto.server import create_backend_app
+from moto.dynamodb2.models import dynamodb_backend2
+from moto.kinesis.models import kinesis_backends
+from moto.s3.models import s3_backend
+from moto.sqs.models import sqs_backends
+
+THREADS = 16
+ITERATIONS = 100
+
+
+def hammer(func):
+    """
+    Calls func(thread_index, iteration) from many threads at once
+    """
+    start = threading.Event()
+    errors = []
+
+    def worker(thread_index):
+        start.wait()
+        try:
+            for iteration in range(ITERATIONS):
+                func(thread_index, iteration)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    start.set()
+    for thread in threads:
+        thread.join()
+    errors.should.equal([])
+
+
+def test_sqs_messages_are_received_once():
+    sqs_backend = sqs_backends['us-east-1']
+    sqs_backend.reset()
+    sqs_backend.create_queue('the-queue', 300, 0)
+    for index in range(THREADS * ITERATIONS):
+        sqs_backend.send_message('the-queue', 'message-{0}'.format(index))
+
+    received = []
+
+    def receive(thread_index, iteration):
+        for message in sqs_backend.receive_messages('the-queue', 1, 0):
+            received.append(message.id)
+            sqs_backend.delete_message('the-queue', message.receipt_handle)
+
+    hammer(receive)
+    len(received).should.equal(len(set(received)))
+    sqs_backend.get_queue('the-queue')._messages.should.have.length_of(THREADS * ITERATIONS - len(received))
+
+
+def test_kinesis_sequence_numbers_are_unique():
+    kinesis_backend = kinesis_backends['us-east-1']
+    kinesis_backend.reset()
+    kinesis_backend.create_stream('the-stream', 1, 'us-east-1')
+    sequence_numbers = []
+
+    def put_record(thread_index, iteration):
+        sequence_number, _ = kinesis_backend.put_record(
+            'the-stream', 'key', None, None, 'data-{0}'.format(iteration))
+        sequence_numbers.append(sequence_number)
+
+    hammer(put_record)
+    sorted(sequence_numbers).should.equal(list(range(1, THREADS * ITERATIONS + 1)))
+
+
+def test_s3_versions_are_unique():
+    s3_backend.reset()
+    s3_backend.create_bucket('the-bucket', 'us-east-1')
+    s3_backend.set_bucket_versioning('the-bucket', 'Enabled')
+
+    def set_key(thread_index, iteration):
+        s3_backend.set_key('the-bucket', 'the-key', b'value')
+        s3_backend.prefix_query(s3_backend.get_bucket('the-bucket'), '', '/')
+
+    hammer(set_key)
+    versions = [key._version_id for key in s3_backend.get_bucket('the-bucket').keys.getlist('the-key')]
+    sorted(versions).should.equal(list(range(THREADS * ITERATIONS)))
+    s3_backend.reset()
+
+
+def test_dynamodb_items_are_not_lost():
+    dynamodb_backend2.reset()
+    dynamodb_backend2.create_table(
+        'the-table', schema=[{'AttributeName': 'id', 'KeyType': 'HASH'}])
+
+    def put_item(thread_index, iteration):
+        item_id = '{0}-{1}'.format(thread_index, iteration)
+        dynamodb_backend2.put_item('the-table', {'id': {'S': item_id}})
+        dynamodb_backend2.scan('the-table', {})
+
+    hammer(put_item)
+    len(dynamodb_backend2.get_table('the-table')).should.equal(THREADS * ITERATIONS)
+    dynamodb_backend2.reset()
+
+
+def test_saving_blocks_requests():
+    sqs_backends.reset()
+    test_client = create_backend_app('sqs').test_client()
+    sent = threading.Event()
+
+    def create_queue():
+        test_client.get('/?Action=CreateQueue&QueueName=the-queue')
+        sent.set()
+
+    with state_lock.writing():
+        thread = threading.Thread(target=create_queue)
+        thread.start()
+        sent.wait(0.2).should_not.be.ok
+    thread.join()
+    sent.is_set().should.be.ok
+    sqs_backends.reset()
+
+
+def test_save_while_creating_queues():
+    sqs_backends.reset()
+    test_client = create_backend_app('sqs').test_client()
+    state_dir = tempfile.mkdtemp()
+    state_store = StateStore(state_dir, BACKENDS)
+    try:
+        def create_queue(thread_index, iteration):
+            if thread_index == 0:
+                state_store.save()
+            else:
+                test_client.get('/?Action=CreateQueue&QueueName=queue-{0}-{1}'.format(thread_index, iteration))
+
+        hammer(create_queue)
+        state_store.save()
+        sqs_backends.reset()
+        state_store.load()
+        sqs_backends['us-east-1'].queues.should.have.length_of((THREADS - 1) * ITERATIONS)
+    finally:
+        shutil.rmtree(state_dir)
+        sqs_backends.reset()
@@ -0,0 +1,83 @@
+from __future__ import unicode_literals
+
+import boto3
+from mock import patch
+import sure  # noqa
+
+from moto import mock_sqs
+from moto.core.direct import DirectDispatcher, DirectRequest, botocore_supports_direct_dispatch, direct_dispatcher
+from moto.sqs.models import sqs_backends
+from tests.helpers import requires_botocore_gte
+
+SQS_URL = 'https://queue.amazonaws.com/'
+
+
+class PreparedRequest(object):
+    # The attributes of a botocore AWSPreparedRequest
+    def __init__(self, method, url, headers=None, body=None):
+        self.method = method
+        self.url = url
+        self.headers = headers or {}
+        self.body = body
+
+
+def test_request_headers_are_case_insensitive():
+    request = DirectRequest('GET', 'https://example.com/path?a=1', {'X-Amz-Target': b'Service.Action'}, None)
+    request.headers.get('x-amz-target').should.equal('Service.Action')
+    request.path.should.equal('/path')
+    request.querystring.should.equal({'a': ['1']})
+    request.body.should.equal(b'')
+
+
+@mock_sqs
+def test_dispatch_to_mocked_service():
+    body = 'Action=CreateQueue&QueueName=the-queue&Version=2012-11-05'
+    request = PreparedRequest(
+        'POST', SQS_URL, {'Content-Type': 'application/x-www-form-urlencoded'}, body)
+
+    status, headers, response_body = direct_dispatcher.dispatch(request)
+    status.should.equal(200)
+    response_body.should.contain(b'the-queue')
+    sqs_backends['us-east-1'].queues.should.contain('the-queue')
+
+
+@mock_sqs
+def test_dispatch_leaves_unmocked_services_alone():
+    request = PreparedRequest('GET', 'https://ec2.us-east-1.amazonaws.com/?Action=DescribeInstances')
+    direct_dispatcher.dispatch(request).should.equal(None)
+
+
+def test_dispatch_after_mock_stops():
+    with mock_sqs():
+        pass
+    request = PreparedRequest('GET', SQS_URL + '?Action=ListQueues')
+    direct_dispatcher.dispatch(request).should.equal(None)
+
+
+def test_disabled_dispatcher_sends_requests():
+    dispatcher = DirectDispatcher()
+    dispatcher.register(sqs_backends.default_backend.compiled_urls)
+    dispatcher(PreparedRequest('GET', SQS_URL + '?Action=ListQueues')).should.equal(None)
+    dispatcher.dispatch(PreparedRequest('GET', SQS_URL + '?Action=ListQueues'))[0].should.equal(200)
+
+
+@requires_botocore_gte("1.11.0")
+@mock_sqs
+def test_boto3_requests_are_dispatched_directly():
+    direct_dispatcher.enable()
+    try:
+        with patch.object(direct_dispatcher, 'dispatch', wraps=direct_dispatcher.dispatch) as dispatch:
+            client = boto3.client('sqs', region_name='us-east-1')
+            client.create_queue(QueueName='the-queue')
+            client.list_queues()['QueueUrls'][0].should.contain('the-queue')
+        dispatch.call_count.should.equal(2)
+    finally:
+        direct_dispatcher.disable()
+
+
+def test_enable_needs_a_recent_botocore():
+    if botocore_supports_direct_dispatch():
+        return
+    dispatcher = DirectDispatcher()
+    dispatcher.enable.when.called_with().should.throw(RuntimeError, 'botocore 1.11.0 or later')
+    dispatcher.enabled.should.equal(False)
@@ -0,0 +1,88 @@
+from __future__ import unicode_literals
+import os
+import shutil
+import tempfile
+
+import six
+import sure  # noqa
+from werkzeug.test import Client, EnvironBuilder
+
+from moto.journal import RequestJournal, read_journal
+from moto.replay import replay, wsgi_sender
+from moto.server import DomainDispatcherApplication, create_backend_app
+from moto.sqs.models import sqs_backends
+
+SQS_HOST = 'sqs.us-east-1.amazonaws.com'
+
+
+def test_journal_records_requests():
+    state_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(state_dir, 'journal')
+        journal = RequestJournal(path)
+        client = Client(DomainDispatcherApplication(create_backend_app, journal=journal))
+        client.post('/', data={'Action': 'CreateQueue', 'QueueName': 'the-queue'},
+                    headers={'Host': SQS_HOST})
+        client.get('/?Action=ListQueues', headers={'Host': SQS_HOST})
+        client.get('/moto-api/health')
+        journal.close()
+
+        recorded = list(read_journal(path))
+        recorded.should.have.length_of(2)
+        recorded[0]['method'].should.equal('POST')
+        recorded[0]['host'].should.equal(SQS_HOST)
+        recorded[0]['status'].should.equal(200)
+        recorded[0]['body'].should.contain(b'QueueName=the-queue')
+        recorded[1]['query'].should.equal('Action=ListQueues')
+        recorded[1]['offset'].should.be.greater_than(recorded[0]['offset'])
+    finally:
+        shutil.rmtree(state_dir)
+        sqs_backends.reset()
+
+
+def test_journal_keeps_bodies_without_length():
+    state_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(state_dir, 'journal')
+        journal = RequestJournal(path)
+        received = []
+
+        def app(environ, start_response):
+            # Such as a chunked upload, read until the end of the input
+            received.append(environ['wsgi.input'].read())
+            start_response('200 OK', [])
+            return [b'']
+
+        environ = EnvironBuilder(method='PUT', path='/the-key').get_environ()
+        environ.pop('CONTENT_LENGTH', None)
+        environ['wsgi.input'] = six.BytesIO(b'the body')
+        journal.wrap(app)(environ, lambda status, headers: None)
+        journal.close()
+
+        received.should.equal([b'the body'])
+        [request['body'] for request in read_journal(path)].should.equal([b'the body'])
+    finally:
+        shutil.rmtree(state_dir)
+
+
+def test_replay_in_process():
+    state_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(state_dir, 'journal')
+        journal = RequestJournal(path)
+        client = Client(DomainDispatcherApplication(create_backend_app, journal=journal))
+        for name in ('queue-1', 'queue-2'):
+            client.post('/', data={'Action': 'CreateQueue', 'QueueName': name},
+                        headers={'Host': SQS_HOST})
+        journal.close()
+        sqs_backends.reset()
+
+        send = wsgi_sender(DomainDispatcherApplication(create_backend_app))
+        result = replay(read_journal(path), send, concurrency=2)
+        result.count.should.equal(2)
+        result.mismatches.should.equal(0)
+        result.errors.should.equal(0)
+        sorted(sqs_backends['us-east-1'].queues).should.equal(['queue-1', 'queue-2'])
+    finally:
+        shutil.rmtree(state_dir)
+        sqs_backends.reset()
@@ -0,0 +1,37 @@
+from __future__ import unicode_literals
+import subprocess
+import sys
+
+import sure  # noqa
+
+import moto
+from moto.backends import BACKENDS
+
+
+def import_failures(statements):
+    """
+    Runs each statement in a fresh interpreter, where nothing else has been
+    imported first, and returns the errors of those which failed
+    """
+    failures = {}
+    for statement in statements:
+        process = subprocess.Popen(
+            [sys.executable, '-c', statement], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        output = process.communicate()[0]
+        if process.returncode != 0:
+            failures[statement] = output.decode('utf-8').strip().splitlines()[-1]
+    return failures
+
+
+def test_every_mock_imports_in_a_fresh_process():
+    mocks = [name for name in dir(moto) if name.startswith('mock_')]
+
+    import_failures(
+        'from moto import {0}; {0}()'.format(name) for name in mocks
+    ).should.equal({})
+
+
+def test_every_backend_imports_in_a_fresh_process():
+    import_failures(
+        'from moto.backends import BACKENDS; BACKENDS[{0!r}]'.format(str(name)) for name in BACKENDS
+    ).should.equal({})
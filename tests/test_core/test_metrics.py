@@ -0,0 +1,87 @@
+from __future__ import unicode_literals
+import time
+
+import sure  # noqa
+from werkzeug.test import Client
+from werkzeug.wrappers import Response
+
+from moto.core.metrics import LatencyMetrics, get_metrics, reset_metrics
+from moto.core.utils import ResponseStream
+from moto.server import DomainDispatcherApplication, create_backend_app
+
+
+def test_latency_metrics():
+    metrics = LatencyMetrics('test', ['service', 'action'], buckets=(0.1, 1))
+    metrics.record(('sqs', 'SendMessage'), 0.05)
+    metrics.record(('sqs', 'SendMessage'), 0.5, error=True)
+    metrics.record(('sqs', 'SendMessage'), 2)
+
+    stats = metrics.get_stats()[('sqs', 'SendMessage')]
+    stats['count'].should.equal(3)
+    stats['errors'].should.equal(1)
+    stats['total_seconds'].should.equal(2.55)
+    stats['histogram'].should.equal({0.1: 1, 1: 1, float('inf'): 1})
+
+    lines = metrics.prometheus_lines()
+    lines.should.contain('test_requests_total{service="sqs",action="SendMessage"} 3')
+    lines.should.contain('test_errors_total{service="sqs",action="SendMessage"} 1')
+    lines.should.contain('test_latency_seconds_bucket{service="sqs",action="SendMessage",le="1"} 2')
+    lines.should.contain('test_latency_seconds_bucket{service="sqs",action="SendMessage",le="+Inf"} 3')
+
+    metrics.reset()
+    metrics.get_stats().should.equal({})
+
+
+def test_timer_counts_errors():
+    metrics = LatencyMetrics('test', ['action'])
+    with metrics.timer(('ok',)):
+        pass
+    with metrics.timer(('not_found',)) as timer:
+        timer.status = 404
+    try:
+        with metrics.timer(('raises',)):
+            raise ValueError()
+    except ValueError:
+        pass
+
+    stats = metrics.get_stats()
+    stats[('ok',)]['errors'].should.equal(0)
+    stats[('not_found',)]['errors'].should.equal(1)
+    stats[('raises',)]['errors'].should.equal(1)
+
+
+def test_timer_includes_rendering_of_streams():
+    metrics = LatencyMetrics('test', ['action'])
+
+    def render():
+        time.sleep(0.05)
+        yield 'rendered'
+
+    with metrics.timer(('list',)) as timer:
+        stream = ResponseStream(render())
+        timer.until_rendered(stream)
+    metrics.get_stats().should.equal({})
+
+    stream.join().should.equal(b'rendered')
+    stats = metrics.get_stats()[('list',)]
+    stats['count'].should.equal(1)
+    stats['total_seconds'].should.be.greater_than(0.05)
+
+
+def test_actions_are_measured():
+    reset_metrics()
+    test_client = create_backend_app("sqs").test_client()
+    test_client.action_data("CreateQueue", QueueName="the-queue")
+
+    metrics = get_metrics()
+    metrics['actions'][('sqs', 'CreateQueue')]['count'].should.equal(1)
+    [stats['count'] for stats in metrics['handlers'].values()].should.equal([1])
+
+
+def test_metrics_endpoint():
+    reset_metrics()
+    test_client = create_backend_app("sqs").test_client()
+    test_client.action_data("ListQueues")
+
+    response = Client(DomainDispatcherApplication(create_backend_app), Response).get('/moto-api/metrics')
+    response.get_data(as_text=True).should.contain('moto_action_requests_total{service="sqs",action="ListQueues"} 1')
@@ -0,0 +1,104 @@
+from __future__ import unicode_literals
+import copy
+import os
+import shutil
+import tempfile
+
+import sure  # noqa
+
+from moto.backends import BACKENDS
+from moto.core.persistence import StateStore
+from moto.s3.blobs import FileBlob, blob_store
+from moto.s3.models import s3_backend
+from moto.sqs.models import sqs_backends
+
+
+def test_save_and_load_state():
+    state_dir = tempfile.mkdtemp()
+    try:
+        s3_backend.reset()
+        sqs_backends.reset()
+        s3_backend.create_bucket('the-bucket', 'us-east-1')
+        s3_backend.set_key('the-bucket', 'small', b'small value')
+        s3_backend.set_key('the-bucket', 'large', b'x' * 100)
+        queue = sqs_backends['eu-west-1'].create_queue('the-queue', 30, 0)
+
+        state_store = StateStore(state_dir, BACKENDS, blob_threshold=100)
+        state_store.save()
+        os.listdir(os.path.join(state_dir, 'blobs')).should.have.length_of(1)
+
+        s3_backend.reset()
+        sqs_backends.reset()
+        state_store.load().should.be.ok
+        s3_backend.get_key('the-bucket', 'small').value.should.equal(b'small value')
+        s3_backend.get_key('the-bucket', 'large').value.should.equal(b'x' * 100)
+        sqs_backends['eu-west-1'].get_queue('the-queue').name.should.equal(queue.name)
+
+        # Blobs that are no longer referenced are removed on the next save
+        s3_backend.delete_key('the-bucket', 'large')
+        state_store.save()
+        os.listdir(os.path.join(state_dir, 'blobs')).should.have.length_of(0)
+    finally:
+        shutil.rmtree(state_dir)
+        s3_backend.reset()
+        sqs_backends.reset()
+
+
+def test_save_and_load_spilled_blobs():
+    state_dir = tempfile.mkdtemp()
+    spill_threshold, memory_budget = blob_store.spill_threshold, blob_store.memory_budget
+    try:
+        s3_backend.reset()
+        blob_store.configure(spill_threshold=50)
+        s3_backend.create_bucket('the-bucket', 'us-east-1')
+        s3_backend.set_key('the-bucket', 'large', b'x' * 100)
+        blob = s3_backend.get_key('the-bucket', 'large').blob
+        blob.should.be.a(FileBlob)
+
+        state_store = StateStore(state_dir, BACKENDS, blob_threshold=1000)
+        state_store.save()
+        # The file is linked, rather than read and written again
+        saved_path = os.path.join(state_dir, 'blobs', os.path.basename(blob.path))
+        os.stat(saved_path).st_ino.should.equal(os.stat(blob.path).st_ino)
+
+        # The file of the blob is removed along with its last key
+        path = blob.path
+        del blob
+        s3_backend.reset()
+        os.path.exists(path).should_not.be.ok
+
+        state_store.load().should.be.ok
+        s3_backend.get_key('the-bucket', 'large').value.should.equal(b'x' * 100)
+    finally:
+        shutil.rmtree(state_dir)
+        s3_backend.reset()
+        blob_store.configure(spill_threshold, memory_budget)
+
+
+def test_save_backend_copies_by_value():
+    state_dir = tempfile.mkdtemp()
+    try:
+        sqs_backends.reset()
+        queue = sqs_backends['us-east-1'].create_queue('the-queue', 30, 0)
+        # Models can hold copies of a backend which are not registered anywhere
+        queue.backend_copy = copy.deepcopy(sqs_backends['us-east-1'])
+
+        state_store = StateStore(state_dir, BACKENDS)
+        state_store.save()
+        sqs_backends.reset()
+        state_store.load().should.be.ok
+
+        loaded_queue = sqs_backends['us-east-1'].get_queue('the-queue')
+        loaded_queue.backend_copy.should_not.be(sqs_backends['us-east-1'])
+        loaded_queue.backend_copy.queues.should.contain('the-queue')
+    finally:
+        shutil.rmtree(state_dir)
+        sqs_backends.reset()
+
+
+def test_load_without_saved_state():
+    state_dir = tempfile.mkdtemp()
+    try:
+        StateStore(state_dir, BACKENDS).load().should_not.be.ok
+    finally:
+        shutil.rmtree(state_dir)
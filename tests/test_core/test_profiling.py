@@ -0,0 +1,85 @@
+from __future__ import unicode_literals
+import os
+import shutil
+import tempfile
+
+import sure  # noqa
+from werkzeug.test import Client
+from werkzeug.wrappers import Response
+
+from moto.core.profiling import ActionProfiler, action_profiler, profile_actions
+from moto.core.utils import ResponseStream
+from moto.server import DomainDispatcherApplication, create_backend_app
+
+
+def slow_function():
+    return sum(range(1000))
+
+
+def test_only_selected_actions_are_profiled():
+    profiler = ActionProfiler()
+    profiler.enable(['sqs:SendMessage', 'Query'])
+    profiler.call('sqs', 'SendMessage', slow_function).should.equal(499500)
+    profiler.call('sqs', 'ReceiveMessage', slow_function)
+    profiler.call('dynamodb2', 'Query', slow_function)
+    sorted(profiler.stats).should.equal(['dynamodb2:Query', 'sqs:SendMessage'])
+    profiler.report('sqs:SendMessage').should.contain('slow_function')
+    profiler.report('sqs:ReceiveMessage').should.equal('')
+    # Reporting leaves the collected stats as they were
+    profiler.report().should.equal(profiler.report())
+
+
+def render_chunk():
+    return 'chunk'
+
+
+def test_streams_are_profiled_while_rendered():
+    profiler = ActionProfiler()
+    profiler.enable(['*'])
+    stream = profiler.call('sqs', 'ListQueues', lambda: ResponseStream(render_chunk() for _ in range(3)))
+    profiler.stats.should.be.empty
+    stream.join().should.equal(b'chunkchunkchunk')
+    profiler.report('sqs:ListQueues').should.contain('render_chunk')
+
+
+def test_dump_profiles():
+    profiler = ActionProfiler()
+    profiler.enable(['*'])
+    profiler.call('sqs', 'SendMessage', slow_function)
+    directory = tempfile.mkdtemp()
+    try:
+        profiler.dump(directory)
+        os.listdir(directory).should.equal(['sqs.SendMessage.prof'])
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_profile_actions_in_process():
+    action_profiler.reset()
+    test_client = create_backend_app("sqs").test_client()
+    with profile_actions('sqs:CreateQueue'):
+        test_client.action_data("CreateQueue", QueueName="the-queue")
+    test_client.action_data("ListQueues")
+    list(action_profiler.stats).should.equal(['sqs:CreateQueue'])
+    action_profiler.enabled.should.equal(False)
+    action_profiler.reset()
+
+
+def test_profile_actions_keeps_actions_profiled_before():
+    action_profiler.enable(['sqs:ListQueues'])
+    try:
+        with profile_actions('sqs:CreateQueue'):
+            action_profiler.actions.should.equal(set(['sqs:ListQueues', 'sqs:CreateQueue']))
+        action_profiler.actions.should.equal(set(['sqs:ListQueues']))
+    finally:
+        action_profiler.disable()
+
+
+def test_profile_endpoint():
+    client = Client(DomainDispatcherApplication(create_backend_app), Response)
+    client.post('/moto-api/profile', data={'actions': 'sqs:ListQueues'})
+    create_backend_app("sqs").test_client().action_data("ListQueues")
+    client.get('/moto-api/profile').get_data(as_text=True).should.contain('list_queues')
+    client.delete('/moto-api/profile')
+    action_profiler.enabled.should.equal(False)
+    action_profiler.stats.should.equal({})
@@ -0,0 +1,46 @@
+from __future__ import unicode_literals
+import boto
+import sure  # noqa
+
+from moto import mock_sqs
+from moto.core import BaseBackend, RegionBackends
+from moto.sqs.models import sqs_backends
+
+
+class ExampleBackend(BaseBackend):
+    def __init__(self, region_name):
+        self.region_name = region_name
+        self.things = []
+
+    def reset(self):
+        region_name = self.region_name
+        self.__dict__ = {}
+        self.__init__(region_name)
+
+
+def test_region_backends_are_created_on_first_use():
+    backends = RegionBackends(['us-east-1', 'eu-west-1'], ExampleBackend)
+    backends.created_backends().should.equal({})
+    backend = backends['eu-west-1']
+    backend.region_name.should.equal('eu-west-1')
+    backends['eu-west-1'].should.be(backend)
+    backends.created_backends().should.equal({'eu-west-1': backend})
+    sorted(backends).should.equal(['eu-west-1', 'us-east-1'])
+    backends.get('mars-north-1').should.be.none
+
+
+def test_region_backends_reset_only_created_regions():
+    backends = RegionBackends(['us-east-1', 'eu-west-1'], ExampleBackend)
+    backend = backends['us-east-1']
+    backend.things.append('thing')
+    backends.reset()
+    backends['us-east-1'].should.be(backend)
+    backend.things.should.equal([])
+    list(backends.created_backends()).should.equal(['us-east-1'])
+
+
+@mock_sqs
+def test_mock_only_creates_used_regions():
+    conn = boto.connect_sqs('the_key', 'the_secret')
+    conn.create_queue('a-queue')
+    sqs_backends.created_backends().should_not.contain('ap-southeast-2')
@@ -0,0 +1,96 @@
+from __future__ import unicode_literals
+
+import sure  # noqa
+
+from moto.core.responses import BaseResponse, TemplateRegistry, template_registry
+from moto.core.utils import join_response
+from moto.s3.responses import S3ResponseInstance
+
+TEMPLATE = "<Name>{{ name }}</Name>"
+
+
+class EscapingResponse(BaseResponse):
+    @property
+    def should_autoescape(self):
+        return True
+
+
+def test_response_template_is_compiled_once():
+    first = BaseResponse().response_template(TEMPLATE)
+    second = BaseResponse().response_template(TEMPLATE)
+    first.should.be(second)
+    S3ResponseInstance.response_template(TEMPLATE).should.be(first)
+    template_registry.contains(TEMPLATE).should.be.ok
+
+
+def test_response_template_keeps_autoescape_separate():
+    plain = BaseResponse().response_template(TEMPLATE)
+    escaped = EscapingResponse().response_template(TEMPLATE)
+    plain.should_not.be(escaped)
+    plain.render(name="a&b").should.equal("<Name>a&b</Name>")
+    escaped.render(name="a&b").should.equal("<Name>a&amp;b</Name>")
+
+
+def test_template_registry_warm():
+    registry = TemplateRegistry()
+    registry.contains(TEMPLATE).should_not.be.ok
+    registry.warm([TEMPLATE])
+    registry.contains(TEMPLATE).should.be.ok
+    registry.clear()
+    registry.contains(TEMPLATE).should_not.be.ok
+
+
+class ExampleResponse(BaseResponse):
+    def describe_things(self):
+        return "<Things/>"
+
+
+class ChildResponse(ExampleResponse):
+    def describe_other_things(self):
+        return "<OtherThings/>"
+
+
+def _call(response_class, querystring, headers=None):
+    response = response_class()
+    response.querystring = querystring
+    response.headers = headers or {}
+    response.response_headers = {}
+    return response.call_action()
+
+
+def test_call_action_uses_dispatch_table():
+    ExampleResponse.reset_action_counts()
+    _call(ExampleResponse, {'Action': ['DescribeThings']}).should.equal((200, {}, "<Things/>"))
+    _call(ExampleResponse, {}, {'X-Amz-Target': 'Service_20150101.DescribeThings'})
+    ExampleResponse.dispatch_table().get_handler_name('DescribeThings').should.equal('describe_things')
+    ExampleResponse.action_counts().should.equal({'DescribeThings': 2})
+
+
+def test_dispatch_table_is_per_class():
+    ChildResponse.dispatch_table().should_not.be(ExampleResponse.dispatch_table())
+    ExampleResponse.dispatch_table().get_handler_name('DescribeOtherThings').should.be.none
+    ChildResponse.dispatch_table().get_handler_name('DescribeOtherThings').should.equal('describe_other_things')
+
+
+def test_call_action_unknown_action():
+    _call.when.called_with(ExampleResponse, {'Action': ['DescribeNothing']}).should.throw(NotImplementedError)
+
+
+def test_response_stream_is_sent_in_chunks():
+    names = ['name-{0}'.format(index) for index in range(1000)]
+    stream = BaseResponse().response_stream("{% for name in names %}<Name>{{ name }}</Name>{% endfor %}", names=names)
+    stream.chunk_size = 1024
+    chunks = list(stream)
+    len(chunks).should.be.greater_than(1)
+    b''.join(chunks).should.equal(''.join('<Name>{0}</Name>'.format(name) for name in names).encode('utf-8'))
+
+
+def test_response_stream_is_joined_as_utf8():
+    stream = BaseResponse().response_stream(TEMPLATE, name="\u00e9t\u00e9")
+    join_response(stream).should.equal("<Name>\u00e9t\u00e9</Name>".encode('utf-8'))
+
+
+def test_response_stream_is_joined_for_the_mocks():
+    stream = BaseResponse().response_stream(TEMPLATE, name="the-name")
+    join_response(stream).should.equal(b"<Name>the-name</Name>")
+    join_response("<Name/>").should.equal("<Name/>")
@@ -1,8 +1,24 @@
 from __future__ import unicode_literals
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
 from mock import patch
+from nose.plugins.skip import SkipTest
+from six.moves import http_client
+from six.moves.queue import Queue
 import sure  # noqa
 
-from moto.server import main, create_backend_app, DomainDispatcherApplication
+from moto.backends import BACKENDS
+from moto.core.persistence import StateStore
+from moto.server import main, create_backend_app, DomainDispatcherApplication, IdleConnections, PooledWSGIServer
+from moto.sqs.models import sqs_backends
 
 
 def test_wrong_arguments():
@@ -48,3 +64,209 @@ def test_domain_dispatched_with_service():
     backend_app = dispatcher.get_application("s3.us-east1.amazonaws.com")
     keys = set(backend_app.view_functions.keys())
     keys.should.contain('ResponseObject.key_response')
+
+
+@patch('moto.server.save_state_on_exit')
+@patch('moto.server.StateStore')
+@patch('moto.server.run_simple')
+def test_state_dir_argument(run_simple, StateStore, save_state_on_exit):
+    main(["s3", "--state-dir", "/tmp/moto-state", "--snapshot-interval", "30"])
+    state_store = StateStore.return_value
+    StateStore.call_args[0][0].should.equal("/tmp/moto-state")
+    state_store.load.assert_called_once_with()
+    state_store.save_periodically.assert_called_once_with(30)
+    save_state_on_exit.assert_called_once_with(state_store)
+
+
+def _free_port():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def _request_when_up(port, path, timeout=30):
+    deadline = time.time() + timeout
+    while True:
+        try:
+            connection = http_client.HTTPConnection('127.0.0.1', port, timeout=5)
+            connection.request('GET', path, headers={'Host': 'sqs.us-east-1.amazonaws.com'})
+            return connection.getresponse().status
+        except socket.error:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def test_state_is_saved_on_sigterm():
+    state_dir = tempfile.mkdtemp()
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, '-c', 'from moto.server import main; main()',
+         'sqs', '--host', '127.0.0.1', '--port', str(port), '--state-dir', state_dir],
+        cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    try:
+        _request_when_up(port, '/?Action=CreateQueue&QueueName=saved-queue').should.equal(200)
+        server.send_signal(signal.SIGTERM)
+        server.wait().should.equal(0)
+
+        sqs_backends.reset()
+        StateStore(state_dir, BACKENDS).load().should.be.ok
+        sqs_backends['us-east-1'].get_queue('saved-queue').shouldnt.be.none
+    finally:
+        if server.poll() is None:
+            server.kill()
+            server.wait()
+        shutil.rmtree(state_dir)
+        sqs_backends.reset()
+
+
+def test_domain_dispatched_from_host_cache():
+    dispatcher = DomainDispatcherApplication(create_backend_app)
+    backend_app = dispatcher.get_application("sqs.us-east-1.amazonaws.com:5000")
+    dispatcher.host_apps.should.equal({"sqs.us-east-1.amazonaws.com": backend_app})
+    dispatcher.get_application("sqs.us-east-1.amazonaws.com").should.be(backend_app)
+    dispatcher.get_application("sqs.eu-west-1.amazonaws.com").should.be(backend_app)
+
+
+def test_domain_host_cache_is_bounded():
+    dispatcher = DomainDispatcherApplication(create_backend_app, service="sqs")
+    dispatcher.max_cached_hosts = 2
+    for region_name in ["us-east-1", "us-west-1", "eu-west-1"]:
+        dispatcher.get_application("sqs.{0}.amazonaws.com".format(region_name))
+    len(dispatcher.host_apps).should.equal(1)
+
+
+@patch('moto.server.PooledWSGIServer')
+@patch('moto.server.run_simple')
+def test_pooled_server_argument(run_simple, PooledWSGIServer):
+    main(["s3", "--server", "pooled", "--workers", "4", "--backlog", "64", "--idle-timeout", "10"])
+    run_simple.called.should.equal(False)
+    PooledWSGIServer.call_args[1].should.equal({"workers": 4, "backlog": 64, "idle_timeout": 10})
+    PooledWSGIServer.return_value.serve_forever.assert_called_once_with()
+
+
+def test_pooled_server_idle_connections_do_not_hold_workers():
+    app = DomainDispatcherApplication(create_backend_app, service='sqs')
+    server = PooledWSGIServer('127.0.0.1', 0, app, workers=1, idle_timeout=0.5)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    def connect():
+        return http_client.HTTPConnection('127.0.0.1', server.server_port, timeout=5)
+
+    try:
+        idle = connect()
+        idle.request('GET', '/moto-api/health')
+        idle.getresponse().read()
+
+        # The only worker is free while the first connection is idle
+        other = connect()
+        other.request('GET', '/moto-api/health')
+        other.getresponse().status.should.equal(200)
+        other.close()
+
+        # The idle connection still takes requests
+        idle.request('GET', '/moto-api/health')
+        idle.getresponse().status.should.equal(200)
+
+        # Until it times out
+        threading.Event().wait(1)
+        len(server.idle_connections.connections).should.equal(0)
+        idle.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class FileConnection(object):
+    """
+    Stands in for a keep-alive connection in IdleConnections
+    """
+
+    def __init__(self, fileno):
+        self._fileno = fileno
+
+    def fileno(self):
+        return self._fileno
+
+    def close(self):
+        try:
+            os.close(self._fileno)
+        except OSError:
+            pass
+
+
+def test_idle_connections_survive_broken_connections():
+    ready = Queue()
+    idle_connections = IdleConnections(ready.put, timeout=10)
+    try:
+        closed_socket = socket.socket()
+        closed_socket.close()
+        idle_connections.add(closed_socket)
+
+        receiver, sender = socket.socketpair()
+        closed_fileno = os.dup(receiver.fileno())
+        os.close(closed_fileno)
+        idle_connections.add(FileConnection(closed_fileno))
+
+        connection = FileConnection(os.dup(receiver.fileno()))
+        idle_connections.add(connection)
+        sender.send(b'GET')
+        while True:
+            if ready.get(timeout=5) is connection:
+                break
+        idle_connections.thread.is_alive().should.be.ok
+        receiver.close()
+        sender.close()
+    finally:
+        idle_connections.close()
+
+
+def test_idle_connections_watch_file_numbers_over_fd_setsize():
+    import resource
+    high_fileno = 4096
+    if resource.getrlimit(resource.RLIMIT_NOFILE)[0] <= high_fileno:
+        raise SkipTest
+    ready = Queue()
+    idle_connections = IdleConnections(ready.put, timeout=10)
+    receiver, sender = socket.socketpair()
+    try:
+        os.dup2(receiver.fileno(), high_fileno)
+        connection = FileConnection(high_fileno)
+        idle_connections.add(connection)
+        sender.send(b'GET')
+        ready.get(timeout=5).should.be(connection)
+        connection.close()
+    finally:
+        idle_connections.close()
+        receiver.close()
+        sender.close()
+
+
+def test_backend_app_debug_is_off_by_default():
+    create_backend_app("s3").debug.should.equal(False)
+    create_backend_app("s3", debug=True).debug.should.equal(True)
+
+
+@patch('moto.server.tenant_backends')
+@patch('moto.server.DomainDispatcherApplication')
+@patch('moto.server.run_simple')
+def test_tenant_header_argument(run_simple, DomainDispatcherApplication, tenant_backends):
+    main(["--tenant-header", "X-Moto-Tenant"])
+    tenant_backends.enable.assert_called_once_with()
+    kwargs = DomainDispatcherApplication.call_args[1]
+    kwargs["tenants"].should.equal(True)
+    kwargs["tenant_header"].should.equal("X-Moto-Tenant")
+
+
+def test_list_responses_are_streamed():
+    from moto.sqs.models import sqs_backends
+    sqs_backends['us-east-1'].create_queue('the-queue', 30, 0)
+    test_client = create_backend_app("sqs").test_client()
+    response = test_client.get('/?Action=ListQueues', headers={'Host': 'sqs.us-east-1.amazonaws.com'})
+    response.is_streamed.should.be.ok
+    response.get_data(as_text=True).should.contain('the-queue')
+    sqs_backends.reset()
@@ -0,0 +1,194 @@
+from __future__ import unicode_literals
+import boto
+import sure  # noqa
+
+from moto import mock_s3, mock_sqs
+from moto.core import BaseBackend, RegionBackends
+from moto.core.utils import Immutable, ResourceLock, TrackedDict
+from moto.s3.models import s3_backend
+from moto.sqs.models import sqs_backends
+
+
+class Thing(object):
+    def __init__(self, name, backend):
+        self.name = name
+        self.backend = backend
+
+
+class ExampleBackend(BaseBackend):
+    def __init__(self, region_name):
+        self.region_name = region_name
+        self.things = {}
+
+    def reset(self):
+        region_name = self.region_name
+        self.__dict__ = {}
+        self.__init__(region_name)
+
+    def create_thing(self, name):
+        self.things[name] = Thing(name, self)
+
+
+class LockedThing(object):
+    def __init__(self, name):
+        self.name = name
+        self.lock = ResourceLock()
+
+
+class TrackedBackend(BaseBackend):
+    def __init__(self):
+        self.things = TrackedDict()
+        self.plain_things = []
+
+    def create_thing(self, name):
+        self.things[name] = LockedThing(name)
+
+    def rename_thing(self, name, new_name):
+        thing = self.things[name]
+        with thing.lock:
+            thing.name = new_name
+
+
+def test_restore_backend_snapshot():
+    backend = ExampleBackend('us-east-1')
+    backend.create_thing('first')
+    snapshot = backend.snapshot()
+
+    backend.create_thing('second')
+    del backend.things['first']
+    backend.restore(snapshot)
+    list(backend.things).should.equal(['first'])
+    backend.things['first'].backend.should.be(backend)
+
+    # A snapshot can be restored more than once
+    backend.things['first'].name = 'changed'
+    backend.restore(snapshot)
+    backend.things['first'].name.should.equal('first')
+
+
+def test_snapshot_shares_immutable_values():
+    backend = ExampleBackend('us-east-1')
+    backend.body = Immutable()
+    snapshot = backend.snapshot()
+
+    body = backend.body
+    backend.reset()
+    backend.restore(snapshot)
+    backend.body.should.be(body)
+
+
+def test_restore_region_backends_snapshot():
+    backends = RegionBackends(['us-east-1', 'eu-west-1'], ExampleBackend)
+    backends['us-east-1'].create_thing('first')
+    snapshot = backends.snapshot()
+
+    backends['eu-west-1'].create_thing('second')
+    backends.restore(snapshot)
+    list(backends['us-east-1'].things).should.equal(['first'])
+    backends['eu-west-1'].things.should.equal({})
+
+
+def test_mock_snapshot():
+    mock = mock_sqs()
+    mock.start()
+    try:
+        conn = boto.connect_sqs('the_key', 'the_secret')
+        conn.create_queue('setup-queue')
+        snapshot = mock.snapshot()
+
+        conn.create_queue('test-queue')
+        mock.restore(snapshot)
+        [queue.name for queue in conn.get_all_queues()].should.equal(['setup-queue'])
+    finally:
+        mock.reset()
+        mock.stop()
+
+
+def test_restore_only_loads_changed_entries():
+    backend = TrackedBackend()
+    for name in ['kept', 'renamed', 'deleted']:
+        backend.create_thing(name)
+    backend.plain_things.append('plain')
+    snapshot = backend.snapshot()
+    kept = backend.things['kept']
+
+    backend.rename_thing('renamed', 'changed')
+    del backend.things['deleted']
+    backend.create_thing('added')
+    backend.plain_things.append('added')
+    backend.restore(snapshot)
+
+    sorted(backend.things).should.equal(['deleted', 'kept', 'renamed'])
+    backend.things['kept'].should.be(kept)
+    backend.things['renamed'].name.should.equal('renamed')
+    backend.plain_things.should.equal(['plain'])
+
+    # Changes to the restored entries are tracked too
+    renamed = backend.things['renamed']
+    backend.rename_thing('renamed', 'changed again')
+    backend.restore(snapshot)
+    backend.things['renamed'].should_not.be(renamed)
+    backend.things['renamed'].name.should.equal('renamed')
+    backend.things['kept'].should.be(kept)
+
+
+def test_restore_other_snapshot_in_full():
+    backend = TrackedBackend()
+    backend.create_thing('first')
+    first = backend.snapshot()
+    backend.create_thing('second')
+    second = backend.snapshot()
+
+    backend.restore(first)
+    sorted(backend.things).should.equal(['first'])
+    backend.restore(second)
+    sorted(backend.things).should.equal(['first', 'second'])
+    backend.reset()
+    backend.restore(first)
+    sorted(backend.things).should.equal(['first'])
+
+    # Restoring in full makes it the snapshot to track changes from
+    first_thing = backend.things['first']
+    backend.create_thing('third')
+    backend.restore(first)
+    backend.things['first'].should.be(first_thing)
+
+
+@mock_sqs
+def test_restore_sqs_queues_that_changed():
+    conn = boto.connect_sqs('the_key', 'the_secret')
+    conn.create_queue('untouched-queue')
+    conn.create_queue('used-queue')
+    snapshot = sqs_backends.snapshot()
+    untouched = sqs_backends['us-east-1'].get_queue('untouched-queue')
+
+    queue = conn.get_queue('used-queue')
+    queue.write(queue.new_message('a message'))
+    conn.get_queue('untouched-queue').set_attribute('VisibilityTimeout', 60)
+    conn.create_queue('new-queue')
+    sqs_backends.restore(snapshot)
+
+    backend = sqs_backends['us-east-1']
+    sorted(backend.queues).should.equal(['untouched-queue', 'used-queue'])
+    backend.get_queue('used-queue').messages.should.equal([])
+    backend.get_queue('untouched-queue').should_not.be(untouched)
+    backend.get_queue('untouched-queue').visibility_timeout.should.equal(30)
+
+
+@mock_s3
+def test_restore_s3_buckets_that_changed():
+    conn = boto.connect_s3('the_key', 'the_secret')
+    conn.create_bucket('untouched-bucket')
+    bucket = conn.create_bucket('used-bucket')
+    bucket.new_key('the-key').set_contents_from_string('original')
+    snapshot = s3_backend.snapshot()
+    untouched = s3_backend.get_bucket('untouched-bucket')
+
+    bucket.new_key('the-key').set_contents_from_string('changed')
+    bucket.new_key('the-key').set_acl('public-read')
+    bucket.new_key('new-key').set_contents_from_string('new')
+    s3_backend.restore(snapshot)
+
+    s3_backend.get_bucket('untouched-bucket').should.be(untouched)
+    s3_backend.get_key('used-bucket', 'the-key').value.should.equal(b'original')
+    s3_backend.get_key('used-bucket', 'new-key').should.be.none
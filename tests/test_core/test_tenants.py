@@ -0,0 +1,126 @@
+from __future__ import unicode_literals
+import copy
+import pickle
+
+import sure  # noqa
+from werkzeug.test import Client, EnvironBuilder
+from werkzeug.wrappers import Response
+
+from moto.core import BaseBackend
+from moto.core.tenants import get_tenant, tenant_backends
+from moto.s3.models import s3_backend, s3_backends
+from moto.server import DomainDispatcherApplication, create_backend_app
+from moto.sqs.models import sqs_backends
+
+SQS_HOST = 'sqs.us-east-1.amazonaws.com'
+
+
+def environ(**kwargs):
+    return EnvironBuilder(**kwargs).get_environ()
+
+
+def test_tenant_from_access_key():
+    get_tenant(environ(headers={'Authorization': 'AWS the_key:signature'})).should.equal('the_key')
+    get_tenant(environ(headers={
+        'Authorization': 'AWS4-HMAC-SHA256 Credential=the_key/20150101/us-east-1/s3/aws4_request, '
+                         'SignedHeaders=host, Signature=signature',
+    })).should.equal('the_key')
+    get_tenant(environ(query_string={'AWSAccessKeyId': 'the_key'})).should.equal('the_key')
+    get_tenant(environ(method='POST', data={'AWSAccessKeyId': 'the_key'})).should.equal('the_key')
+    get_tenant(environ()).should.be.none
+
+
+def test_tenant_from_header():
+    get_tenant(environ(headers={'X-Moto-Tenant': 'worker-1'}), header='X-Moto-Tenant').should.equal('worker-1')
+
+
+def test_tenants_have_separate_state():
+    tenant_backends.enable()
+    try:
+        client = Client(DomainDispatcherApplication(create_backend_app, tenants=True), Response)
+
+        def call(access_key, action, **params):
+            params.update(Action=action, AWSAccessKeyId=access_key)
+            response = client.post('/', data=params, headers={'Host': SQS_HOST})
+            return response.get_data(as_text=True)
+
+        call('first_key', 'CreateQueue', QueueName='first-queue')
+        call('second_key', 'CreateQueue', QueueName='second-queue')
+        call('first_key', 'ListQueues').should.contain('first-queue')
+        call('first_key', 'ListQueues').should_not.contain('second-queue')
+        sqs_backends['us-east-1'].queues.should_not.contain('first-queue')
+
+        client.post('/moto-api/reset-tenant', data={'AWSAccessKeyId': 'first_key'}, headers={'Host': SQS_HOST})
+        call('first_key', 'ListQueues').should_not.contain('first-queue')
+        call('second_key', 'ListQueues').should.contain('second-queue')
+    finally:
+        tenant_backends.disable()
+
+
+def test_tenants_describe_instances():
+    tenant_backends.enable()
+    try:
+        client = Client(DomainDispatcherApplication(create_backend_app, tenants=True), Response)
+
+        def call(access_key, action, **params):
+            params.update(Action=action, AWSAccessKeyId=access_key)
+            return client.post('/', data=params, headers={'Host': 'ec2.us-east-1.amazonaws.com'})
+
+        call('first_key', 'RunInstances', ImageId='ami-1234abcd', MinCount=1, MaxCount=1)
+        response = call('first_key', 'DescribeInstances')
+        response.status_code.should.equal(200)
+        response.get_data(as_text=True).should.contain('ami-1234abcd')
+        call('second_key', 'DescribeInstances').get_data(as_text=True).should_not.contain('ami-1234abcd')
+    finally:
+        tenant_backends.disable()
+
+
+def test_other_backend_objects_are_not_redirected():
+    tenant_backends.enable()
+    try:
+        with tenant_backends.activate('the_tenant'):
+            sqs_backends['us-east-1'].create_queue('tenant-queue', 30, 0)
+            copied = copy.deepcopy(sqs_backends['us-east-1'])
+            restored = pickle.loads(pickle.dumps(sqs_backends['us-east-1']))
+
+            copied.queues.should.contain('tenant-queue')
+            restored.queues.should.contain('tenant-queue')
+            copied.queues.should_not.be(sqs_backends['us-east-1'].queues)
+    finally:
+        tenant_backends.disable()
+
+
+def test_disable_twice():
+    tenant_backends.enable()
+    tenant_backends.enable()
+    tenant_backends.disable()
+    tenant_backends.disable()
+
+    tenant_backends.enabled.should.be.false
+
+
+def test_tenants_have_their_own_global_backends():
+    tenant_backends.enable()
+    try:
+        with tenant_backends.activate('the_tenant'):
+            s3_backends['global'].create_bucket('tenant-bucket', 'us-east-1')
+            s3_backends['global'].buckets.should.contain('tenant-bucket')
+            s3_backends.created_backends().should.have.key('global').being.equal(s3_backends['global'])
+        s3_backend.buckets.should_not.contain('tenant-bucket')
+        s3_backends['global'].should.be(s3_backend)
+        BaseBackend.__dict__.should_not.contain('__getattribute__')
+    finally:
+        tenant_backends.disable()
+
+
+def test_streamed_bodies_are_rendered_as_the_tenant():
+    def streaming_app(environ, start_response):
+        start_response('200 OK', [])
+        # Rendered as the body is sent
+        return (tenant_backends.current_tenant.encode('utf-8') for _ in range(1))
+
+    dispatcher = DomainDispatcherApplication(lambda service: streaming_app, service='sqs', tenants=True)
+    client = Client(dispatcher, Response)
+    response = client.get('/?AWSAccessKeyId=the_key', headers={'Host': SQS_HOST})
+    response.get_data(as_text=True).should.equal('the_key')
+    tenant_backends.current_tenant.should.be.none
@@ -0,0 +1,60 @@
+from __future__ import unicode_literals
+import threading
+
+import sure  # noqa
+
+from moto import mock_sqs
+from moto.core.models import MockAWS
+from moto.sqs.models import sqs_backends
+
+
+def test_threads_have_separate_state():
+    # Other tests may have left queues in the shared backend
+    sqs_backends.reset()
+    MockAWS.enable_thread_isolation()
+    try:
+        first_created = threading.Event()
+        second_done = threading.Event()
+        queue_names = {}
+
+        def first_test():
+            with mock_sqs():
+                sqs_backends['us-east-1'].create_queue('first-queue', 30, 0)
+                first_created.set()
+                second_done.wait()
+                queue_names['first-queue'] = list(sqs_backends['us-east-1'].queues)
+
+        def second_test():
+            first_created.wait()
+            with mock_sqs():
+                sqs_backends['us-east-1'].create_queue('second-queue', 30, 0)
+                queue_names['second-queue'] = list(sqs_backends['us-east-1'].queues)
+            second_done.set()
+
+        threads = [threading.Thread(target=first_test), threading.Thread(target=second_test)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        queue_names.should.equal({
+            'first-queue': ['first-queue'],
+            'second-queue': ['second-queue'],
+        })
+        sqs_backends['us-east-1'].queues.should.be.empty
+    finally:
+        MockAWS.disable_thread_isolation()
+
+
+def test_mocks_stay_active_while_another_thread_stops():
+    mock = mock_sqs()
+    mock.start()
+    try:
+        other = threading.Thread(target=lambda: mock_sqs()(lambda: None)())
+        other.start()
+        other.join()
+        MockAWS.active_threads.should.equal(1)
+        mock.nested_count.should.equal(1)
+    finally:
+        mock.stop()
+    MockAWS.active_threads.should.equal(0)
@@ -0,0 +1,92 @@
+from __future__ import unicode_literals
+import boto
+import requests
+import sure  # noqa
+from httpretty import HTTPretty, URIInfo
+
+from moto import mock_sqs
+from moto.core.models import CompiledURLs
+from moto.ec2 import ec2_backend
+
+
+def bucket_handler(request, full_url, headers):
+    return 200, headers, 'bucket'
+
+
+def key_handler(request, full_url, headers):
+    return 200, headers, 'key'
+
+
+class FakeRequest(object):
+    def __init__(self, method):
+        self.method = method
+
+
+def head_handler(request, full_url, headers):
+    headers['Content-Length'] = '100'
+    return 200, headers, ''
+
+
+def test_compiled_urls_dispatch_to_matching_handler():
+    compiled = CompiledURLs({
+        'https?://(?P<bucket_name>[a-z]+).s3.amazonaws.com/$': bucket_handler,
+        'https?://(?P<bucket_name>[a-z]+).s3.amazonaws.com/(?P<key_name>.+)': key_handler,
+    })
+    request = FakeRequest('GET')
+    compiled.dispatch(request, 'http://foo.s3.amazonaws.com/?acl', {})[2].should.equal('bucket')
+    compiled.dispatch(request, 'http://foo.s3.amazonaws.com/the-key', {})[2].should.equal('key')
+
+
+def test_compiled_urls_keep_content_length_of_head_responses():
+    compiled = CompiledURLs({'https?://foo.s3.amazonaws.com/.+': head_handler})
+    status, headers, body = compiled.dispatch(
+        FakeRequest('HEAD'), 'http://foo.s3.amazonaws.com/the-key', {})
+    # As HTTPretty does with the length of the body
+    headers.update({'content-length': len(body)})
+    dict(headers).should.equal({'content-length': '100'})
+
+
+def test_httpretty_sends_content_length_of_head_responses():
+    # Relies on how HTTPretty sets the Content-Length of callable bodies,
+    # see HeadResponseHeaders
+    compiled = CompiledURLs({'https?://foo.s3.amazonaws.com/.+': head_handler})
+    HTTPretty.enable()
+    try:
+        HTTPretty.register_uri(HTTPretty.HEAD, compiled.regex, body=compiled.dispatch)
+        response = requests.head('http://foo.s3.amazonaws.com/the-key')
+    finally:
+        HTTPretty.disable()
+        HTTPretty.reset()
+    response.headers['content-length'].should.equal('100')
+    response.content.should.equal(b'')
+
+
+def test_compiled_urls_are_cached_per_service():
+    ec2_backend.compiled_urls.should.be(ec2_backend.compiled_urls)
+
+
+def entries_for(url):
+    matcher, _ = HTTPretty.match_uriinfo(URIInfo.from_uri(url, None))
+    return len(matcher.entries)
+
+
+@mock_sqs
+def test_nested_mocks_register_each_service_once():
+    url = 'https://queue.amazonaws.com/'
+    entries = entries_for(url)
+    with mock_sqs():
+        entries_for(url).should.equal(entries)
+    with mock_sqs():
+        entries_for(url).should.equal(entries)
+        conn = boto.connect_sqs('the_key', 'the_secret')
+        conn.create_queue('a-queue')
+        conn.get_all_queues().should.have.length_of(1)
+
+
+@mock_sqs
+def test_urls_are_registered_again_after_httpretty_reset():
+    HTTPretty.reset()
+    with mock_sqs():
+        conn = boto.connect_sqs('the_key', 'the_secret')
+        conn.create_queue('a-queue')
+        conn.get_all_queues().should.have.length_of(1)
@@ -3,7 +3,9 @@ from __future__ import unicode_literals
 import sure  # noqa
 from freezegun import freeze_time
 
-from moto.core.utils import camelcase_to_underscores, underscores_to_camelcase, unix_time
+from moto.core.utils import (
+    camelcase_to_underscores, underscores_to_camelcase, unix_time, Querystring,
+    get_tree_node, tree_members, tree_value, flatten_tree)
 
 
 def test_camelcase_to_underscores():
@@ -27,3 +29,33 @@ def test_underscores_to_camelcase():
 @freeze_time("2015-01-01 12:00:00")
 def test_unix_time():
     unix_time().should.equal(1420113600.0)
+
+
+def test_querystring_tree():
+    querystring = Querystring({
+        'Action': ['RunInstances'],
+        'Filter.1.Name': ['tag:Name'],
+        'Filter.1.Value.1': ['a'],
+        'Filter.1.Value.2': ['b'],
+        'Filter.10.Name': ['vpc-id'],
+        'Filter.10.Value': ['vpc-1'],
+    })
+    querystring.tree.should.equal({
+        'Action': ['RunInstances'],
+        'Filter': {
+            '1': {'Name': ['tag:Name'], 'Value': {'1': ['a'], '2': ['b']}},
+            '10': {'Name': ['vpc-id'], 'Value': ['vpc-1']},
+        },
+    })
+    filters = tree_members(get_tree_node(querystring, 'Filter'))
+    [tree_value(f['Name']) for f in filters].should.equal(['tag:Name', 'vpc-id'])
+    dict(flatten_tree(filters[0])).should.equal({
+        'Name': ['tag:Name'], 'Value.1': ['a'], 'Value.2': ['b']})
+
+
+def test_querystring_tree_is_rebuilt_after_changes():
+    querystring = Querystring({'Tag.1.Key': ['a']})
+    get_tree_node(querystring, 'Tag.1.Key').should.equal(['a'])
+    querystring['Tag.1'] = ['both']
+    tree_value(get_tree_node(querystring, 'Tag.1')).should.equal('both')
+    get_tree_node(querystring, 'Tag.1.Key').should.equal(['a'])
@@ -6,3 +6,26 @@ def test_random_key_pair():
     assert len(key_pair['fingerprint']) == 59
     assert key_pair['material'].startswith('---- BEGIN RSA PRIVATE KEY ----')
     assert key_pair['material'].endswith('-----END RSA PRIVATE KEY-----')
+
+
+def test_filters_from_querystring():
+    querystring = dict(
+        ('Filter.{0}.Name'.format(index), ['filter-{0}'.format(index)])
+        for index in range(1, 13))
+    querystring['Filter.11.Value.1'] = ['a']
+    querystring['Filter.11.Value.2'] = ['b']
+    filters = utils.filters_from_querystring(querystring)
+    assert len(filters) == 12
+    assert filters['filter-11'] == ['a', 'b']
+    assert filters['filter-1'] == []
+
+
+def test_tags_from_query_string():
+    querystring = {
+        'ResourceId.1': ['i-1234'],
+        'Tag.1.Key': ['Name'],
+        'Tag.1.Value': ['web'],
+        'Tag.2.Key': ['empty'],
+    }
+    assert utils.tags_from_query_string(querystring) == {'Name': 'web', 'empty': None}
+    assert utils.sequence_from_querystring('ResourceId', querystring) == ['i-1234']
@@ -307,6 +307,20 @@ def test_empty_key_set_on_existing_key():
     bucket.get_key("the-key").get_contents_as_string().should.equal(b'')
 
 
+@mock_s3
+def test_head_key_sends_length_of_body():
+    conn = boto.connect_s3('the_key', 'the_secret')
+    bucket = conn.create_bucket("foobar")
+    key = Key(bucket)
+    key.key = "the-key"
+    key.set_contents_from_string("x" * 100)
+
+    response = requests.head("https://foobar.s3.amazonaws.com/the-key")
+    response.status_code.should.equal(200)
+    response.headers['content-length'].should.equal('100')
+    response.content.should.equal(b'')
+
+
 @mock_s3
 def test_large_key_save():
     conn = boto.connect_s3('the_key', 'the_secret')
@@ -0,0 +1,224 @@
+from __future__ import unicode_literals
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+
+import sure  # noqa
+
+from moto.s3.blobs import BlobStore, FileBlob, MemoryBlob, SegmentedBlob
+from moto.s3.models import FakeKey, S3Backend, UPLOAD_PART_MIN_SIZE
+
+
+def with_store(**kwargs):
+    def decorator(test):
+        def wrapper():
+            directory = tempfile.mkdtemp()
+            try:
+                test(BlobStore(directory=directory, **kwargs))
+            finally:
+                shutil.rmtree(directory)
+        wrapper.__name__ = test.__name__
+        return wrapper
+    return decorator
+
+
+@with_store(spill_threshold=10)
+def test_small_blobs_stay_in_memory(store):
+    blob = store.put(b'small')
+
+    blob.should.be.a(MemoryBlob)
+    blob.read().should.equal(b'small')
+    store.memory_used.should.equal(5)
+    del blob
+    store.memory_used.should.equal(0)
+
+
+@with_store(spill_threshold=10)
+def test_large_blobs_spill_to_disk(store):
+    data = b'0123456789' * 5
+    blob = store.put(data)
+
+    blob.should.be.a(FileBlob)
+    os.path.exists(blob.path).should.be.true
+    blob.size.should.equal(50)
+    blob.md5.should.equal(hashlib.md5(data).hexdigest())
+    blob.read().should.equal(data)
+    blob.read_range(10, 15).should.equal(b'01234')
+    list(blob.iter_chunks(5, 30, chunk_size=10)).should.equal([data[5:15], data[15:25], data[25:30]])
+    store.memory_used.should.equal(0)
+
+
+@with_store(spill_threshold=10)
+def test_identical_blobs_share_a_file(store):
+    first = store.put(b'x' * 20)
+    second = store.put(b'x' * 20)
+    first.path.should.equal(second.path)
+
+    path = first.path
+    del first
+    os.path.exists(path).should.be.true
+    del second
+    os.path.exists(path).should.be.false
+
+
+@with_store(spill_threshold=None, memory_budget=10)
+def test_memory_budget(store):
+    kept = store.put(b'12345678')
+    spilled = store.put(b'123')
+
+    kept.should.be.a(MemoryBlob)
+    spilled.should.be.a(FileBlob)
+    spilled.read().should.equal(b'123')
+
+
+@with_store(spill_threshold=None, memory_budget=100)
+def test_concurrent_puts_stay_within_the_memory_budget(store):
+    blobs = []
+
+    def put_bodies():
+        for _ in range(50):
+            blobs.append(store.put(b'x' * 10))
+
+    threads = [threading.Thread(target=put_bodies) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    kept = [blob for blob in blobs if isinstance(blob, MemoryBlob)]
+    len(kept).should.equal(10)
+    store.memory_used.should.equal(100)
+
+
+@with_store(spill_threshold=None, memory_budget=100)
+def test_put_chunks_counts_its_body_once(store):
+    blob = store.put_chunks([b'12345', b'678'], 8)
+
+    blob.should.be.a(MemoryBlob)
+    blob.read().should.equal(b'12345678')
+    store.memory_used.should.equal(8)
+
+
+@with_store(spill_threshold=10)
+def test_blobs_pickle_with_their_contents(store):
+    blob = store.put(b'y' * 5)
+
+    restored = pickle.loads(pickle.dumps(blob))
+    restored.read().should.equal(b'y' * 5)
+
+
+@with_store(spill_threshold=10)
+def test_file_blobs_pickle_by_path(store):
+    blob = store.put(b'y' * 20)
+
+    pickled = pickle.dumps(blob)
+    pickled.shouldnt.contain(b'y' * 20)
+    restored = pickle.loads(pickled)
+    restored.should.be.a(FileBlob)
+    restored.read().should.equal(b'y' * 20)
+    restored.md5.should.equal(blob.md5)
+
+
+@with_store(spill_threshold=10)
+def test_opened_files_are_counted(store):
+    blob = store.put(b'y' * 20)
+    path = blob.path
+
+    opened = store.open_file(path, blob.size, blob.md5)
+    opened.path.should.equal(path)
+    del blob
+    os.path.exists(path).should.be.true
+    del opened
+    os.path.exists(path).should.be.false
+
+
+@with_store(spill_threshold=10)
+def test_files_from_elsewhere_are_linked_into_the_store(store):
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'the-hash')
+        with open(path, 'wb') as outside_file:
+            outside_file.write(b'y' * 20)
+
+        blob = store.open_file(path, 20, hashlib.md5(b'y' * 20).hexdigest())
+        blob.path.should.equal(os.path.join(store.directory, 'the-hash'))
+        os.remove(path)
+        blob.read().should.equal(b'y' * 20)
+    finally:
+        shutil.rmtree(directory)
+
+
+@with_store(spill_threshold=10)
+def test_key_size_and_etag_do_not_read_the_body(store):
+    data = b'z' * 100
+    key = FakeKey('the-key', store.put(data))
+
+    def fail(*args):
+        raise AssertionError('The body was read')
+    key.blob.read_range = fail
+
+    key.size.should.equal(100)
+    key.etag.should.equal('"{0}"'.format(hashlib.md5(data).hexdigest()))
+
+
+def test_blob_store_from_environment():
+    store = BlobStore.from_environment({
+        'MOTO_S3_SPILL_THRESHOLD': '1024',
+        'MOTO_S3_MEMORY_BUDGET': '4096',
+    })
+
+    store.spill_threshold.should.equal(1024)
+    store.memory_budget.should.equal(4096)
+
+
+@with_store(spill_threshold=10)
+def test_segmented_blobs_read_their_segments(store):
+    blob = SegmentedBlob([store.put(b'abc'), store.put(b'0123456789' * 2), store.put(b''), store.put(b'xyz')])
+
+    blob.size.should.equal(26)
+    blob.read().should.equal(b'abc' + b'0123456789' * 2 + b'xyz')
+    blob.read_range(2, 5).should.equal(b'c01')
+    blob.read_range(22, 26).should.equal(b'9xyz')
+    b''.join(bytes(chunk) for chunk in blob.iter_chunks(1, 25, chunk_size=4)).should.equal(blob.read()[1:25])
+    blob.md5.should.equal(hashlib.md5(blob.read()).hexdigest())
+    pickle.loads(pickle.dumps(blob)).read().should.equal(blob.read())
+
+
+def test_completed_multipart_upload_keeps_its_parts():
+    backend = S3Backend()
+    backend.create_bucket('the-bucket', 'us-east-1')
+    backend.set_key('the-bucket', 'source', b'tail')
+    multipart = backend.initiate_multipart('the-bucket', 'the-key', {})
+    first = backend.set_part('the-bucket', multipart.id, 1, b'0' * UPLOAD_PART_MIN_SIZE)
+    second = backend.copy_part('the-bucket', multipart.id, 2, 'the-bucket', 'source')
+    second.blob.should.be(backend.get_key('the-bucket', 'source').blob)
+
+    key = backend.complete_multipart('the-bucket', multipart.id, [(1, first.etag), (2, second.etag)])
+
+    key.blob.segments.should.equal([first.blob, second.blob])
+    key.size.should.equal(UPLOAD_PART_MIN_SIZE + 4)
+    key.etag.should.match(r'"[0-9a-f]{32}-2"')
+    key.blob.read_range(UPLOAD_PART_MIN_SIZE - 1, UPLOAD_PART_MIN_SIZE + 4).should.equal(b'0tail')
+
+
+def test_copied_keys_share_their_body():
+    backend = S3Backend()
+    backend.create_bucket('source', 'us-east-1')
+    backend.create_bucket('destination', 'us-east-1')
+    source = backend.set_key('source', 'the-key', b'the body', storage='STANDARD')
+    source.set_metadata({'x-amz-meta-color': 'blue'})
+    etag = source.etag
+
+    backend.copy_key('source', 'the-key', 'destination', 'the-key', storage='GLACIER')
+    copied = backend.get_key('destination', 'the-key')
+    copied.set_metadata({'x-amz-meta-color': 'red'})
+
+    copied.blob.should.be(source.blob)
+    copied._etag.should.equal(source._etag)
+    copied.etag.should.equal(etag)
+    copied.storage_class.should.equal('GLACIER')
+    source.storage_class.should.equal('STANDARD')
+    source.metadata.should.equal({'x-amz-meta-color': 'blue'})
@@ -50,3 +50,69 @@ def test_versioned_key_store():
     d.setlist('key', [[1], [2]])
     d['key'].should.have.length_of(1)
     d.getlist('key').should.be.equal([[1], [2]])
+
+
+def test_versioned_key_store_list_keys():
+    d = _VersionedKeyStore()
+    for name in ['photos/2015/a', 'photos/2015/b', 'photos/2016/a', 'readme', 'zebra', 'photos/index']:
+        d[name] = name.upper()
+    d['readme'] = 'README2'
+
+    keys, prefixes, is_truncated, next_marker = d.list_keys(delimiter='/')
+    keys.should.equal(['README2', 'ZEBRA'])
+    prefixes.should.equal(['photos/'])
+    is_truncated.should.be.false
+
+    keys, prefixes, is_truncated, next_marker = d.list_keys(prefix='photos/', delimiter='/')
+    keys.should.equal(['PHOTOS/INDEX'])
+    prefixes.should.equal(['photos/2015/', 'photos/2016/'])
+
+    keys, prefixes, is_truncated, next_marker = d.list_keys(prefix='photos/', delimiter='/', max_keys=1)
+    prefixes.should.equal(['photos/2015/'])
+    is_truncated.should.be.true
+    next_marker.should.equal('photos/2015/')
+
+    keys, prefixes, is_truncated, next_marker = d.list_keys(
+        prefix='photos/', delimiter='/', marker=next_marker, max_keys=1)
+    prefixes.should.equal(['photos/2016/'])
+    is_truncated.should.be.true
+
+    keys, prefixes, is_truncated, next_marker = d.list_keys(
+        prefix='photos/', delimiter='/', marker=next_marker, max_keys=1)
+    keys.should.equal(['PHOTOS/INDEX'])
+    is_truncated.should.be.false
+
+    keys, prefixes, is_truncated, next_marker = d.list_keys(marker='photos/2016/a')
+    keys.should.equal(['PHOTOS/INDEX', 'README2', 'ZEBRA'])
+
+    keys, prefixes, is_truncated, next_marker = d.list_keys(max_keys=0)
+    keys.should.equal([])
+    is_truncated.should.be.false
+
+    del d['zebra']
+    d.pop('readme')
+    d.list_keys()[0].should.equal(['PHOTOS/2015/A', 'PHOTOS/2015/B', 'PHOTOS/2016/A', 'PHOTOS/INDEX'])
+
+
+def test_versioned_key_store_update_and_setdefault():
+    d = _VersionedKeyStore()
+    d['b'] = 1
+    d.update({'a': 2, 'b': 3})
+    d.setdefault('c', 4).should.equal(4)
+    d.setdefault('a', 5).should.equal(2)
+
+    d.getlist('b').should.equal([1, 3])
+    d.list_keys()[0].should.equal([2, 3, 4])
+
+
+def test_versioned_key_store_pickles_every_version():
+    import pickle
+
+    d = _VersionedKeyStore()
+    d['key'] = 1
+    d['key'] = 2
+    d['other'] = 3
+
+    restored = pickle.loads(pickle.dumps(d))
+    restored.getlist('key').should.equal([1, 2])
+    restored.list_keys()[0].should.equal([2, 3])
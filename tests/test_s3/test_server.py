@@ -1,7 +1,13 @@
 from __future__ import unicode_literals
+import re
+import threading
+
 import sure  # noqa
+from six.moves import http_client
+from werkzeug.serving import make_server
 
 import moto.server as server
+from moto.core.metrics import get_metrics, reset_metrics
 
 '''
 Test the different server responses
@@ -64,3 +70,204 @@ def test_s3_server_post_to_bucket():
     res = test_client.get('/the-key', 'http://tester.localhost:5000/')
     res.status_code.should.equal(200)
     res.data.should.equal(b"nothing")
+
+
+def test_s3_server_list_objects_pages():
+    backend = server.create_backend_app("s3")
+    test_client = backend.test_client()
+
+    test_client.put('/', 'http://pager.localhost:5000/')
+    for name in ['a', 'b', 'c']:
+        test_client.put('/' + name, 'http://pager.localhost:5000/', data='value')
+
+    res = test_client.get('/?max-keys=2', 'http://pager.localhost:5000/')
+    res.data.should.contain(b'<IsTruncated>true</IsTruncated>')
+    res.data.should.contain(b'<MaxKeys>2</MaxKeys>')
+    res.data.should.contain(b'<Key>b</Key>')
+    res.data.shouldnt.contain(b'<Key>c</Key>')
+
+    res = test_client.get('/?max-keys=2&marker=b', 'http://pager.localhost:5000/')
+    res.data.should.contain(b'<IsTruncated>false</IsTruncated>')
+    res.data.should.contain(b'<Key>c</Key>')
+    res.data.shouldnt.contain(b'<Key>b</Key>')
+
+
+def test_s3_server_list_objects_v2_continuation():
+    backend = server.create_backend_app("s3")
+    test_client = backend.test_client()
+
+    test_client.put('/', 'http://pagerv2.localhost:5000/')
+    for name in ['a', 'b', 'c']:
+        test_client.put('/' + name, 'http://pagerv2.localhost:5000/', data='value')
+
+    res = test_client.get('/?list-type=2&max-keys=2', 'http://pagerv2.localhost:5000/')
+    res.data.should.contain(b'<KeyCount>2</KeyCount>')
+    res.data.should.contain(b'<IsTruncated>true</IsTruncated>')
+    token = re.search(b'<NextContinuationToken>(.+)</NextContinuationToken>', res.data).group(1)
+
+    res = test_client.get(
+        '/?list-type=2&max-keys=2&continuation-token=' + token.decode('utf-8'),
+        'http://pagerv2.localhost:5000/')
+    res.data.should.contain(b'<KeyCount>1</KeyCount>')
+    res.data.should.contain(b'<Key>c</Key>')
+    res.data.should.contain(b'<IsTruncated>false</IsTruncated>')
+
+
+def test_s3_server_list_objects_max_keys():
+    backend = server.create_backend_app("s3")
+    test_client = backend.test_client()
+
+    test_client.put('/', 'http://maxkeys.localhost:5000/')
+    test_client.put('/a', 'http://maxkeys.localhost:5000/', data='value')
+
+    res = test_client.get('/?list-type=2&max-keys=0', 'http://maxkeys.localhost:5000/')
+    res.status_code.should.equal(200)
+    res.data.should.contain(b'<KeyCount>0</KeyCount>')
+    res.data.should.contain(b'<IsTruncated>false</IsTruncated>')
+    res.data.shouldnt.contain(b'NextContinuationToken')
+
+    res = test_client.get('/?max-keys=abc', 'http://maxkeys.localhost:5000/')
+    res.status_code.should.equal(400)
+    res.data.should.contain(b'InvalidArgument')
+    test_client.get('/?list-type=2&max-keys=-1', 'http://maxkeys.localhost:5000/').status_code.should.equal(400)
+
+
+def test_s3_server_list_objects_v2_invalid_continuation_token():
+    backend = server.create_backend_app("s3")
+    test_client = backend.test_client()
+
+    test_client.put('/', 'http://tokens.localhost:5000/')
+    # Not base64, and not of UTF-8
+    for token in ['abc', '/w==']:
+        res = test_client.get('/?list-type=2&continuation-token=' + token, 'http://tokens.localhost:5000/')
+        res.status_code.should.equal(400)
+        res.data.should.contain(b'InvalidArgument')
+
+
+def test_s3_server_ranged_get():
+    backend = server.create_backend_app("s3")
+    test_client = backend.test_client()
+
+    test_client.put('/', 'http://ranges.localhost:5000/')
+    test_client.put('/the-key', 'http://ranges.localhost:5000/', data=b'0123456789' * 10)
+
+    res = test_client.get('/the-key', 'http://ranges.localhost:5000/', headers={'Range': 'bytes=10-14'})
+    res.status_code.should.equal(206)
+    res.data.should.equal(b'01234')
+    res.headers['content-range'].should.equal('bytes 10-14/100')
+    res.headers['content-length'].should.equal('5')
+
+    res = test_client.get('/the-key', 'http://ranges.localhost:5000/', headers={'Range': 'bytes=-3'})
+    res.data.should.equal(b'789')
+
+    res = test_client.get('/the-key', 'http://ranges.localhost:5000/', headers={'Range': 'bytes=200-'})
+    res.status_code.should.equal(416)
+    res.headers['content-range'].should.equal('bytes */100')
+
+
+def test_s3_server_ignores_malformed_ranges():
+    backend = server.create_backend_app("s3")
+    test_client = backend.test_client()
+
+    test_client.put('/', 'http://ranges.localhost:5000/')
+    test_client.put('/the-key', 'http://ranges.localhost:5000/', data=b'0123456789')
+
+    for malformed in ['bytes=abc-', 'bytes=1-2-3', 'bytes 0-1', 'bytes=-', 'bytes=', 'items=0-1']:
+        res = test_client.get('/the-key', 'http://ranges.localhost:5000/', headers={'Range': malformed})
+        res.status_code.should.equal(200)
+        res.data.should.equal(b'0123456789')
+
+
+def test_s3_server_multiple_ranges():
+    backend = server.create_backend_app("s3")
+    test_client = backend.test_client()
+
+    test_client.put('/', 'http://ranges.localhost:5000/')
+    test_client.put('/the-key', 'http://ranges.localhost:5000/', data=b'0123456789' * 10)
+
+    res = test_client.get('/the-key', 'http://ranges.localhost:5000/', headers={'Range': 'bytes=0-1, 98-'})
+    res.status_code.should.equal(206)
+    content_type, boundary = res.headers['content-type'].split('; boundary=')
+    content_type.should.equal('multipart/byteranges')
+    parts = res.data.split(b'--' + boundary.encode('utf-8'))
+    parts[1].should.contain(b'Content-Range: bytes 0-1/100')
+    parts[1].endswith(b'\r\n\r\n01\r\n').should.be.true
+    parts[2].should.contain(b'Content-Range: bytes 98-99/100')
+    parts[2].endswith(b'\r\n\r\n89\r\n').should.be.true
+    parts[3].should.equal(b'--\r\n')
+    res.headers['content-length'].should.equal(str(len(res.data)))
+
+
+def test_s3_server_head_object():
+    backend = server.create_backend_app("s3")
+    test_client = backend.test_client()
+
+    test_client.put('/', 'http://head.localhost:5000/')
+    test_client.put('/the-key', 'http://head.localhost:5000/', data=b'x' * 100)
+
+    res = test_client.head('/the-key', 'http://head.localhost:5000/')
+    res.status_code.should.equal(200)
+    res.headers['content-length'].should.equal('100')
+    res.data.should.equal(b'')
+
+
+def test_s3_server_streams_objects_over_sockets():
+    app = server.DomainDispatcherApplication(server.create_backend_app, service='s3')
+    servers = [
+        make_server('127.0.0.1', 0, app, threaded=True),
+        server.PooledWSGIServer('127.0.0.1', 0, app, workers=2),
+    ]
+    body = b'0123456789' * 200000
+    for http_server in servers:
+        thread = threading.Thread(target=http_server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        try:
+            host = 'sockets.localhost:{0}'.format(http_server.server_port)
+
+            def request(method, path, body=None, headers={}):
+                connection = http_client.HTTPConnection('127.0.0.1', http_server.server_port, timeout=10)
+                try:
+                    connection.request(method, path, body=body, headers=dict(headers, Host=host))
+                    response = connection.getresponse()
+                    return response.status, response.read()
+                finally:
+                    connection.close()
+
+            request('PUT', '/')
+            request('PUT', '/the-key', body)
+            request('GET', '/the-key').should.equal((200, body))
+            request('GET', '/the-key', headers={'Range': 'bytes=5-14'}).should.equal((206, body[5:15]))
+            status, data = request('GET', '/the-key', headers={'Range': 'bytes=0-1,3-4'})
+            status.should.equal(206)
+            data.should.contain(b'\r\n\r\n01\r\n')
+            data.should.contain(b'\r\n\r\n34\r\n')
+        finally:
+            http_server.shutdown()
+            http_server.server_close()
+
+
+def test_s3_server_measures_s3_actions():
+    reset_metrics()
+    backend = server.create_backend_app("s3")
+    test_client = backend.test_client()
+    host = 'http://actions.localhost:5000/'
+
+    responses = [
+        test_client.put('/', host),
+        test_client.get('/', host),
+        test_client.get('/?list-type=2', host),
+        test_client.get('/?acl', host),
+        test_client.put('/the-key', host, data=b'value'),
+        test_client.put('/the-copy', host, headers={'x-amz-copy-source': 'actions/the-key'}),
+        test_client.get('/the-key', host),
+        test_client.post('/the-upload?uploads', host),
+    ]
+    for response in responses:
+        # Streamed responses are measured once they are sent
+        response.data
+
+    sorted(action for service, action in get_metrics()['actions']).should.equal([
+        'CopyObject', 'CreateBucket', 'CreateMultipartUpload', 'GetBucketAcl', 'GetObject',
+        'ListObjects', 'ListObjectsV2', 'PutObject',
+    ])